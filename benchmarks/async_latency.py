@@ -0,0 +1,74 @@
+"""Measures event loop latency while hundreds of coroutines await Context.check_context_async.
+
+A ticker coroutine asks to be woken every millisecond and records how late it is; with the
+blocking check_context the loop stalls for the length of each solve, with the async checks it
+should not.
+
+usage: python benchmarks/async_latency.py [requests] [bits]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from yices import Config, Context, Terms, Types
+
+
+def factoring_context(bits, k):
+    """a context that asks for a factorization of a (bits wide) number, which takes the solver a little while."""
+    cfg = Config()
+    cfg.default_config_for_logic('QF_BV')
+    ctx = Context(cfg)
+    bv_t = Types.bv_type(bits)
+    x = Terms.new_uninterpreted_term(bv_t)
+    y = Terms.new_uninterpreted_term(bv_t)
+    one = Terms.bvconst_integer(bits, 1)
+    n = Terms.bvconst_integer(bits, (1 << (bits - 1)) - 1 - 2 * k)
+    ctx.assert_formulas([Terms.bveq_atom(Terms.bvmul(x, y), n), Terms.bvgt_atom(x, one), Terms.bvgt_atom(y, one)])
+    return (cfg, ctx)
+
+
+async def ticker(lateness, done):
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lateness.append(time.perf_counter() - start - 0.001)
+
+
+async def run(contexts, check):
+    lateness = []
+    done = asyncio.Event()
+    tick = asyncio.create_task(ticker(lateness, done))
+    start = time.perf_counter()
+    await asyncio.gather(*[check(ctx) for (_, ctx) in contexts])
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+    return (elapsed, lateness)
+
+
+def report(label, elapsed, lateness):
+    lateness = sorted(lateness) or [0.0]
+    p99 = lateness[min(len(lateness) - 1, int(0.99 * len(lateness)))]
+    print(f'\t{label:12} total {elapsed * 1000:9.1f} ms   loop lateness: median {statistics.median(lateness) * 1000:7.2f} ms'
+          f'   p99 {p99 * 1000:7.2f} ms   max {lateness[-1] * 1000:7.2f} ms')
+
+
+def main(requests, bits):
+    async def blocking(ctx):
+        return ctx.check_context()
+
+    async def awaiting(ctx):
+        return await ctx.check_context_async()
+
+    print(f'{requests} concurrent {bits} bit factoring checks:')
+    for (label, check) in [('blocking', blocking), ('async', awaiting)]:
+        contexts = [factoring_context(bits, k) for k in range(requests)]
+        report(label, *asyncio.run(run(contexts, check)))
+        for (cfg, ctx) in contexts:
+            ctx.dispose()
+            cfg.dispose()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200, int(sys.argv[2]) if len(sys.argv) > 2 else 16)
@@ -0,0 +1,40 @@
+"""Measures how Batch.solve_many scales with the number of worker processes.
+
+The queries are independent, moderately hard, bit-vector factoring problems; the script prints
+the throughput for 1, 2, 4, ... workers up to the number of cores, and the speedup over 1 worker.
+
+usage: python benchmarks/batch.py [queries] [bits]
+"""
+import os
+import sys
+import time
+
+from yices import Batch, Terms, Types
+
+
+def queries(count, bits):
+    bv_t = Types.bv_type(bits)
+    x = Terms.new_uninterpreted_term(bv_t, 'x')
+    y = Terms.new_uninterpreted_term(bv_t, 'y')
+    one = Terms.bvconst_integer(bits, 1)
+    for k in range(count):
+        n = Terms.bvconst_integer(bits, (1 << (bits - 1)) - 1 - 2 * k)
+        yield Batch.Query([Terms.bveq_atom(Terms.bvmul(x, y), n), Terms.bvgt_atom(x, one), Terms.bvgt_atom(y, one)], [x, y])
+
+
+def main(count, bits):
+    cores = os.cpu_count() or 1
+    workers = 1
+    base = None
+    print(f'{count} {bits} bit factoring queries:')
+    while workers <= cores:
+        start = time.perf_counter()
+        answers = sum(1 for _ in Batch.solve_many(queries(count, bits), workers=workers, logic='QF_BV', chunksize=4))
+        elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print(f'\t{workers:3} workers  {elapsed:8.2f} s  {answers / elapsed:8.1f} queries/s  speedup {base / elapsed:5.2f}')
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
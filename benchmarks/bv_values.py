@@ -0,0 +1,35 @@
+"""Compares reading bit-vector values from a model as bit lists with Model.get_bv_value.
+
+usage: python benchmarks/bv_values.py [terms]
+"""
+import sys
+import time
+
+from yices import Model, Terms, Types
+
+
+def timed(label, thunk):
+    start = time.perf_counter()
+    thunk()
+    print(f'\t{label:36}{(time.perf_counter() - start) * 1000:10.2f} ms')
+
+
+def fold(bits):
+    return sum(bit << k for (k, bit) in enumerate(bits))
+
+
+def main(n):
+    for width in [8, 64, 256, 4096]:
+        bv_t = Types.bv_type(width)
+        bvs = [Terms.new_uninterpreted_term(bv_t) for _ in range(n)]
+        mdl = Model()
+        for (k, t) in enumerate(bvs):
+            mdl.set_bv(t, (k * 0x9E3779B97F4A7C15) % (1 << width))
+        print(f'values of {n} terms of width {width}:')
+        timed('get_value + fold', lambda: [fold(mdl.get_value(t)) for t in bvs])
+        timed('get_bv_value', lambda: [mdl.get_bv_value(t) for t in bvs])
+        mdl.dispose()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
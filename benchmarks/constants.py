@@ -0,0 +1,37 @@
+"""Measures Terms.integer, Terms.bvconst_integer and Types.bv_type with and without their caches.
+
+The values are drawn from a small set, as they are in typical encoders, so most calls repeat
+an earlier one.
+
+usage: python benchmarks/constants.py [calls] [distinct values]
+"""
+import random
+import sys
+import time
+
+from yices import Terms, Types
+
+
+def run(calls, values):
+    start = time.perf_counter()
+    for value in values[:calls]:
+        Terms.integer(value)
+        Terms.bvconst_integer(32, value)
+        Types.bv_type(1 + value % 64)
+    return time.perf_counter() - start
+
+
+def main(calls, distinct):
+    rng = random.Random(0)
+    values = [rng.randrange(distinct) for _ in range(calls)]
+    plain = run(calls, values)
+    Terms.enable_constant_cache()
+    Types.enable_type_cache()
+    cached = run(calls, values)
+    print(f'{calls} calls of each over {distinct} values: {plain:.3f}s plain, {cached:.3f}s cached')
+    print(f'constants {Terms.constant_cache_stats()}')
+    print(f'types     {Types.type_cache_stats()}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000, int(sys.argv[2]) if len(sys.argv) > 2 else 256)
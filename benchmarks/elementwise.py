@@ -0,0 +1,52 @@
+"""Measures the throughput of Elementwise against a Python loop over the Terms constructors.
+
+Each round applies bvadd, bvxor and bvult across a number of lanes of 32 bit terms; the
+results are the same terms, so the difference is the per lane overhead of the bindings.
+
+usage: python benchmarks/elementwise.py [lanes] [rounds]
+"""
+import sys
+import time
+
+from array import array
+
+from yices import Elementwise, Terms, Types
+
+
+def per_lane(a, b):
+    sums = [Terms.bvadd(x, y) for (x, y) in zip(a, b)]
+    mixed = [Terms.bvxor([s, y]) for (s, y) in zip(sums, b)]
+    return [Terms.bvlt_atom(m, x) for (m, x) in zip(mixed, a)]
+
+
+def elementwise(a, b):
+    sums = Elementwise.bvadd(a, b)
+    mixed = Elementwise.bvxor(sums, b)
+    return Elementwise.bvlt_atom(mixed, a)
+
+
+def measure(function, a, b, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = function(a, b)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return (best, list(result))
+
+
+def main(lanes, rounds):
+    bv_t = Types.bv_type(32)
+    a = array('i', [Terms.new_uninterpreted_term(bv_t) for _ in range(lanes)])
+    b = array('i', [Terms.new_uninterpreted_term(bv_t) for _ in range(lanes)])
+    # build the terms once so that both sides only look them up
+    elementwise(a, b)
+    (loop, expected) = measure(per_lane, a, b, rounds)
+    (vectorized, result) = measure(elementwise, a, b, rounds)
+    assert result == expected
+    for (label, seconds) in (('Terms, per lane', loop), ('Elementwise', vectorized)):
+        print(f'{label:18}{seconds:10.4f}s {3 * lanes / seconds / 1e6:8.2f}M terms/s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000, int(sys.argv[2]) if len(sys.argv) > 2 else 5)
@@ -0,0 +1,40 @@
+"""Measures the per call saving of fast mode (see FAST MODE in yices_api.py).
+
+usage: python benchmarks/fast_mode.py [calls]
+"""
+import sys
+import time
+
+import yices_api as yapi
+
+
+def per_call_ns(calls, x, y):
+    """returns the average nanoseconds per yices_bvadd / yices_bvconst_uint32 / yices_term_is_bool call."""
+    timings = []
+    for fun, args in ((yapi.yices_bvadd, (x, y)), (yapi.yices_bvconst_uint32, (32, 7)), (yapi.yices_term_is_bool, (x, ))):
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            fun(*args)
+        timings.append((time.perf_counter_ns() - start) / calls)
+    return timings
+
+
+def main(calls):
+    yapi.yices_init()
+    bv32 = yapi.yices_bv_type(32)
+    x = yapi.yices_new_uninterpreted_term(bv32)
+    y = yapi.yices_new_uninterpreted_term(bv32)
+    yapi.yices_set_fast_mode(False)
+    checked = per_call_ns(calls, x, y)
+    yapi.yices_set_fast_mode(True)
+    assert yapi.yices_is_fast()
+    fast = per_call_ns(calls, x, y)
+    yapi.yices_exit()
+    print(f'ns per call over {calls} calls:')
+    print(f'\t{"function":24}{"checked":>10}{"fast":>10}{"saving":>10}')
+    for name, slow, quick in zip(('yices_bvadd', 'yices_bvconst_uint32', 'yices_term_is_bool'), checked, fast):
+        print(f'\t{name:24}{slow:10.1f}{quick:10.1f}{slow - quick:10.1f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
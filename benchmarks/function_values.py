@@ -0,0 +1,31 @@
+"""Times decoding a model with many array (function) values that share their entries.
+
+usage: python benchmarks/function_values.py [arrays] [entries]
+"""
+import sys
+import time
+
+from yices import Context, Model, Status, Terms, Types
+
+
+def main(arrays, entries):
+    int_t = Types.int_type()
+    arr_t = Types.new_function_type([int_t], int_t)
+    arrs = [Terms.new_uninterpreted_term(arr_t) for _ in range(arrays)]
+    ctx = Context()
+    for arr in arrs:
+        ctx.assert_formulas([Terms.arith_eq_atom(Terms.application(arr, [Terms.integer(k)]), Terms.integer(k % 10))
+                             for k in range(entries)])
+    assert ctx.check_context() == Status.SAT
+    mdl = Model.from_context(ctx, 1)
+    start = time.perf_counter()
+    values = [mdl.get_value(arr) for arr in arrs]
+    total = sum(len(val) for val in values)
+    elapsed = time.perf_counter() - start
+    print(f'decoded {arrays} arrays ({total} entries) in {elapsed * 1000:.2f} ms')
+    mdl.dispose()
+    ctx.dispose()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200, int(sys.argv[2]) if len(sys.argv) > 2 else 100)
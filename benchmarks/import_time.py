@@ -0,0 +1,44 @@
+"""Measures the cold start cost of 'import yices' with eager and with lazy (YICES_API_LAZY=1) binding.
+
+Each sample is a fresh interpreter, so the numbers include loading libyices, but
+the .pyc files are warm after the first run.
+
+usage: python benchmarks/import_time.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+ROOT = os.path.dirname(HERE)
+
+PROBE = 'import time; start = time.perf_counter(); import yices; print(time.perf_counter() - start)'
+
+
+def sample(lazy):
+    """runs one fresh interpreter and returns the seconds it took to import yices."""
+    env = dict(os.environ)
+    env['YICES_API_LAZY'] = '1' if lazy else '0'
+    env['PYTHONPATH'] = os.pathsep.join([ROOT, env.get('PYTHONPATH', '')])
+    out = subprocess.run([sys.executable, '-c', PROBE], env=env, check=True, stdout=subprocess.PIPE)
+    return float(out.stdout)
+
+
+def main(runs):
+    # warm up the bytecode caches so both modes are measured on equal terms
+    sample(False)
+    sample(True)
+    eager = [sample(False) for _ in range(runs)]
+    lazy = [sample(True) for _ in range(runs)]
+    eager_ms = statistics.median(eager) * 1000
+    lazy_ms = statistics.median(lazy) * 1000
+    print(f'import yices over {runs} runs (median):')
+    print(f'\teager binding  {eager_ms:8.2f} ms')
+    print(f'\tlazy binding   {lazy_ms:8.2f} ms')
+    print(f'\tsaving         {eager_ms - lazy_ms:8.2f} ms ({100 * (eager_ms - lazy_ms) / eager_ms:.1f}%)')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,72 @@
+"""Compares building A x <= b with Linear.constraints against one Terms.mul/Terms.add per coefficient.
+
+A is a random sparse integer matrix with a few nonzero entries per row; it is passed to Linear
+both as a list of rows and, when NumPy is available, as a dense NumPy array and in CSR form.
+
+usage: python benchmarks/linear.py [rows] [columns] [nonzeros per row]
+"""
+import random
+import sys
+import time
+from collections import namedtuple
+
+import yices_api as yapi
+
+from yices import Linear, Terms, Types
+
+
+CSR = namedtuple('CSR', ['data', 'indices', 'indptr'])
+
+
+def per_term(matrix, xs, bounds):
+    atoms = []
+    for (row, bound) in zip(matrix, bounds):
+        poly = Terms.ZERO
+        for (c, x) in zip(row, xs):
+            if c:
+                poly = Terms.add(poly, Terms.mul(Terms.integer(c), x))
+        atoms.append(Terms.arith_leq_atom(poly, Terms.integer(bound)))
+    return atoms
+
+
+def timed(label, function, baseline=None):
+    start = time.perf_counter()
+    atoms = function()
+    elapsed = time.perf_counter() - start
+    if baseline is not None:
+        assert atoms == baseline
+    print(f'{label:24}{elapsed:10.3f}s')
+    return atoms
+
+
+def main(rows, columns, nonzeros):
+    rng = random.Random(0)
+    int_t = Types.int_type()
+    xs = [Terms.new_uninterpreted_term(int_t) for _ in range(columns)]
+    matrix = []
+    data, indices, indptr = [], [], [0]
+    for _ in range(rows):
+        row = [0] * columns
+        for j in sorted(rng.sample(range(columns), nonzeros)):
+            row[j] = rng.randint(-100, 100) or 1
+            data.append(row[j])
+            indices.append(j)
+        indptr.append(len(data))
+        matrix.append(row)
+    bounds = [rng.randint(-1000, 1000) for _ in range(rows)]
+    print(f'{rows} rows, {columns} columns, {nonzeros} nonzeros per row')
+    baseline = timed('per term', lambda: per_term(matrix, xs, bounds))
+    timed('Linear, lists', lambda: Linear.constraints(matrix, xs, bounds), baseline)
+    timed('Linear, CSR lists', lambda: Linear.constraints(CSR(data, indices, indptr), xs, bounds), baseline)
+    if yapi.hasNumPy():
+        np = yapi.numpy
+        dense = np.array(matrix, dtype=np.int64)
+        sparse = CSR(np.array(data, dtype=np.int64), np.array(indices, dtype=np.int32), np.array(indptr))
+        timed('Linear, NumPy dense', lambda: Linear.constraints(dense, xs, bounds), baseline)
+        timed('Linear, NumPy CSR', lambda: Linear.constraints(sparse, xs, bounds), baseline)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 8)
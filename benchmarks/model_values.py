@@ -0,0 +1,35 @@
+"""Compares per term Model.get_value with the bulk Model.get_*_values getters.
+
+usage: python benchmarks/model_values.py [terms]
+"""
+import sys
+import time
+
+from yices import Model, Terms, Types
+
+
+def timed(label, thunk):
+    start = time.perf_counter()
+    thunk()
+    print(f'\t{label:36}{(time.perf_counter() - start) * 1000:10.2f} ms')
+
+
+def main(n):
+    int_t = Types.int_type()
+    bv_t = Types.bv_type(64)
+    ints = [Terms.new_uninterpreted_term(int_t) for _ in range(n)]
+    bvs = [Terms.new_uninterpreted_term(bv_t) for _ in range(n)]
+    mapping = {t: Terms.integer(k % 1000) for (k, t) in enumerate(ints)}
+    mapping.update({t: Terms.bvconst_integer(64, k % 1000) for (k, t) in enumerate(bvs)})
+    mdl = Model.from_map(mapping)
+    print(f'values of {n} terms:')
+    timed('int: get_value per term', lambda: [mdl.get_value(t) for t in ints])
+    timed('int: get_integer_value per term', lambda: [mdl.get_integer_value(t) for t in ints])
+    timed('int: get_integer_values', lambda: mdl.get_integer_values(ints))
+    timed('bv64: get_value per term', lambda: [mdl.get_value(t) for t in bvs])
+    timed('bv64: get_bv_values', lambda: mdl.get_bv_values(bvs))
+    mdl.dispose()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,81 @@
+"""Compares each strategy of Portfolio.default_strategies on its own with the Portfolio racing them all.
+
+The corpus is generated: bit-vector factoring problems (QF_BV), and intersections of random
+quadrics (QF_NRA, only when libyices has mcsat). For each problem the table shows the time of
+every strategy run alone, and of the portfolio; the totals show what the portfolio saves over
+always picking the same strategy.
+
+usage: python benchmarks/portfolio.py [timeout]
+"""
+import random
+import sys
+import time
+
+from yices import Config, Context, Parameters, Portfolio, Status, Terms, Types, Yices
+
+
+def factoring(bits, n):
+    bv_t = Types.bv_type(bits)
+    x = Terms.new_uninterpreted_term(bv_t)
+    y = Terms.new_uninterpreted_term(bv_t)
+    one = Terms.bvconst_integer(bits, 1)
+    return ('QF_BV', f'factor {n} ({bits} bits)',
+            [Terms.bveq_atom(Terms.bvmul(x, y), Terms.bvconst_integer(bits, n)), Terms.bvgt_atom(x, one), Terms.bvgt_atom(y, one)])
+
+
+def quadrics(count, rng):
+    real_t = Types.real_type()
+    xs = [Terms.new_uninterpreted_term(real_t) for _ in range(3)]
+    formulas = []
+    for _ in range(count):
+        monomials = [Terms.mul(Terms.integer(rng.randint(-5, 5)), Terms.mul(a, b)) for a in xs for b in xs]
+        formulas.append(Terms.arith_eq_atom(Terms.sum(monomials), Terms.integer(rng.randint(-9, 9))))
+    return ('QF_NRA', f'{count} quadrics', formulas)
+
+
+def alone(logic, formulas, strategy, timeout):
+    """runs one strategy in this process, returns (status, seconds)."""
+    cfg = Config()
+    cfg.default_config_for_logic(logic)
+    for (key, value) in strategy.get('config', {}).items():
+        cfg.set_config(key, value)
+    ctx = Context(cfg)
+    params = Parameters()
+    params.default_params_for_context(ctx)
+    for (key, value) in strategy.get('params', {}).items():
+        params.set_param(key, value)
+    start = time.perf_counter()
+    try:
+        ctx.assert_formulas(formulas)
+        status = ctx.check_context(params, timeout)
+    except Exception:  # pylint: disable=W0703
+        status = Status.ERROR
+    elapsed = time.perf_counter() - start
+    params.dispose()
+    ctx.dispose()
+    cfg.dispose()
+    return (status, elapsed)
+
+
+def main(timeout):
+    rng = random.Random(0)
+    corpus = [factoring(24, 4093 * 4091), factoring(32, 65521 * 65519), factoring(40, 1048573 * 1048571)]
+    if Yices.has_mcsat():
+        corpus += [quadrics(2, rng), quadrics(3, rng)]
+    strategies = Portfolio.default_strategies()
+    totals = [0.0] * (len(strategies) + 1)
+    print(f'{"problem":28}' + ''.join(f'{"strategy " + str(k):>14}' for k in range(len(strategies))) + f'{"portfolio":>14}')
+    for (logic, name, formulas) in corpus:
+        row = [alone(logic, formulas, strategy, timeout)[1] for strategy in strategies]
+        start = time.perf_counter()
+        (status, model, winner) = Portfolio.solve(formulas, Portfolio.default_strategies(logic), timeout)
+        row.append(time.perf_counter() - start)
+        if model is not None:
+            model.dispose()
+        totals = [total + seconds for (total, seconds) in zip(totals, row)]
+        print(f'{name:28}' + ''.join(f'{seconds:14.3f}' for seconds in row) + f'   {Status.name(status)} by {winner}')
+    print(f'{"total":28}' + ''.join(f'{seconds:14.3f}' for seconds in totals))
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 60.0)
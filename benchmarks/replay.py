@@ -0,0 +1,55 @@
+"""Replays a log written by yices.Recorder and prints the time each libyices function takes, then and now.
+
+Without a log, records a small bit-vector workload to a temporary file first and replays that,
+which shows what recording costs. Replaying only the first limit calls bisects a slow log.
+
+usage: python benchmarks/replay.py [log] [limit]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from yices import Context, Recorder, Replay, Terms, Types, Yices
+
+
+def workload(n):
+    bv_t = Types.bv_type(32)
+    xs = [Terms.new_uninterpreted_term(bv_t) for _ in range(n)]
+    ctx = Context()
+    for (x, y) in zip(xs, xs[1:]):
+        ctx.assert_formula(Terms.bvult_atom(Terms.bvadd(x, Terms.bvconst_integer(32, 1)), y))
+    ctx.check_context()
+    ctx.dispose()
+
+
+def record(path, n):
+    start = time.perf_counter()
+    workload(n)
+    plain = time.perf_counter() - start
+    # from a fresh library, so that the replay makes the same ids
+    Yices.reset()
+    Recorder.start(path)
+    start = time.perf_counter()
+    workload(n)
+    recording = time.perf_counter() - start
+    count = Recorder.stop()
+    print(f'{count} calls: {plain:.3f}s plain, {recording:.3f}s recording, {os.path.getsize(path)} bytes of log')
+    Yices.reset()
+
+
+def main(path, limit):
+    if path is None:
+        (handle, path) = tempfile.mkstemp(suffix='.yrec')
+        os.close(handle)
+        try:
+            record(path, 2000)
+            print(Replay(path).run(limit).dump())
+        finally:
+            os.remove(path)
+    else:
+        print(Replay(path).run(limit).dump())
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else None, int(sys.argv[2]) if len(sys.argv) > 2 else None)
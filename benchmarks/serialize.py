@@ -0,0 +1,49 @@
+"""Compares loading terms from Serializer.to_bytes with parsing their printed form.
+
+The terms are bit-vector circuits with a lot of sharing: each layer combines the outputs of
+the layer below, so the DAG is small while its printed form (which repeats shared subterms
+unless they are named) grows quickly. The table shows the size of each form and the time to
+rebuild the terms from it.
+
+usage: python benchmarks/serialize.py [layers] [repeats]
+"""
+import sys
+import time
+
+from yices import Serializer, Terms, Types
+
+
+def circuit(layers, width=32, breadth=8):
+    bv_t = Types.bv_type(width)
+    row = [Terms.new_uninterpreted_term(bv_t, f'in{k}') for k in range(breadth)]
+    for layer in range(layers):
+        ops = (Terms.bvadd, Terms.bvxor, Terms.bvmul, Terms.bvand)
+        op = ops[layer % len(ops)]
+        row = [op(row[k], row[(k + 1) % breadth]) for k in range(breadth)]
+    return [Terms.bvgt_atom(term, Terms.bvconst_integer(width, 1000)) for term in row]
+
+
+def timed(function, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(layers, repeats):
+    print(f'{"layers":>8}{"bytes":>12}{"text":>12}{"from_bytes":>14}{"parse_term":>14}')
+    for depth in range(2, layers + 1, 2):
+        terms = circuit(depth)
+        data = Serializer.to_bytes(terms)
+        texts = [Terms.to_string(term, 1 << 16, 1 << 30) for term in terms]
+        assert Serializer.from_bytes(data) == terms
+        loading = timed(lambda: Serializer.from_bytes(data), repeats)
+        parsing = timed(lambda: [Terms.parse_term(text) for text in texts], repeats)
+        print(f'{depth:8}{len(data):12}{sum(map(len, texts)):12}{loading:14.6f}{parsing:14.6f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 12, int(sys.argv[2]) if len(sys.argv) > 2 else 5)
@@ -0,0 +1,58 @@
+"""Compares Traversal with the recursive walk over Terms.num_children and Terms.child.
+
+The terms are layered Boolean circuits where every gate is shared by two gates of the layer
+above, so the tree a naive walk explores grows exponentially with the depth while the DAG
+grows linearly. The naive walk here at least memoizes, so the comparison is of the calls
+into the library: one or two per term for Traversal against one per child for the walk.
+
+usage: python benchmarks/traversal.py [layers] [breadth]
+"""
+import sys
+import time
+
+from yices import Terms, Traversal, Types
+
+
+def circuit(layers, breadth):
+    bool_t = Types.bool_type()
+    row = [Terms.new_uninterpreted_term(bool_t) for _ in range(breadth)]
+    for layer in range(layers):
+        op = Terms.yand if layer % 2 else Terms.xor
+        row = [op([row[k], Terms.ynot(row[(k + 1) % breadth])]) for k in range(breadth)]
+    return row
+
+
+def naive_size(roots):
+    seen = set()
+
+    def walk(term):
+        if term in seen:
+            return
+        seen.add(term)
+        for i in range(Terms.num_children(term)):
+            walk(Terms.child(term, i))
+
+    for root in roots:
+        walk(root)
+    return len(seen)
+
+
+def main(layers, breadth):
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * layers + 100))
+    roots = circuit(layers, breadth)
+    start = time.perf_counter()
+    expected = naive_size(roots)
+    naive = time.perf_counter() - start
+    traversal = Traversal()
+    start = time.perf_counter()
+    size = traversal.size(roots)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    traversal.size(roots)
+    second = time.perf_counter() - start
+    assert size == expected
+    print(f'{size} terms: recursive {naive:.3f}s, traversal {first:.3f}s, traversal again (cached) {second:.3f}s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500, int(sys.argv[2]) if len(sys.argv) > 2 else 64)
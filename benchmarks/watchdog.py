@@ -0,0 +1,46 @@
+"""Compares the shared Watchdog with a threading.Timer per call for enforcing check_context timeouts.
+
+Each check is trivial, so the numbers are dominated by the cost of arming and cancelling the timeout.
+
+usage: python benchmarks/watchdog.py [checks]
+"""
+import sys
+import threading
+import time
+
+from yices import Config, Context, Status, Terms, Types, Yices
+
+
+def timer_check(ctx, timeout):
+    """check_context with a timeout, as it was done before the Watchdog."""
+    timer = threading.Timer(timeout, Context.stop_search, [ctx])
+    timer.start()
+    status = Yices.check_context(ctx.context, None)
+    timer.cancel()
+    return status
+
+
+def timed(label, thunk, checks):
+    start = time.perf_counter()
+    thunk()
+    elapsed = time.perf_counter() - start
+    print(f'\t{label:24}{elapsed * 1000:10.2f} ms  {checks / elapsed:12.0f} checks/s  {threading.active_count():4} threads')
+
+
+def main(checks):
+    cfg = Config()
+    ctx = Context(cfg)
+    bool_t = Types.bool_type()
+    [p, q] = [Terms.new_uninterpreted_term(bool_t) for _ in range(2)]
+    ctx.assert_formula(Terms.yor([p, q]))
+    assert ctx.check_context() == Status.SAT
+    print(f'{checks} checks with a 10s timeout:')
+    timed('no timeout', lambda: [ctx.check_context() for _ in range(checks)], checks)
+    timed('threading.Timer', lambda: [timer_check(ctx, 10) for _ in range(checks)], checks)
+    timed('Watchdog', lambda: [ctx.check_context(timeout=10) for _ in range(checks)], checks)
+    ctx.dispose()
+    cfg.dispose()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
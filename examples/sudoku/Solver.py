@@ -3,6 +3,7 @@ from SudokuLib import Syntax, Puzzle, Cores
 
 from yices.Terms import Terms
 from yices.Context import Context
+from yices.ContextPool import ContextPool
 from yices.Status import Status
 from yices.Model import Model
 
@@ -23,6 +24,9 @@ class Solver:
         self.trivial_rules = self.syntax.trivial_rules
         self.all_rules = self.syntax.all_rules
 
+        # the core computations all start from the puzzle and the trivial rules, so they share warm contexts
+        self.pool = ContextPool()
+
     def var(self, i, j):
         return self.variables[i][j]
 
@@ -122,27 +126,28 @@ class Solver:
                         cores.add(*core)
         return cores
 
+    def _core_base(self, ctx):
+        """The assertions common to all the core computations."""
+        self.assert_puzzle(ctx)
+        self.assert_trivial_rules(ctx)
+
     def compute_core(self, i, j, val):
         """We compute the unsat core of the duplicate_rules when asserting self.var(i, j) != val w.r.t the puzzle (val is assumed to be the unique solution)."""
         if not (0 <= i <= 8 and 0 <= j <= 8 and 1 <= val <= 9):
             raise Exception(f'Index error: {i} {j} {val}')
-        context = Context()
-        self.assert_puzzle(context)
-        self.assert_not_value(context, i, j, val)
-        self.assert_trivial_rules(context)
-        smt_stat = context.check_context_with_assumptions(None, self.duplicate_rules)
-        # a valid puzzle should have a unique solution, so this should not happen, if it does we bail
-        if smt_stat != Status.UNSAT:
-            print(f'Error: {i} {j} {val} - not UNSAT: {Status.name(smt_stat)}')
-            model = Model.from_context(context, 1)
-            answer = self.puzzle_from_model(model)
-            print('Counter example (i.e. origonal puzzle does not have a unique solution):')
-            answer.pprint()
-            model.dispose()
-            context.dispose()
-            return None
-        core = context.get_unsat_core()
-        context.dispose()
+        with self.pool.context(setup=self._core_base) as context:
+            self.assert_not_value(context, i, j, val)
+            smt_stat = context.check_context_with_assumptions(None, self.duplicate_rules)
+            # a valid puzzle should have a unique solution, so this should not happen, if it does we bail
+            if smt_stat != Status.UNSAT:
+                print(f'Error: {i} {j} {val} - not UNSAT: {Status.name(smt_stat)}')
+                model = Model.from_context(context, 1)
+                answer = self.puzzle_from_model(model)
+                print('Counter example (i.e. origonal puzzle does not have a unique solution):')
+                answer.pprint()
+                model.dispose()
+                return None
+            core = context.get_unsat_core()
         print(f'Core: {i} {j} {val}   {len(core)} / {len(self.duplicate_rules)}')
         return (i, j, val, core)
 
@@ -166,7 +171,7 @@ class Solver:
             context.dispose()
             return None
         core = context.get_unsat_core()
-        filtered = core.copy()
+        filtered = core[:]
         for term in core:
             filtered.remove(term)
             smt_stat = context.check_context_with_assumptions(None, filtered)
@@ -182,7 +187,7 @@ class Solver:
         self.assert_puzzle(context)
         self.assert_not_value(context, i, j, val)
         self.assert_trivial_rules(context)
-        filtered = terms.copy()
+        filtered = terms[:]
         for term in terms:
             filtered.remove(term)
             smt_stat = context.check_context_with_assumptions(None, filtered)
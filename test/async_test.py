@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import unittest
+
+from yices.Config import Config
+from yices.Context import Context
+from yices.Status import Status
+from yices.Terms import Terms
+from yices.Types import Types
+from yices.Yices import Yices
+
+
+class TestAsync(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+        self.cfg = Config()
+        self.ctx = Context(self.cfg)
+        bool_t = Types.bool_type()
+        [self.p, self.q] = [Terms.new_uninterpreted_term(bool_t) for _ in range(2)]
+        self.ctx.assert_formula(Terms.yor([self.p, self.q]))
+
+    def tearDown(self):
+        self.ctx.dispose()
+        self.cfg.dispose()
+        Yices.exit()
+
+    def test_checks(self):
+        async def checks():
+            return [await self.ctx.check_context_async(),
+                    await self.ctx.check_context_with_assumptions_async(None, [Terms.ynot(self.p)]),
+                    await self.ctx.check_context_with_assumptions_async(None, [Terms.ynot(self.p), Terms.ynot(self.q)], timeout=60)]
+        self.assertEqual(asyncio.run(checks()), [Status.SAT, Status.SAT, Status.UNSAT])
+
+    def test_cancel(self):
+        # keep the executor busy so the check is still queued when it is cancelled
+        busy = threading.Event()
+        blocker = Context.executor().submit(busy.wait)
+        async def cancel():
+            task = asyncio.create_task(self.ctx.check_context_async())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            # a check that has not started is dropped at once, without waiting for the executor
+            try:
+                with self.assertRaises(asyncio.CancelledError):
+                    await asyncio.wait_for(task, 5)
+            finally:
+                busy.set()
+        asyncio.run(cancel())
+        blocker.result()
+        self.assertEqual(self.ctx.check_context(), Status.SAT)
+
+    def test_cancel_search(self):
+        # factoring the product of two large primes keeps the search going until it is stopped
+        bv_t = Types.bv_type(192)
+        for name in ('ax', 'ay'):
+            Terms.new_uninterpreted_term(bv_t, name)
+        product = ((1 << 61) - 1) * ((1 << 89) - 1)
+        with Config() as cfg:
+            cfg.default_config_for_logic('QF_BV')
+            with Context(cfg) as ctx:
+                ctx.assert_formulas([Terms.parse_term(f'(= (bv-mul ax ay) (mk-bv 192 {product}))'),
+                                     Terms.parse_term('(bv-gt ax (mk-bv 192 1))'),
+                                     Terms.parse_term('(bv-gt ay (mk-bv 192 1))'),
+                                     Terms.parse_term(f'(bv-lt ax (mk-bv 192 {1 << 90}))'),
+                                     Terms.parse_term(f'(bv-lt ay (mk-bv 192 {1 << 90}))')])
+                ctx.push()
+                ctx.assert_formula(Terms.parse_term('(bv-gt ax (mk-bv 192 2))'))
+                async def cancel():
+                    task = asyncio.create_task(ctx.check_context_async())
+                    await asyncio.sleep(0.2)
+                    self.assertFalse(task.done())
+                    task.cancel()
+                    with self.assertRaises(asyncio.CancelledError):
+                        await task
+                asyncio.run(cancel())
+                self.assertEqual(ctx.status(), Status.IDLE)
+                # the assertions survive the cancellation, push level included
+                ctx.push()
+                ctx.assert_formula(Terms.parse_term('(= ax (mk-bv 192 3))'))
+                self.assertEqual(ctx.check_context(), Status.UNSAT)
+                ctx.pop()
+                ctx.pop()
+                ctx.assert_formula(Terms.parse_term(f'(= ax (mk-bv 192 {(1 << 61) - 1}))'))
+                self.assertEqual(ctx.check_context(), Status.SAT)
+
+
+if __name__ == '__main__':
+    unittest.main()
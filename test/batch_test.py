@@ -0,0 +1,50 @@
+import unittest
+
+from yices.Batch import Batch
+from yices.Status import Status
+from yices.Terms import Terms
+from yices.Types import Types
+from yices.Yices import Yices
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+
+    def tearDown(self):
+        Yices.exit()
+
+    def test_solve_many(self):
+        int_t = Types.int_type()
+        colour_t = Types.new_scalar_type(3, 'bcolour')
+        x = Terms.new_uninterpreted_term(int_t, 'bx')
+        c = Terms.new_uninterpreted_term(colour_t, 'bc')
+        queries = []
+        for k in range(20):
+            bounds = [Terms.arith_gt_atom(x, Terms.integer(k)), Terms.arith_lt_atom(x, Terms.integer(k + 2 - k % 2))]
+            queries.append(Batch.Query(bounds + [Terms.eq(c, Terms.constant(colour_t, k % 3))], [x, c]))
+        queries.append([Terms.FALSE])
+        answers = {}
+        for (index, status, values) in Batch.solve_many(queries, workers=2, logic='QF_LIA'):
+            answers[index] = (status, values)
+        self.assertEqual(len(answers), 21)
+        for k in range(20):
+            if k % 2 == 0:
+                self.assertEqual(answers[k], (Status.SAT, [k + 1, k % 3]))
+            else:
+                self.assertEqual(answers[k], (Status.UNSAT, None))
+        self.assertEqual(answers[20], (Status.UNSAT, None))
+
+    def test_tuple_of_formulas(self):
+        bool_t = Types.bool_type()
+        p = Terms.new_uninterpreted_term(bool_t, 'bp')
+        q = Terms.new_uninterpreted_term(bool_t, 'bq')
+        # a plain pair is two formulas, not (formulas, terms)
+        queries = [(p, Terms.ynot(p)), (p, q)]
+        answers = dict((index, status) for (index, status, _) in Batch.solve_many(queries, workers=1))
+        self.assertEqual(answers, {0: Status.UNSAT, 1: Status.SAT})
+
+
+if __name__ == '__main__':
+    unittest.main()
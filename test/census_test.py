@@ -0,0 +1,124 @@
+import csv
+import os
+import tempfile
+import time
+import unittest
+
+from yices.Census import Census, FIELDS
+from yices.Config import Config
+from yices.Context import Context
+from yices.Model import Model
+from yices.Terms import Terms
+from yices.Types import Types
+from yices.Yices import Yices
+
+
+def make_contexts(n):
+    contexts = []
+    for _ in range(n):
+        contexts.append(Context())
+    return contexts
+
+
+class TestCensus(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+
+    def tearDown(self):
+        Census.stop_sampler()
+        Census.track_allocations(False)
+        Yices.exit()
+
+    def test_snapshot(self):
+        before = Census.snapshot()
+        self.assertEqual(set(before), set(FIELDS))
+        int_t = Types.int_type()
+        for i in range(10):
+            Terms.new_uninterpreted_term(int_t, f'census_{i}')
+        with Config() as cfg:
+            self.assertEqual(Census.snapshot()['configs'], before['configs'] + 1)
+            cfg.default_config_for_logic('QF_LIA')
+        after = Census.snapshot()
+        self.assertGreaterEqual(after['terms'], before['terms'] + 10)
+        self.assertEqual(after['configs'], before['configs'])
+        self.assertLessEqual(after['posref_terms'], after['terms'])
+        if os.path.exists('/proc/self/statm'):
+            self.assertGreater(after['rss_bytes'], 0)
+        dump = Census.dump()
+        self.assertIn('Contexts', dump)
+        self.assertIn('Terms', dump)
+
+    def test_leak_sites(self):
+        Census.track_allocations()
+        self.assertTrue(Census.is_tracking_allocations())
+        contexts = make_contexts(3)
+        ctx = Context()
+        ctx.assert_formula(Terms.true())
+        ctx.check_context()
+        model = Model.from_context(ctx, 1)
+        ctx.dispose()
+        kinds = sorted(kind for (kind, _) in Census.undisposed())
+        self.assertEqual(kinds, ['Context', 'Context', 'Context', 'Model'])
+        sites = Census.leak_sites()
+        self.assertEqual(sites[0][0], 'Context')
+        self.assertEqual(sites[0][2], 3)
+        self.assertIn('make_contexts', sites[0][1])
+        # the model was made by Model.from_context, but the call site is in this file
+        self.assertIn('census_test.py', sites[1][1])
+        self.assertIn('Undisposed objects by call site', Census.dump())
+        for context in contexts:
+            context.dispose()
+        model.dispose()
+        self.assertEqual(Census.undisposed(), [])
+        Census.track_allocations(False)
+        contexts = make_contexts(1)
+        self.assertEqual(Census.undisposed(), [])
+        contexts[0].dispose()
+
+    def test_sampler(self):
+        seen = []
+        Census.start_sampler(0.01, capacity=5, callback=seen.append)
+        self.assertTrue(Census.is_sampling())
+        time.sleep(0.1)
+        Census.stop_sampler()
+        self.assertFalse(Census.is_sampling())
+        samples = Census.samples()
+        self.assertGreater(len(samples), 1)
+        self.assertLessEqual(len(samples), 5)
+        self.assertEqual(samples, seen[-len(samples):])
+        (handle, path) = tempfile.mkstemp(suffix='.csv')
+        os.close(handle)
+        try:
+            Census.write_csv(path)
+            with open(path, newline='') as stream:
+                rows = list(csv.DictReader(stream))
+            self.assertEqual(len(rows), len(samples))
+            self.assertEqual(tuple(rows[0]), FIELDS)
+        finally:
+            os.remove(path)
+
+    def test_stale(self):
+        # a context made before a reset was freed by it, and is no leak
+        Census.track_allocations()
+        ctx = Context()
+        Yices.reset()
+        self.assertEqual(Census.undisposed(), [])
+        self.assertEqual(Census.leak_sites(), [])
+        self.assertEqual(Census.stale(), 1)
+        self.assertIn('1 more from before the last exit or reset', Census.dump())
+        ctx.dispose()
+        self.assertEqual(Census.stale(), 0)
+
+    def test_sampler_exit(self):
+        # the sampler keeps going, without crashing, while the library is torn down and brought back
+        Census.start_sampler(0.001)
+        for _ in range(20):
+            Yices.exit()
+            Yices.init()
+        Census.stop_sampler()
+        self.assertTrue(all(sample['terms'] is None or sample['terms'] >= 0 for sample in Census.samples()))
+
+
+if __name__ == '__main__':
+    unittest.main()
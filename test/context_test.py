@@ -1,5 +1,7 @@
 import unittest
 
+from array import array
+
 from yices.Config import Config
 from yices.Context import Context
 from yices.Parameters import Parameters
@@ -95,5 +97,16 @@ class TestContext(unittest.TestCase):
         ctx.dispose()
         cfg.dispose()
 
+    def test_assert_formulas_from_buffer(self):
+        ctx = Context()
+        bool_t = Types.bool_type()
+        bools = array('i', [Terms.new_uninterpreted_term(bool_t) for _ in range(10)])
+        ctx.assert_formulas(bools)
+        ctx.assert_formula(Terms.yor(memoryview(bools)))
+        self.assertEqual(ctx.check_context(), Status.SAT)
+        status = ctx.check_context_with_assumptions(None, array('i', [Terms.ynot(bools[0])]))
+        self.assertEqual(status, Status.UNSAT)
+        ctx.dispose()
+
 if __name__ == '__main__':
     unittest.main()
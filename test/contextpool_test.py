@@ -0,0 +1,73 @@
+import unittest
+
+from yices.Config import Config
+from yices.ContextPool import ContextPool
+from yices.Status import Status
+from yices.Terms import Terms
+from yices.Types import Types
+from yices.YicesException import YicesException
+from yices.Yices import Yices
+
+
+class TestContextPool(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+        bool_t = Types.bool_type()
+        [self.p, self.q] = [Terms.new_uninterpreted_term(bool_t) for _ in range(2)]
+
+    def tearDown(self):
+        Yices.exit()
+
+    def test_reuse(self):
+        with ContextPool() as pool:
+            ctx = pool.acquire('QF_UF')
+            ctx.assert_formula(self.p)
+            pool.release(ctx)
+            again = pool.acquire('QF_UF')
+            self.assertIs(again, ctx)
+            # the assertion was dropped on release
+            again.assert_formula(Terms.ynot(self.p))
+            self.assertEqual(again.check_context(), Status.SAT)
+            pool.release(again)
+            other = pool.acquire()
+            self.assertIsNot(other, ctx)
+            pool.release(other)
+            stats = pool.stats()
+            self.assertEqual((stats['acquires'], stats['reuses'], stats['creates']), (3, 1, 2))
+            self.assertEqual(stats['idle'], 2)
+
+    def test_setup(self):
+        calls = []
+        def setup(ctx):
+            calls.append(ctx)
+            ctx.assert_formula(Terms.yor([self.p, self.q]))
+        cfg = Config()
+        with ContextPool() as pool:
+            for _ in range(3):
+                with pool.context(cfg, setup) as ctx:
+                    self.assertEqual(ctx.check_context_with_assumptions(None, [Terms.ynot(self.p), Terms.ynot(self.q)]), Status.UNSAT)
+                    ctx.assert_formula(Terms.ynot(self.p))
+                    self.assertEqual(ctx.check_context(), Status.SAT)
+            self.assertEqual(len(calls), 1)
+        cfg.dispose()
+
+    def test_caps(self):
+        with ContextPool(max_idle=1, max_total=2) as pool:
+            ctx1 = pool.acquire()
+            ctx2 = pool.acquire()
+            with self.assertRaises(YicesException):
+                pool.acquire(timeout=0.01)
+            pool.release(ctx1)
+            pool.release(ctx2)
+            self.assertEqual(pool.stats()['idle'], 1)
+            self.assertEqual(pool.stats()['discards'], 1)
+            # an idle context of another configuration makes way for a new one
+            ctx3 = pool.acquire('QF_UF')
+            ctx4 = pool.acquire('QF_UF')
+            pool.release(ctx3)
+            pool.release(ctx4)
+
+
+if __name__ == '__main__':
+    unittest.main()
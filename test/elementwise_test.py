@@ -0,0 +1,87 @@
+import unittest
+
+from array import array
+
+import yices_api as yapi
+
+from yices.Elementwise import Elementwise
+from yices.Terms import Terms
+from yices.Types import Types
+from yices.Yices import Yices
+from yices.YicesException import YicesException
+
+
+class TestElementwise(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+        bv_t = Types.bv_type(8)
+        self.a = array('i', [Terms.new_uninterpreted_term(bv_t) for _ in range(5)])
+        self.b = array('i', [Terms.new_uninterpreted_term(bv_t) for _ in range(5)])
+
+    def tearDown(self):
+        Yices.exit()
+
+    def test_lanes(self):
+        (a, b) = (self.a, self.b)
+        sums = Elementwise.bvadd(a, b)
+        self.assertIsInstance(sums, array)
+        self.assertEqual(list(sums), [Terms.bvadd(x, y) for (x, y) in zip(a, b)])
+        self.assertEqual(list(Elementwise.bvnot(a)), [Terms.bvnot(x) for x in a])
+        atoms = Elementwise.bvslt_atom(list(a), b)
+        self.assertEqual(list(atoms), [Terms.bvslt_atom(x, y) for (x, y) in zip(a, b)])
+        self.assertEqual(list(Elementwise.ite(atoms, a, b)), [Terms.ite(c, x, y) for (c, x, y) in zip(atoms, a, b)])
+        self.assertEqual(list(Elementwise.ynot(atoms)), [Terms.ynot(c) for c in atoms])
+        int_t = Types.int_type()
+        i = [Terms.new_uninterpreted_term(int_t) for _ in range(3)]
+        self.assertEqual(list(Elementwise.arith_leq_atom(i, Terms.ZERO)), [Terms.arith_leq_atom(x, Terms.ZERO) for x in i])
+        self.assertEqual(len(Elementwise.add([], [])), 0)
+
+    def test_broadcast(self):
+        one = Terms.bvconst_integer(8, 1)
+        self.assertEqual(list(Elementwise.bvadd(self.a, one)), [Terms.bvadd(x, one) for x in self.a])
+        with self.assertRaises(YicesException):
+            Elementwise.bvadd(one, one)
+
+    def test_errors(self):
+        with self.assertRaises(YicesException):
+            Elementwise.bvadd(self.a, self.b[:3])
+        bool_t = Types.bool_type()
+        p = Terms.new_uninterpreted_term(bool_t)
+        b = array('i', self.b)
+        b[2] = p
+        b[4] = Terms.new_uninterpreted_term(Types.bv_type(16))
+        # the two bad lanes fail differently, and the error reported is that of the first
+        yapi.yices_bvadd(self.a[2], b[2])
+        first = yapi.yices_error_string()
+        yapi.yices_bvadd(self.a[4], b[4])
+        self.assertNotEqual(yapi.yices_error_string(), first)
+        with self.assertRaisesRegex(YicesException, 'lane 2: ') as caught:
+            Elementwise.bvadd(self.a, b)
+        self.assertIn(first, str(caught.exception))
+        with self.assertRaises(TypeError):
+            Elementwise.bvadd(self.a)
+
+    @unittest.skipUnless(yapi.hasNumPy(), 'needs numpy')
+    def test_numpy(self):
+        np = yapi.numpy
+        a = np.array(self.a, dtype=np.int32)
+        b = np.array(self.b, dtype=np.int64)
+        products = Elementwise.bvmul(a, b)
+        self.assertIsInstance(products, np.ndarray)
+        self.assertEqual(products.dtype, np.int32)
+        self.assertEqual(products.tolist(), [Terms.bvmul(x, y) for (x, y) in zip(self.a, self.b)])
+        # a NumPy array anywhere among the arguments makes the result one
+        sums = Elementwise.bvadd(array('i', self.a), b)
+        self.assertIsInstance(sums, np.ndarray)
+        self.assertEqual(sums.tolist(), [Terms.bvadd(x, y) for (x, y) in zip(self.a, self.b)])
+        self.assertIsInstance(Elementwise.bvadd(self.a[0], a), np.ndarray)
+        # ids that do not fit in an int32 are refused rather than wrapped around
+        with self.assertRaises(YicesException):
+            Elementwise.bvadd(a, np.array([1 << 32] * len(a), dtype=np.int64))
+        with self.assertRaises(YicesException):
+            Elementwise.bvadd(a, np.array(self.b, dtype=np.float64))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import gc
+import os
+import threading
+import unittest
+
+from yices.Config import Config
+from yices.Context import Context
+from yices.Model import Model
+from yices.Parameters import Parameters
+from yices.Releases import Releases
+from yices.Yices import Yices
+
+
+def populations():
+    return (Context.population(), Config.population(), Model.population(), Parameters.population())
+
+
+def resident_pages():
+    """the resident set size of this process, in pages, or None when /proc is not available."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1])
+    except OSError:
+        return None
+
+
+class TestLifecycle(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+
+    def tearDown(self):
+        Yices.exit()
+
+    def test_collected(self):
+        before = populations()
+        cfg = Config()
+        ctx = Context(cfg)
+        mdl = Model()
+        param = Parameters()
+        self.assertNotEqual(populations(), before)
+        del cfg, ctx, mdl, param
+        gc.collect()
+        self.assertEqual(populations(), before)
+
+    def test_double_dispose(self):
+        before = populations()
+        ctx = Context()
+        ctx.dispose()
+        ctx.dispose()
+        mdl = Model()
+        mdl.dispose()
+        mdl.dispose()
+        self.assertEqual(populations(), before)
+
+    def test_with(self):
+        before = populations()
+        with Config() as cfg, Context(cfg) as ctx, Parameters() as param, Model() as mdl:
+            param.default_params_for_context(ctx)
+            self.assertEqual(mdl.collect_defined_terms().tolist(), [])
+        self.assertIsNone(ctx.context)
+        self.assertIsNone(mdl.model)
+        self.assertEqual(populations(), before)
+
+    def test_outlives_library(self):
+        # objects from before a yices_reset must not be freed again afterwards.
+        ctx = Context()
+        mdl = Model()
+        Yices.reset()
+        before = populations()
+        ctx.dispose()
+        del mdl
+        gc.collect()
+        self.assertEqual(populations(), (before[0] - 1, before[1], before[2] - 1, before[3]))
+
+    @unittest.skipIf(Yices.is_thread_safe(), 'a thread safe libyices frees on any thread')
+    def test_foreign_thread(self):
+        # an object collected on another thread is freed by the thread that made it.
+        before = Releases.pending()
+        box = [Context()]
+        worker = threading.Thread(target=box.clear)
+        worker.start()
+        worker.join()
+        # the worker has finished, so the free is left to whoever drains next
+        self.assertEqual(Releases.pending(), before + 1)
+        Config().dispose()
+        self.assertEqual(Releases.pending(), before)
+
+    def test_overdue(self):
+        # a free that has waited long enough for its owner is made by any thread
+        patience = Releases.patience
+        Releases.patience = 0
+        try:
+            before = populations()
+            box = [Context()]
+            worker = threading.Thread(target=box.clear)
+            worker.start()
+            worker.join()
+            self.assertEqual(Releases.pending(), 0)
+            self.assertEqual(populations(), before)
+        finally:
+            Releases.patience = patience
+
+    def test_soak(self):
+        # YICES_SOAK=1000000 for the full run
+        cycles = int(os.environ.get('YICES_SOAK', 10000))
+        before = populations()
+        def churn(count):
+            for k in range(count):
+                cfg = Config()
+                ctx = Context(cfg)
+                param = Parameters()
+                mdl = Model()
+                # dispose half explicitly, and leave the other half to the finalizers
+                if k % 2 == 0:
+                    mdl.dispose()
+                    param.dispose()
+                    ctx.dispose()
+                    cfg.dispose()
+        churn(min(cycles, 10000))
+        gc.collect()
+        baseline = resident_pages()
+        churn(cycles)
+        gc.collect()
+        self.assertEqual(populations(), before)
+        if baseline is not None:
+            # allow for allocator noise, a leak of one object per cycle would be far more
+            self.assertLess(resident_pages() - baseline, 2560)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+from collections import namedtuple
+from fractions import Fraction
+
+import yices_api as yapi
+
+from yices.Config import Config
+from yices.Context import Context
+from yices.Linear import Linear
+from yices.Model import Model
+from yices.Status import Status
+from yices.Terms import Terms
+from yices.Types import Types
+from yices.Yices import Yices
+
+
+CSR = namedtuple('CSR', ['data', 'indices', 'indptr'])
+
+
+def naive(row, terms):
+    return Terms.sum([Terms.mul(Terms.rational_from_fraction(Fraction(c)), t) for (c, t) in zip(row, terms)])
+
+
+class TestLinear(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+        int_t = Types.int_type()
+        self.xs = [Terms.new_uninterpreted_term(int_t, f'x{i}') for i in range(3)]
+
+    def tearDown(self):
+        Yices.exit()
+
+    def test_dense(self):
+        matrix = [[1, -2, 0], [0, 3, 4], [Fraction(1, 3), 0, -5], [0.5, 1, 1]]
+        self.assertEqual(Linear.polynomials(matrix, self.xs), [naive(row, self.xs) for row in matrix])
+        self.assertEqual(Linear.polynomial([2, 3], self.xs[:2]),
+                         Terms.add(Terms.mul(Terms.integer(2), self.xs[0]), Terms.mul(Terms.integer(3), self.xs[1])))
+        [atom] = Linear.constraints([[1, 1, 0]], self.xs, [Fraction(7, 2)], '>=')
+        self.assertEqual(atom, Terms.arith_geq_atom(Terms.add(self.xs[0], self.xs[1]), Terms.rational(7, 2)))
+        with self.assertRaises(Exception):
+            Linear.polynomials([[1, 2]], self.xs)
+        with self.assertRaises(Exception):
+            Linear.constraints(matrix, self.xs, [1, 2])
+
+    def test_sparse(self):
+        matrix = CSR(data=[1, -2, 3, 4, 7], indices=[0, 1, 1, 2, 2], indptr=[0, 2, 4, 4, 5])
+        dense = [[1, -2, 0], [0, 3, 4], [0, 0, 0], [0, 0, 7]]
+        self.assertEqual(Linear.polynomials(matrix, self.xs), Linear.polynomials(dense, self.xs))
+
+    @unittest.skipUnless(yapi.hasNumPy(), 'needs numpy')
+    def test_numpy(self):
+        np = yapi.numpy
+        matrix = np.array([[1, -2, 0], [0, 3, 4], [5, 0, -6]], dtype=np.int64)
+        self.assertEqual(Linear.polynomials(matrix, self.xs), Linear.polynomials(matrix.tolist(), self.xs))
+        self.assertEqual(Linear.polynomials(matrix[:, ::-1], self.xs), Linear.polynomials(matrix.tolist(), self.xs[::-1]))
+        self.assertEqual(Linear.polynomials(matrix.astype(np.float64) / 2, self.xs),
+                         Linear.polynomials([[Fraction(c, 2) for c in row] for row in matrix.tolist()], self.xs))
+        sparse = CSR(data=np.array([1, -2, 3]), indices=np.array([0, 1, 2], dtype=np.int32), indptr=np.array([0, 2, 3]))
+        self.assertEqual(Linear.polynomials(sparse, self.xs), Linear.polynomials([[1, -2, 0], [0, 0, 3]], self.xs))
+
+    @unittest.skipUnless(yapi.hasGMP(), 'coefficients beyond 64 bits need libgmp')
+    def test_big(self):
+        big = (1 << 70) + 1
+        [poly] = Linear.polynomials([[big, Fraction(1, big), 1]], self.xs)
+        self.assertEqual(poly, Terms.parse_term(f'(+ (* {big} x0) (* 1/{big} x1) x2)'))
+
+    def test_assert(self):
+        cfg = Config()
+        cfg.default_config_for_logic('QF_LIA')
+        ctx = Context(cfg)
+        matrix = [[1, 1, 0], [-1, 0, 0], [0, -1, 0], [0, 1, -1]]
+        atoms = Linear.assert_constraints(ctx, matrix, self.xs, [3, -1, -1, 0], '<=')
+        self.assertEqual(len(atoms), 4)
+        self.assertEqual(ctx.check_context(), Status.SAT)
+        model = Model.from_context(ctx, 1)
+        values = [model.get_integer_value(x) for x in self.xs]
+        self.assertTrue(values[0] + values[1] <= 3 and values[0] >= 1 and values[1] >= 1 and values[1] <= values[2])
+        Linear.assert_constraints(ctx, [[1, 0, 0]], self.xs, [3], '=')
+        self.assertEqual(ctx.check_context(), Status.UNSAT)
+        model.dispose()
+        ctx.dispose()
+        cfg.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
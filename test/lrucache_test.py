@@ -0,0 +1,43 @@
+import threading
+import unittest
+
+from yices.LRUCache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_eviction(self):
+        cache = LRUCache(2)
+        self.assertIs(cache.store('a', 1), LRUCache.MISSING)
+        self.assertIs(cache.store('b', 2), LRUCache.MISSING)
+        self.assertEqual(cache.lookup('a'), 1)
+        # b is now the least recently used
+        self.assertEqual(cache.store('c', 3), 'b')
+        self.assertIs(cache.lookup('b'), LRUCache.MISSING)
+        self.assertEqual(cache.store('a', 4), LRUCache.MISSING)
+        self.assertEqual(cache.lookup('a'), 4)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1, 'size': 2, 'maxsize': 2})
+
+    def test_threads(self):
+        # threads storing and looking up the same few keys keep evicting each other's entries
+        cache = LRUCache(2)
+        errors = []
+        def churn(offset):
+            try:
+                for i in range(20000):
+                    key = (i + offset) % 5
+                    if cache.lookup(key) is LRUCache.MISSING:
+                        cache.store(key, key)
+            except Exception as error:  # pylint: disable=W0703
+                errors.append(error)
+        threads = [threading.Thread(target=churn, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -143,6 +143,68 @@ class TestModels(unittest.TestCase):
         mdl1.dispose()
 
 
+    def test_bulk_values(self):
+        bv_t = Types.bv_type(8)
+        ints = [define_const(f'bi{k}', int_t) for k in range(4)]
+        reals = [define_const(f'br{k}', real_t) for k in range(2)]
+        bvs = [define_const(f'bbv{k}', bv_t) for k in range(3)]
+        bools = [define_const(f'bb{k}', bool_t) for k in range(2)]
+        mapping = dict(zip(ints, [Terms.integer(v) for v in [7, -3, 7, 2**40]]))
+        mapping.update(zip(reals, [Terms.rational(1, 3), Terms.integer(5)]))
+        mapping.update(zip(bvs, [Terms.bvconst_integer(8, v) for v in [0, 134, 255]]))
+        mapping.update(zip(bools, [Terms.TRUE, Terms.FALSE]))
+        mdl = Model.from_map(mapping)
+        self.assertEqual(mdl.get_integer_values(ints), [7, -3, 7, 2**40])
+        self.assertEqual(mdl.get_fraction_values(reals), [Fraction(1, 3), Fraction(5)])
+        self.assertEqual(mdl.get_float_values(reals), [1/3, 5.0])
+        self.assertEqual(mdl.get_bv_values(bvs), [0, 134, 255])
+        self.assertEqual(mdl.get_bool_values(bools), [True, False])
+        self.assertEqual(mdl.get_values(ints + reals + bvs + bools), [7, -3, 7, 2**40, Fraction(1, 3), 5, 0, 134, 255, True, False])
+        self.assertEqual(list(mdl.get_values_as_terms(bools)), [Terms.TRUE, Terms.FALSE])
+        mdl.dispose()
+
+
+    def test_bv_integer_values(self):
+        for width in [3, 8, 64, 65, 256]:
+            bv_t = Types.bv_type(width)
+            bv1 = define_const(f'wbv{width}', bv_t)
+            big = (1 << width) - 2
+            mdl = Model()
+            mdl.set_bv(bv1, big)
+            self.assertEqual(mdl.get_bv_value(bv1), big)
+            self.assertEqual(mdl.get_bv_value(bv1, signed=True), -2)
+            bits = mdl.get_value(bv1)
+            self.assertEqual(sum(bit << i for (i, bit) in enumerate(bits)), big)
+            mdl.dispose()
+            mdl = Model()
+            mdl.set_bv(bv1, -1)
+            self.assertEqual(mdl.get_bv_value(bv1), (1 << width) - 1)
+            mdl.dispose()
+
+
+    def test_value_cache(self):
+        b1 = define_const('cb1', bool_t)
+        i1 = define_const('ci1', int_t)
+        i2 = define_const('ci2', int_t)
+        mdl = Model()
+        self.assertEqual(mdl.value_cache_stats(), None)
+        mdl.enable_value_cache(maxsize=2)
+        mdl.set_bool(b1, True)
+        mdl.set_integer(i1, 42)
+        for _ in range(3):
+            self.assertEqual(mdl.get_bool_value(b1), True)
+            self.assertEqual(mdl.get_integer_value(i1), 42)
+        self.assertEqual(mdl.value_cache_stats(), {'hits': 4, 'misses': 2, 'size': 2, 'maxsize': 2})
+        self.assertTrue(mdl.formula_true_in_model(b1))
+        self.assertEqual(mdl.value_cache_stats()['size'], 2)
+        mdl.set_integer(i2, 7)
+        self.assertEqual(mdl.value_cache_stats()['size'], 0)
+        self.assertEqual(mdl.get_integer_value(i2), 7)
+        mdl.disable_value_cache()
+        self.assertEqual(mdl.get_integer_value(i1), 42)
+        mdl.dispose()
+
+
     def test_tuple_models(self):
         tup_t = Types.new_tuple_type([bool_t, real_t, int_t])
         t1 = define_const('t1', tup_t)
@@ -234,6 +296,39 @@ class TestModels(unittest.TestCase):
         self.assertEqual(fun1val((1463, False, -579)), 1)
         self.assertEqual(fun1val((1464, True, -2042)), 0)
         self.assertEqual(fun1val((1462, True, -2041)), 2)
+        self.assertEqual(fun1val.arity, 3)
+        self.assertEqual(fun1val.default, 2)
+        self.assertEqual(dict(fun1val), {(1463, False, -579): 1, (1464, True, -2042): 0})
+        self.assertTrue(mdl.get_value(fun1) is fun1val)
+        self.assertEqual(len({fun1val, mdl.get_value(fun1)}), 1)
+
+    def test_shared_function_values(self):
+        arr_t = Types.new_function_type([int_t], int_t)
+        a1 = define_const('a1', arr_t)
+        a2 = define_const('a2', arr_t)
+        assert_formula('(and (= a1 a2) (= (a1 0) 7) (= (a1 1) 8))', self.ctx)
+        self.assertEqual(self.ctx.check_context(self.param), Status.SAT)
+        mdl = Model.from_context(self.ctx, 1)
+        a1val = mdl.get_value(a1)
+        self.assertTrue(mdl.get_value(a1) is a1val)
+        self.assertEqual(mdl.get_value(a2), a1val)
+        self.assertEqual(a1val(0), 7)
+        self.assertEqual(a1val[(1,)], 8)
+        self.assertEqual(hash(a1val), hash(mdl.get_value(a2)))
+
+    def test_bv_function_values(self):
+        bv8_t = Types.bv_type(8)
+        bvf = define_const('bvf', Types.new_function_type([int_t], bv8_t))
+        assert_formula('(and (= (bvf 0) 0b00000101) (= (bvf 1) 0b10000000))', self.ctx)
+        self.assertEqual(self.ctx.check_context(self.param), Status.SAT)
+        mdl = Model.from_context(self.ctx, 1)
+        bvfval = mdl.get_value(bvf)
+        self.assertEqual(bvfval(0), (1, 0, 1, 0, 0, 0, 0, 0))
+        self.assertEqual(bvfval[(1,)], (0, 0, 0, 0, 0, 0, 0, 1))
+        self.assertEqual(hash(bvfval), hash(mdl.get_value(bvf)))
+        self.assertEqual(len({bvfval}), 1)
+        # decoded values are shared, so they cannot be changed
+        self.assertIsInstance(mdl.get_value(Terms.application(bvf, [Terms.integer(0)])), tuple)
 
     # pylint: disable=C0103
     def test_model_support(self):
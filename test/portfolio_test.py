@@ -0,0 +1,43 @@
+import unittest
+
+from yices.Portfolio import Portfolio
+from yices.Status import Status
+from yices.Terms import Terms
+from yices.Types import Types
+from yices.Yices import Yices
+
+
+class TestPortfolio(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+
+    def tearDown(self):
+        Yices.exit()
+
+    def test_sat(self):
+        bv_t = Types.bv_type(16)
+        x = Terms.new_uninterpreted_term(bv_t, 'x')
+        y = Terms.new_uninterpreted_term(bv_t, 'y')
+        one = Terms.bvconst_integer(16, 1)
+        formulas = [Terms.bveq_atom(Terms.bvmul(x, y), Terms.bvconst_integer(16, 143)),
+                    Terms.bvgt_atom(x, one), Terms.bvgt_atom(y, one)]
+        (status, model, winner) = Portfolio.solve(formulas, Portfolio.default_strategies('QF_BV'), timeout=60)
+        self.assertEqual(status, Status.SAT)
+        self.assertIn(winner, range(len(Portfolio.default_strategies('QF_BV'))))
+        self.assertTrue(model.formulas_true_in_model(formulas))
+        self.assertEqual((model.get_bv_value(x) * model.get_bv_value(y)) % (1 << 16), 143)
+        model.dispose()
+
+    def test_unsat(self):
+        int_t = Types.int_type()
+        i = Terms.new_uninterpreted_term(int_t, 'i')
+        formulas = [Terms.arith_gt_atom(i, Terms.integer(3)), Terms.arith_lt_atom(i, Terms.integer(4))]
+        strategies = [{'logic': 'QF_LIA'}, {'logic': 'QF_LIA', 'params': {'branching': 'positive'}}]
+        (status, model, _) = Portfolio.solve(formulas, strategies, timeout=60)
+        self.assertEqual(status, Status.UNSAT)
+        self.assertIsNone(model)
+
+
+if __name__ == '__main__':
+    unittest.main()
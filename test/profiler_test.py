@@ -0,0 +1,187 @@
+import json
+import os
+import pstats
+import tempfile
+import threading
+import time
+import unittest
+
+import yices_api as yapi
+
+from yices.Elementwise import Elementwise
+from yices.Profiler import Profiler, profile
+from yices.Terms import Terms
+from yices.Types import Types
+from yices.Yices import Yices
+
+
+@profile
+def busy(n):
+    return sum(range(n))
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.enabled = Profiler.is_enabled()
+        Profiler.set_enabled(True)
+        Profiler.reset()
+
+    def tearDown(self):
+        Profiler.set_enabled(self.enabled)
+        Profiler.reset()
+
+    def test_counts(self):
+        for _ in range(10):
+            busy(1000)
+        Profiler.delta('fake', 0, 2000000)
+        snapshot = Profiler.snapshot()
+        self.assertEqual(snapshot['busy']['count'], 10)
+        self.assertLessEqual(snapshot['busy']['min_ns'], snapshot['busy']['p50_ns'])
+        self.assertLessEqual(snapshot['busy']['p50_ns'], snapshot['busy']['p99_ns'])
+        self.assertLessEqual(snapshot['busy']['p99_ns'], snapshot['busy']['max_ns'])
+        self.assertEqual(snapshot['fake'], {'count': 1, 'total_ns': 2000000, 'c_ns': 0, 'min_ns': 2000000, 'max_ns': 2000000,
+                                            'mean_ns': 2000000, 'p50_ns': 2000000, 'p90_ns': 2000000, 'p99_ns': 2000000})
+        self.assertEqual(Profiler.get_time('fake'), 2000000)
+        # 2ms, not 0.2ms
+        self.assertIn('\t\t2 milliseconds', Profiler.dump())
+        Profiler.reset()
+        self.assertEqual(Profiler.snapshot(), {})
+
+    def test_percentiles(self):
+        for nanos in range(1, 1001):
+            Profiler.delta('spread', 0, nanos * 1000)
+        snapshot = Profiler.snapshot()['spread']
+        self.assertAlmostEqual(snapshot['p50_ns'], 500000, delta=100000)
+        self.assertAlmostEqual(snapshot['p99_ns'], 990000, delta=200000)
+
+    def test_threads(self):
+        def work():
+            for _ in range(100):
+                busy(10)
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        busy(10)
+        self.assertEqual(Profiler.snapshot()['busy']['count'], 401)
+
+    def test_exports(self):
+        Profiler.enable_spans(8)
+        try:
+            for _ in range(20):
+                busy(100)
+            later = time.perf_counter_ns() + 10 ** 9
+            Profiler.delta('outer', later, later + 10)
+            Profiler.delta('inner', later + 2, later + 5)
+            self.assertEqual(len(Profiler.spans()), 8)
+            with tempfile.TemporaryDirectory() as directory:
+                trace = os.path.join(directory, 'trace.json')
+                Profiler.write_chrome_trace(trace)
+                with open(trace) as stream:
+                    events = json.load(stream)['traceEvents']
+                self.assertEqual(len([event for event in events if event['ph'] == 'X']), 8)
+                speedscope = os.path.join(directory, 'profile.speedscope.json')
+                Profiler.write_speedscope(speedscope)
+                with open(speedscope) as stream:
+                    [profile_] = json.load(stream)['profiles']
+                times = [event['at'] for event in profile_['events']]
+                self.assertEqual(times, sorted(times))
+                self.assertEqual([event['type'] for event in profile_['events']][-4:], ['O', 'O', 'C', 'C'])
+                prof = os.path.join(directory, 'yices.prof')
+                Profiler.write_pstats(prof)
+                stats = pstats.Stats(prof)
+                self.assertEqual(stats.stats[('yices', 0, 'busy')][1], 20)
+        finally:
+            Profiler.disable_spans()
+        self.assertEqual(Profiler.spans(), [])
+
+    def test_disabled(self):
+        Profiler.set_enabled(False)
+        self.assertEqual(busy(10), 45)
+        self.assertNotIn('busy', Profiler.snapshot())
+        Profiler.record_call('yices_fake', 1000, 500)
+        self.assertNotIn('yices_fake', Profiler.snapshot())
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+        Profiler.reset()
+
+    def tearDown(self):
+        Profiler.instrument(False)
+        Profiler.reset()
+        Yices.exit()
+
+    def test_every_call(self):
+        checked = yapi.yices_bvadd
+        Profiler.instrument()
+        self.assertTrue(Profiler.is_instrumenting())
+        bv_t = Types.bv_type(8)
+        x = Terms.new_uninterpreted_term(bv_t)
+        for _ in range(5):
+            Terms.bvadd(x, x)
+        snapshot = Profiler.snapshot()
+        self.assertEqual(snapshot['yices_bvadd']['count'], 5)
+        self.assertEqual(snapshot['yices_new_uninterpreted_term']['count'], 1)
+        self.assertLessEqual(snapshot['yices_bvadd']['c_ns'], snapshot['yices_bvadd']['total_ns'])
+        self.assertGreater(snapshot['yices_bvadd']['c_ns'], 0)
+        Profiler.instrument(False)
+        self.assertIs(yapi.yices_bvadd, checked)
+        Terms.bvadd(x, x)
+        self.assertEqual(Profiler.snapshot()['yices_bvadd']['count'], 5)
+
+    def test_raw_function(self):
+        bv_t = Types.bv_type(8)
+        xs = [Terms.new_uninterpreted_term(bv_t) for _ in range(4)]
+        Profiler.instrument()
+        Elementwise.bvadd(xs, xs)
+        snapshot = Profiler.snapshot()
+        self.assertEqual(snapshot['yices_bvadd']['count'], 4)
+        self.assertGreater(snapshot['yices_bvadd']['c_ns'], 0)
+        Profiler.instrument(False)
+        Elementwise.bvadd(xs, xs)
+        self.assertEqual(Profiler.snapshot()['yices_bvadd']['count'], 4)
+
+    def test_nested(self):
+        bv_t = Types.bv_type(8)
+        x = Terms.new_uninterpreted_term(bv_t)
+
+        @profile
+        def adds():
+            for _ in range(5):
+                Terms.bvadd(x, x)
+
+        Profiler.instrument()
+        adds()
+        snapshot = Profiler.snapshot()
+        self.assertEqual(snapshot['yices_bvadd']['count'], 5)
+        # the calls of yices_bvadd are part of adds, and count only once towards the total
+        self.assertEqual(Profiler.total_time(), snapshot['adds']['total_ns'])
+        self.assertIn('add up to more than 100', Profiler.dump())
+
+    def test_fast_mode(self):
+        fast = yapi.yices_is_fast()
+        Profiler.instrument()
+        try:
+            yapi.yices_set_fast_mode(True)
+            self.assertTrue(yapi.yices_is_fast())
+            # the wrappers that check their context or model handle are not replaced
+            with self.assertRaises(AssertionError):
+                yapi.yices_check_context(None, None)
+            Terms.yand([Terms.true(), Terms.false()])
+            self.assertGreater(Profiler.snapshot()['yices_and']['c_ns'], 0)
+            yapi.yices_set_fast_mode(False)
+            self.assertFalse(yapi.yices_is_fast())
+            Terms.yand([Terms.true(), Terms.false()])
+            self.assertEqual(Profiler.snapshot()['yices_and']['count'], 2)
+        finally:
+            Profiler.instrument(False)
+            yapi.yices_set_fast_mode(fast)
+
+
+if __name__ == '__main__':
+    unittest.main()
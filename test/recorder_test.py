@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+import yices_api as yapi
+
+from yices.Config import Config
+from yices.Context import Context
+from yices.Elementwise import Elementwise
+from yices.Model import Model
+from yices.Recorder import Recorder, Handle, Struct
+from yices.Replay import Replay
+from yices.Status import Status
+from yices.Terms import Terms
+from yices.Traversal import Traversal
+from yices.Types import Types
+from yices.Yices import Yices
+
+
+def workload():
+    bv_t = Types.bv_type(8)
+    x = Terms.new_uninterpreted_term(bv_t, 'x')
+    y = Terms.new_uninterpreted_term(bv_t, 'y')
+    p = Terms.new_uninterpreted_term(Types.bool_type(), 'p')
+    fmla = Terms.parse_term('(bvugt (bvadd x y) 0b00000011)')
+    # built lane by lane through yices_api.raw_function, which must be recorded too
+    sums = Elementwise.bvadd([x, y, x], [y, y, x])
+    fmla = Terms.yand([fmla, Terms.bvult_atom(sums[0], sums[2])])
+    cfg = Config()
+    cfg.default_config_for_logic('QF_BV')
+    ctx = Context(cfg)
+    ctx.assert_formulas([fmla, Terms.iff(p, Terms.bvslt_atom(x, y))])
+    status = ctx.check_context()
+    model = Model.from_context(ctx, 1)
+    value = model.get_bool_value(p)
+    size = Traversal().size([fmla])
+    model.dispose()
+    ctx.dispose()
+    cfg.dispose()
+    return (status, value, size)
+
+
+class TestRecorder(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+        (handle, self.path) = tempfile.mkstemp(suffix='.yrec')
+        os.close(handle)
+
+    def tearDown(self):
+        Recorder.stop()
+        os.remove(self.path)
+        Yices.exit()
+
+    def test_record(self):
+        Recorder.start(self.path)
+        self.assertTrue(Recorder.is_recording())
+        self.assertIsNotNone(yapi.yices_recorder())
+        (status, _, _) = workload()
+        count = Recorder.stop()
+        self.assertFalse(Recorder.is_recording())
+        self.assertIsNone(yapi.yices_recorder())
+        self.assertEqual(status, Status.SAT)
+        calls = list(Recorder.read(self.path))
+        self.assertEqual(len(calls), count)
+        self.assertEqual([call.index for call in calls], list(range(count)))
+        self.assertEqual(Recorder.library_version(self.path), yapi.yices_version)
+        names = [call.name for call in calls]
+        self.assertIn('yices_parse_term', names)
+        self.assertEqual(names.count('yices_bvadd'), 3)
+        new_context = calls[names.index('yices_new_context')]
+        self.assertIsInstance(new_context.result, Handle)
+        check = calls[names.index('yices_check_context')]
+        self.assertEqual(check.args[0], new_context.result)
+        children = calls[names.index('yices_term_children')]
+        self.assertIsInstance(children.args[1], Struct)
+        # nothing is recorded once stopped
+        Terms.integer(5)
+        self.assertEqual(len(list(Recorder.read(self.path))), count)
+
+    def test_replay(self):
+        Recorder.start(self.path)
+        workload()
+        count = Recorder.stop()
+        # replay in a fresh library, where the ids come out the same
+        Yices.exit()
+        Yices.init()
+        replay = Replay(self.path).run()
+        self.assertEqual(replay.skipped, [])
+        self.assertEqual(replay.failed, [])
+        self.assertEqual(replay.mismatches, [])
+        self.assertEqual(len(replay.timings), count)
+        snapshot = replay.snapshot()
+        self.assertEqual(snapshot['yices_check_context']['count'], 1)
+        self.assertIn('yices_check_context', replay.dump())
+        self.assertEqual(len(Replay(self.path).run(limit=3).timings), 3)
+
+    def test_pointer_from_before(self):
+        ctx = Context()
+        Recorder.start(self.path)
+        ctx.assert_formula(Terms.true())
+        ctx.check_context()
+        Recorder.stop()
+        ctx.dispose()
+        replay = Replay(self.path).run()
+        skipped = {name for (_, name, _) in replay.skipped}
+        self.assertIn('yices_assert_formula', skipped)
+        self.assertIn('yices_check_context', skipped)
+        self.assertNotIn('yices_check_context', replay.snapshot())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import yices_api as yapi
+
+from yices.Serializer import Serializer
+from yices.Terms import Terms
+from yices.Types import Types
+from yices.Yices import Yices
+
+
+class TestSerializer(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+
+    def tearDown(self):
+        Yices.exit()
+
+    def roundtrip(self, terms):
+        blob = pickle.loads(pickle.dumps(Serializer.dump(terms)))
+        return Serializer.load(blob)
+
+    def test_bv(self):
+        bv_t = Types.bv_type(16)
+        x = Terms.new_uninterpreted_term(bv_t, 'x')
+        y = Terms.new_uninterpreted_term(bv_t, 'y')
+        terms = [Terms.parse_term('(bv-gt (bv-add (bv-mul 0x0003 x) y 0x0001) 0xfff0)'),
+                 Terms.bvsdiv(x, Terms.bvconcat([Terms.bvextract(y, 0, 7), Terms.bvconst_integer(8, 200)])),
+                 Terms.bitextract(Terms.bvmul(x, Terms.bvmul(x, y)), 3),
+                 Terms.bvconst_integer(16, 1 << 15)]
+        self.assertEqual(self.roundtrip(terms), terms)
+
+    def test_structures(self):
+        int_t = Types.int_type()
+        bool_t = Types.bool_type()
+        colour_t = Types.new_scalar_type(3, 'colour')
+        tup_t = Types.new_tuple_type([int_t, bool_t, colour_t])
+        fun_t = Types.new_function_type([int_t, colour_t], bool_t)
+        t = Terms.new_uninterpreted_term(tup_t, 't')
+        f = Terms.new_uninterpreted_term(fun_t, 'f')
+        p = Terms.new_uninterpreted_term(bool_t, 'p')
+        v = Terms.new_variable(int_t)
+        red = Terms.constant(colour_t, 0)
+        terms = [Terms.ite(p, Terms.select(2, t), Terms.application(f, [Terms.integer(4), red])),
+                 Terms.eq(Terms.update(f, [Terms.integer(1), red], p), f),
+                 Terms.distinct([Terms.select(3, t), red, Terms.constant(colour_t, 2)]),
+                 Terms.forall([v], Terms.application(f, [v, red])),
+                 Terms.xor([p, Terms.ynot(Terms.select(2, t))])]
+        loaded = self.roundtrip(terms)
+        self.assertEqual(loaded[:3] + loaded[4:], terms[:3] + terms[4:])
+        # the bound variable is made afresh, so the quantified formula is equivalent rather than identical
+        self.assertEqual(Terms.to_string(loaded[3]), Terms.to_string(terms[3]))
+
+    def test_fresh(self):
+        bool_t = Types.bool_type()
+        p = Terms.new_uninterpreted_term(bool_t, 'fp')
+        q = Terms.new_uninterpreted_term(bool_t)
+        blob = Serializer.dump([Terms.yor([p, q])])
+        [same] = Serializer.load(blob)
+        [fresh] = Serializer.load(blob, reuse_names=False)
+        self.assertNotEqual(same, Terms.yor([p, q]))
+        self.assertNotEqual(fresh, same)
+        self.assertEqual(Terms.num_children(fresh), 2)
+
+    @unittest.skipUnless(yapi.hasGMP(), 'reading arithmetic sums needs libgmp')
+    def test_arithmetic(self):
+        real_t = Types.real_type()
+        x = Terms.new_uninterpreted_term(real_t, 'rx')
+        y = Terms.new_uninterpreted_term(real_t, 'ry')
+        terms = [Terms.parse_term('(> (+ (* 3/4 rx) (* rx ry ry) -1/3) 0)'),
+                 Terms.arith_leq_atom(Terms.division(x, y), Terms.parse_rational('123456789012345678901234567890/7')),
+                 Terms.parse_rational('-5/2')]
+        self.assertEqual(self.roundtrip(terms), terms)
+
+    def test_bytes(self):
+        bv_t = Types.bv_type(70)
+        bool_t = Types.bool_type()
+        colour_t = Types.new_scalar_type(3, 'shade')
+        x = Terms.new_uninterpreted_term(bv_t, 'bx')
+        y = Terms.new_uninterpreted_term(bv_t)
+        p = Terms.new_uninterpreted_term(bool_t, 'bp')
+        s = Terms.bvadd(Terms.bvmul(x, y), Terms.bvconst_integer(70, (1 << 69) + 5))
+        terms = [Terms.bvgt_atom(s, Terms.bvmul(s, s)),
+                 Terms.ite(p, Terms.bitextract(s, 68), Terms.eq(Terms.constant(colour_t, 2), Terms.new_uninterpreted_term(colour_t, 'c'))),
+                 Terms.bvsub(Terms.bvconst_integer(70, 3), Terms.bvmul(Terms.bvconst_integer(70, 7), x))]
+        data = Serializer.to_bytes(terms)
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(Serializer.from_bytes(data), terms)
+        # the shared sum is stored once
+        self.assertLess(len(data), len(Serializer.to_bytes(terms[:1])) + len(Serializer.to_bytes(terms[1:])))
+        with self.assertRaises(Exception):
+            Serializer.from_bytes(b'not a term')
+
+    def test_file(self):
+        int_t = Types.int_type()
+        i = Terms.new_uninterpreted_term(int_t, 'fi')
+        terms = [Terms.arith_geq_atom(Terms.mul(i, i), Terms.integer(10)), Terms.ynot(Terms.arith_eq0_atom(i))]
+        (handle, path) = tempfile.mkstemp(suffix='.ytrm')
+        os.close(handle)
+        try:
+            Serializer.save(path, terms)
+            self.assertEqual(Serializer.load_file(path), terms)
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
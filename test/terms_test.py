@@ -1,8 +1,13 @@
 import unittest
 
+from fractions import Fraction
+
+import yices_api as yapi
+
 from yices.Terms import Terms
 from yices.Types import Types
 from yices.Yices import Yices
+from yices.YicesException import YicesException
 
 # pylint: disable=R0914
 # pylint: disable=W0612
@@ -271,3 +276,70 @@ class TestTerms(unittest.TestCase):
         projarg1 = Terms.proj_arg(select2)
         self.assertEqual(Terms.proj_index(select2), 2)
         self.assertEqual(Terms.proj_arg(select2), tupconst1)
+
+    def test_bv_integers(self):
+        for width in [8, 64, 100, 4096]:
+            for value in [0, 1, 42, (1 << (width - 1)) + 5, (1 << width) - 1]:
+                bvconst = Terms.bvconst_integer(width, value)
+                self.assertEqual(Terms.bv_const_integer_value(bvconst), value)
+                self.assertEqual(Terms.bv_const_value(bvconst), [(value >> i) & 1 for i in range(width)])
+            minus_two = Terms.bvconst_integer(width, -2)
+            self.assertEqual(Terms.bv_const_integer_value(minus_two, signed=True), -2)
+            self.assertEqual(Terms.bv_const_integer_value(minus_two), (1 << width) - 2)
+
+    def test_constant_cache(self):
+        Terms.enable_constant_cache(2)
+        try:
+            forty_two = Terms.integer(42)
+            self.assertEqual(Terms.integer(42), forty_two)
+            half = Terms.rational(1, 2)
+            self.assertEqual(Terms.rational_from_fraction(Fraction(1, 2)), half)
+            self.assertEqual(Terms.bvconst_integer(8, 3), Terms.bvconst_integer(8, 3))
+            self.assertNotEqual(Terms.bvconst_integer(8, 3), Terms.bvconst_integer(16, 3))
+            stats = Terms.constant_cache_stats()
+            self.assertEqual(stats['hits'], 4)
+            self.assertEqual(stats['size'], 2)
+            with self.assertRaises(YicesException):
+                Terms.bvconst_integer(0, 1)
+            Yices.reset()
+            bool_t = Types.bool_type()
+            Terms.new_uninterpreted_term(bool_t, 'p')
+            self.assertEqual(Terms.to_string(Terms.integer(7)), '7')
+            self.assertEqual(Terms.constant_cache_stats()['size'], 1)
+            # the collector may free the cached constant, and give its id to another term
+            yapi.yices_garbage_collect(None, 0, None, 0, 0)
+            self.assertEqual(Terms.constant_cache_stats()['size'], 1)
+            self.assertEqual(Terms.to_string(Terms.integer(8)), '8')
+            self.assertEqual(Terms.constant_cache_stats()['size'], 1)
+        finally:
+            Terms.disable_constant_cache()
+        self.assertIsNone(Terms.constant_cache_stats())
+
+    def test_parse_cache(self):
+        Terms.enable_parse_cache(16)
+        try:
+            int_t = Types.int_type()
+            x = Terms.new_uninterpreted_term(int_t, 'x')
+            y = Terms.new_uninterpreted_term(int_t, 'y')
+            fmla = Terms.parse_term('(> x y)')
+            self.assertEqual(Terms.parse_terms(['(> x y)', '(< x 0)', '(> x y)']),
+                             [fmla, Terms.arith_lt_atom(x, Terms.ZERO), fmla])
+            self.assertEqual(Terms.parse_cache_stats()['hits'], 1)
+            # rebinding x makes the cached parse stale
+            z = Terms.new_uninterpreted_term(int_t, 'x')
+            self.assertEqual(Terms.parse_term('(> x y)'), Terms.arith_gt_atom(z, y))
+            Terms.remove_name('x')
+            self.assertEqual(Terms.parse_term('(> x y)'), fmla)
+            Terms.clear_name(y)
+            with self.assertRaises(YicesException):
+                Terms.parse_term('(> x y)')
+            # so does renaming a type
+            Types.set_name(int_t, 'num')
+            self.assertEqual(Terms.parse_term('(lambda ((n num)) (> n x))'), Terms.parse_term('(lambda ((n num)) (> n x))'))
+            bool_t = Types.bool_type()
+            Types.set_name(bool_t, 'num')
+            self.assertTrue(Types.is_function(Terms.type_of_term(Terms.parse_term('(lambda ((n num)) n)'))))
+            self.assertEqual(Types.child(Terms.type_of_term(Terms.parse_term('(lambda ((n num)) n)')), 0), bool_t)
+        finally:
+            Terms.disable_parse_cache()
+        self.assertIsNone(Terms.parse_cache_stats())
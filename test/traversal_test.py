@@ -0,0 +1,94 @@
+import unittest
+
+from yices.Constructors import Constructor
+from yices.Terms import Terms
+from yices.Traversal import Traversal
+from yices.Types import Types
+from yices.Yices import Yices
+
+
+class TestTraversal(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+
+    def tearDown(self):
+        Yices.exit()
+
+    def test_orders(self):
+        bool_t = Types.bool_type()
+        p = Terms.new_uninterpreted_term(bool_t, 'p')
+        q = Terms.new_uninterpreted_term(bool_t, 'q')
+        r = Terms.new_uninterpreted_term(bool_t, 'r')
+        shared = Terms.yor([p, q])
+        root = Terms.ite(r, shared, Terms.ynot(shared))
+        traversal = Traversal()
+        post = list(traversal.postorder([root]))
+        pre = list(traversal.preorder([root]))
+        self.assertEqual(len(post), len(set(post)))
+        self.assertEqual(set(post), set(pre))
+        self.assertEqual(post[-1], root)
+        self.assertEqual(pre[0], root)
+        for term in post:
+            for child in traversal.children(term):
+                self.assertLess(post.index(child), post.index(term))
+                self.assertLess(pre.index(term), pre.index(child))
+        self.assertEqual(traversal.size([root, shared]), len(post))
+        self.assertEqual(set(traversal.uninterpreted_terms([root])), {p, q, r})
+        visited = {shared}
+        self.assertNotIn(p, list(traversal.postorder([Terms.ynot(shared)], visited)))
+        self.assertIn(Terms.ynot(shared), visited)
+
+    def test_children(self):
+        bv_t = Types.bv_type(8)
+        int_t = Types.int_type()
+        x = Terms.new_uninterpreted_term(bv_t, 'x')
+        y = Terms.new_uninterpreted_term(bv_t, 'y')
+        i = Terms.new_uninterpreted_term(int_t, 'i')
+        traversal = Traversal()
+        bvsum = Terms.bvadd(Terms.bvmul(Terms.bvconst_integer(8, 3), x), Terms.bvconst_integer(8, 1))
+        self.assertEqual(traversal.constructor(bvsum), Constructor.BV_SUM)
+        self.assertEqual(list(traversal.children(bvsum)), [x])
+        product = Terms.mul(i, Terms.mul(i, i))
+        self.assertEqual(traversal.constructor(product), Constructor.POWER_PRODUCT)
+        self.assertEqual(list(traversal.children(product)), [i])
+        bit = Terms.bitextract(Terms.bvmul(x, y), 2)
+        self.assertEqual(list(traversal.children(bit)), [Terms.bvmul(x, y)])
+        eq = Terms.eq(x, y)
+        self.assertEqual(list(traversal.children(eq)), [Terms.child(eq, 0), Terms.child(eq, 1)])
+        self.assertEqual(len(traversal.children(x)), 0)
+
+    def test_fold(self):
+        bool_t = Types.bool_type()
+        x = Terms.new_uninterpreted_term(bool_t, 'fx')
+        term = x
+        for _ in range(50000):
+            term = Terms.ynot(Terms.yor([term, x]))
+        traversal = Traversal()
+        calls = []
+
+        def depth(t, constructor, values):
+            calls.append(t)
+            return 1 + max(values, default=0)
+
+        memo = {}
+        [deep] = traversal.fold([term], depth, memo)
+        self.assertGreater(deep, 50000)
+        self.assertEqual(len(calls), len(set(calls)))
+        count = len(calls)
+        self.assertEqual(traversal.fold([term, x], depth, memo), [deep, 1])
+        self.assertEqual(len(calls), count)
+
+    def test_reset(self):
+        bool_t = Types.bool_type()
+        p = Terms.new_uninterpreted_term(bool_t, 'p')
+        traversal = Traversal()
+        traversal.size([Terms.ynot(p)])
+        self.assertGreater(len(traversal), 0)
+        Yices.reset()
+        q = Terms.new_uninterpreted_term(bool_t, 'q')
+        self.assertEqual(traversal.uninterpreted_terms([Terms.ynot(q)]), [q])
+
+
+if __name__ == '__main__':
+    unittest.main()
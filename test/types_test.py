@@ -2,6 +2,7 @@ import unittest
 
 
 
+from yices.Terms import Terms
 from yices.Types import Types
 from yices.Yices import Yices
 
@@ -57,3 +58,42 @@ class TestTypes(unittest.TestCase):
         self.assertEqual(type_v[1], tup1_t)
         self.assertEqual(type_v[2], tup2_t)
         self.assertEqual(type_v[3], tup3_t)
+
+    def test_type_cache(self):
+        Types.enable_type_cache()
+        try:
+            bv8 = Types.bv_type(8)
+            self.assertEqual(Types.bv_type(8), bv8)
+            self.assertEqual(Types.type_cache_stats()['hits'], 1)
+            named = Types.bv_type(8, 'byte')
+            self.assertEqual(named, bv8)
+            self.assertEqual(Types.get_name(bv8), 'byte')
+            self.assertEqual(Types.type_cache_stats()['hits'], 1)
+            Yices.reset()
+            self.assertEqual(Types.bvtype_size(Types.bv_type(8)), 8)
+            self.assertEqual(Types.type_cache_stats()['size'], 1)
+        finally:
+            Types.disable_type_cache()
+
+    def test_parse_cache(self):
+        Types.enable_parse_cache()
+        try:
+            bv8 = Types.parse_type('(bitvector 8)')
+            self.assertEqual(Types.parse_types(['(bitvector 8)', 'int', '(bitvector 8)']), [bv8, Types.int_type(), bv8])
+            self.assertEqual(Types.parse_cache_stats()['hits'], 1)
+            Types.set_name(bv8, 'byte')
+            self.assertEqual(Types.parse_type('(-> byte bool)'), Types.new_function_type([bv8], Types.bool_type()))
+            Types.set_name(Types.int_type(), 'byte')
+            self.assertEqual(Types.parse_type('(-> byte bool)'), Types.new_function_type([Types.int_type()], Types.bool_type()))
+        finally:
+            Types.disable_parse_cache()
+
+    def test_declare_enum_names(self):
+        Terms.enable_parse_cache()
+        try:
+            p = Terms.new_uninterpreted_term(Types.bool_type(), 'red')
+            self.assertEqual(Terms.parse_term('red'), p)
+            (_, [red, _]) = Types.declare_enum('colour', ['red', 'green'])
+            self.assertEqual(Terms.parse_term('red'), red)
+        finally:
+            Terms.disable_parse_cache()
@@ -0,0 +1,81 @@
+import threading
+import unittest
+
+from yices.Config import Config
+from yices.Context import Context
+from yices.Status import Status
+from yices.Terms import Terms
+from yices.Types import Types
+from yices.VectorPool import VectorPool
+from yices.Yices import Yices
+
+
+class TestVectorPool(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+
+    def tearDown(self):
+        Yices.exit()
+
+    def test_reuse(self):
+        vec = VectorPool.acquire_term_vector()
+        VectorPool.release_term_vector(vec)
+        self.assertIs(VectorPool.acquire_term_vector(), vec)
+        VectorPool.release_term_vector(vec)
+        yvec = VectorPool.acquire_yval_vector()
+        VectorPool.release_yval_vector(yvec)
+        self.assertIs(VectorPool.acquire_yval_vector(), yvec)
+        VectorPool.release_yval_vector(yvec)
+
+    def test_per_thread(self):
+        vec = VectorPool.acquire_term_vector()
+        VectorPool.release_term_vector(vec)
+        seen = []
+        def borrow():
+            other = VectorPool.acquire_term_vector()
+            seen.append(other is vec)
+            VectorPool.release_term_vector(other)
+        thread = threading.Thread(target=borrow)
+        thread.start()
+        thread.join()
+        self.assertEqual(seen, [False])
+
+    def test_freed_after_exit(self):
+        # a thread that outlives yices_exit still frees its idle vectors when it finishes
+        borrowed = []
+        exited = threading.Event()
+        def borrow():
+            vec = VectorPool.acquire_term_vector()
+            VectorPool.release_term_vector(vec)
+            borrowed.append(vec)
+            exited.wait()
+        thread = threading.Thread(target=borrow)
+        thread.start()
+        while not borrowed:
+            thread.join(0.01)
+        Yices.exit()
+        exited.set()
+        thread.join()
+        Yices.init()
+        self.assertFalse(borrowed[0].data)
+
+    def test_unsat_core(self):
+        cfg = Config()
+        ctx = Context(cfg)
+        bool_t = Types.bool_type()
+        [p, q, r] = [Terms.new_uninterpreted_term(bool_t) for _ in range(3)]
+        ctx.assert_formula(Terms.implies(p, Terms.ynot(q)))
+        for _ in range(3):
+            self.assertEqual(ctx.check_context_with_assumptions(None, [p, q, r]), Status.UNSAT)
+            core = ctx.get_unsat_core()
+            self.assertEqual(sorted(core), sorted([p, q]))
+            self.assertEqual(core.typecode, 'i')
+        (idle_terms, _) = VectorPool.idle()
+        self.assertGreaterEqual(idle_terms, 1)
+        ctx.dispose()
+        cfg.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import threading
+import unittest
+
+from yices.Config import Config
+from yices.Context import Context
+from yices.Status import Status
+from yices.Terms import Terms
+from yices.Types import Types
+from yices.Watchdog import Watchdog
+from yices.Yices import Yices
+
+
+class TestWatchdog(unittest.TestCase):
+
+    def setUp(self):
+        Yices.init()
+
+    def tearDown(self):
+        Yices.exit()
+
+    def test_arm_and_disarm(self):
+        fired = threading.Event()
+        late = Watchdog.arm(60, fired.set)
+        soon = Watchdog.arm(0.01, fired.set)
+        self.assertTrue(fired.wait(5))
+        self.assertFalse(Watchdog.disarm(soon))
+        self.assertTrue(Watchdog.disarm(late))
+        self.assertEqual(Watchdog.pending(), 0)
+
+    def test_check_timeouts(self):
+        cfg = Config()
+        ctx = Context(cfg)
+        bool_t = Types.bool_type()
+        [p, q] = [Terms.new_uninterpreted_term(bool_t) for _ in range(2)]
+        ctx.assert_formula(Terms.yor([p, q]))
+        self.assertEqual(ctx.check_context(timeout=60), Status.SAT)
+        self.assertEqual(ctx.check_context_with_assumptions(None, [Terms.ynot(p)], timeout=60), Status.SAT)
+        self.assertEqual(ctx.check_context_with_assumptions(None, [Terms.ynot(p), Terms.ynot(q)], timeout=60), Status.UNSAT)
+        self.assertEqual(Watchdog.pending(), 0)
+        ctx.dispose()
+        cfg.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
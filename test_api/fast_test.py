@@ -0,0 +1,48 @@
+import unittest
+
+import yices_api
+from yices_api import (
+    YicesAPIException,
+    yices_init,
+    yices_exit,
+    yices_set_fast_mode,
+    yices_is_fast,
+    )
+
+
+class TestFastMode(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = yices_api.YICES_API_FAST
+
+    def tearDown(self):
+        yices_set_fast_mode(self.saved)
+        if not yices_api.yices_is_inited():
+            yices_init()
+        yices_exit()
+
+    def test_fast_mode(self):
+        yices_set_fast_mode(True)
+        yices_init()
+        self.assertTrue(yices_is_fast())
+        bv8 = yices_api.yices_bv_type(8)
+        x = yices_api.yices_new_uninterpreted_term(bv8)
+        self.assertNotEqual(yices_api.yices_bvadd(x, x), -1)
+        self.assertIsNot(yices_api.yices_bvadd, yices_api.__checked_api__['yices_bvadd'])
+        yices_exit()
+        self.assertFalse(yices_is_fast())
+        with self.assertRaises(YicesAPIException):
+            yices_api.yices_bvadd(x, x)
+
+    def test_toggle(self):
+        yices_set_fast_mode(False)
+        yices_init()
+        self.assertFalse(yices_is_fast())
+        yices_set_fast_mode(True)
+        self.assertTrue(yices_is_fast())
+        yices_set_fast_mode(False)
+        self.assertFalse(yices_is_fast())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import yices_api
+from yices import Terms, Types
+assert isinstance(yices_api.libyices, yices_api.LazyLibrary)
+before = len(yices_api.libyices.bound_symbols())
+x = Terms.new_uninterpreted_term(Types.bv_type(8), 'x')
+assert Terms.bvadd(x, x) != Terms.NULL_TERM
+after = yices_api.libyices.bound_symbols()
+assert 'yices_bvadd' in after
+assert before < len(after) < 100
+# neither fast mode nor instrumentation binds the symbols that are not called
+yices_api.yices_set_fast_mode(True)
+yices_api.yices_set_instrumentation(lambda name, total_ns, c_ns: None)
+assert Terms.bvmul(x, x) != Terms.NULL_TERM
+assert yices_api.yices_and2(Terms.true(), Terms.false()) == Terms.false()
+bound = yices_api.libyices.bound_symbols()
+assert 'yices_bvmul' in bound and 'yices_and2' in bound
+assert len(bound) < 100, len(bound)
+yices_api.yices_set_instrumentation(None)
+assert yices_api.yices_bvsub(x, x) != Terms.NULL_TERM
+assert len(yices_api.libyices.bound_symbols()) < 100
+'''
+
+class TestLazyBinding(unittest.TestCase):
+
+    def test_lazy_import(self):
+        env = dict(os.environ)
+        env['YICES_API_LAZY'] = '1'
+        env['PYTHONPATH'] = os.pathsep.join([ROOT, env.get('PYTHONPATH', '')])
+        result = subprocess.run([sys.executable, '-c', PROBE], env=env, check=False)
+        self.assertEqual(result.returncode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
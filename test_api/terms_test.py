@@ -1,5 +1,6 @@
 import unittest
 
+from array import array
 from ctypes import c_int32
 
 import yices_api as yapi
@@ -338,3 +339,23 @@ class TestTerms(unittest.TestCase):
         yapi.yices_garbage_collect(int4, 1, ta4, 1, 0)
         self.assertEqual(yapi.yices_num_terms(), 5)
         self.assertEqual(yapi.yices_num_types(), 3)
+
+    def test_buffer_arrays(self):
+        bool_t = yapi.yices_bool_type()
+        bools = array('i', [yapi.yices_new_uninterpreted_term(bool_t) for _ in range(3)])
+        # writable int32 buffers are shared, not copied
+        carray = yapi.make_term_array(bools)
+        carray[0] = yapi.yices_true()
+        self.assertEqual(bools[0], yapi.yices_true())
+        copied = yapi.make_term_array(bools, copy=True)
+        copied[0] = yapi.yices_false()
+        self.assertEqual(bools[0], yapi.yices_true())
+        # read only buffers are copied
+        readonly = memoryview(bools.tobytes()).cast('i')
+        self.assertEqual(list(yapi.make_term_array(readonly)), list(bools))
+        # buffers of the wrong width are unpacked
+        self.assertEqual(list(yapi.make_int32_array(array('q', [1, 2]))), [1, 2])
+        self.assertEqual(list(yapi.make_int64_array(array('q', [1, 2]))), [1, 2])
+        conj1 = yapi.yices_and(len(bools), yapi.make_term_array(bools))
+        conj2 = yapi.yices_and(len(bools), yapi.make_term_array(list(bools)))
+        self.assertEqual(conj1, conj2)
@@ -0,0 +1,63 @@
+"""Allocations remembers where the Context, Config, Model and Parameters objects still in use were made.
+
+It is off by default. Once Census.track_allocations() turns it on, each of those objects hands
+its finalizer to Allocations.born as it is made, and the stack of the call that made it is
+kept until the finalizer has run, that is until the object is disposed of or collected. The
+stacks of the objects that are still around are what Census attributes leaks to.
+"""
+import sys
+import threading
+import traceback
+
+import yices_api as yapi
+
+
+class Allocations:
+
+    """the number of frames kept per object while tracking, None when not tracking."""
+    __depth = None
+
+    """the finalizer of each tracked object, mapped to its kind, generation and stack."""
+    __sites = {}
+
+    """when to next drop the entries of the objects that are gone."""
+    __prune_at = 1024
+
+    __lock = threading.Lock()
+
+    @staticmethod
+    def start(depth=16):
+        """starts keeping the stack, depth frames deep, of every object made from now on."""
+        Allocations.__depth = depth
+
+    @staticmethod
+    def stop():
+        """stops keeping stacks, and forgets those kept so far."""
+        Allocations.__depth = None
+        with Allocations.__lock:
+            Allocations.__sites = {}
+
+    @staticmethod
+    def is_tracking():
+        return Allocations.__depth is not None
+
+    @staticmethod
+    def born(kind, finalizer):
+        """called by the constructor of an object of the given kind, with the finalizer that releases it."""
+        depth = Allocations.__depth
+        if depth is None:
+            return
+        # frame 0 is this one, frame 1 the constructor, and frame 2 the code that made the object
+        stack = traceback.extract_stack(sys._getframe(2), limit=depth)  # pylint: disable=W0212
+        with Allocations.__lock:
+            sites = Allocations.__sites
+            sites[finalizer] = (kind, yapi.yices_generation(), stack)
+            if len(sites) >= Allocations.__prune_at:
+                Allocations.__sites = sites = {f: site for (f, site) in sites.items() if f.alive}
+                Allocations.__prune_at = max(1024, 2 * len(sites))
+
+    @staticmethod
+    def undisposed():
+        """returns the (kind, generation, stack) of every tracked object that has been neither disposed of nor collected."""
+        with Allocations.__lock:
+            return [site for (finalizer, site) in Allocations.__sites.items() if finalizer.alive]
@@ -0,0 +1,96 @@
+"""Batch checks many independent queries in parallel, on a pool of long lived worker processes.
+
+The term table of libyices belongs to one process, and is not thread safe unless the library is
+built to be, so the way to use every core is to use several processes. Batch.solve_many serializes
+each query (see Serializer), hands it to one of its workers, and yields the answers in the order
+in which they come back. The workers keep their term tables and a ContextPool between queries,
+so named terms shared by many queries are only rebuilt once per worker, and contexts are reused.
+
+Workers are started with the 'spawn' method, so the main module of a program that uses
+Batch must be guarded by if __name__ == '__main__'.
+"""
+import collections
+import multiprocessing
+
+from .ContextPool import ContextPool
+from .FunctionValue import FunctionValue
+from .Model import Model
+from .Serializer import Serializer
+from .Status import Status
+from .Terms import Terms
+
+
+# the worker's pool of contexts, made by _start_worker
+_contexts = None
+
+
+"""a query whose terms' values are wanted when its formulas are satisfiable."""
+Query = collections.namedtuple('Query', ['formulas', 'terms'])
+
+
+class Batch:
+
+    Query = Query
+
+    @staticmethod
+    def solve_many(queries, workers=None, logic=None, timeout=None, chunksize=1, max_tasks=None):
+        """checks each query in a worker process and yields (index, status, values) as the answers come in.
+
+        A query is either a sequence of formulas, or a Batch.Query(formulas, terms) where terms are
+        the terms whose values are wanted when the formulas are satisfiable. index is the position of the query
+        in queries, values is the list of the values of the terms (as Model.get_values returns them,
+        with scalars as their index and functions as a pair (dict, default)) if the status is SAT,
+        and None otherwise. If the query could not be checked, the status is Status.ERROR and values
+        is the error message.
+
+        workers defaults to the number of cores, logic selects the configuration of the contexts,
+        timeout bounds each check, chunksize is the number of queries handed to a worker at a time,
+        and max_tasks, if not None, replaces a worker (and so its term table) after that many queries.
+        """
+        # serialized here, in the calling thread: the pool would otherwise draw from a generator
+        # in its task handler thread, calling into libyices alongside the caller
+        tasks = [_task(index, query, logic, timeout) for (index, query) in enumerate(queries)]
+        spawn = multiprocessing.get_context('spawn')
+        with spawn.Pool(workers, initializer=_start_worker, maxtasksperchild=max_tasks) as pool:
+            yield from pool.imap_unordered(_check, tasks, chunksize)
+
+
+def _task(index, query, logic, timeout):
+    if isinstance(query, Query):
+        (formulas, terms) = query
+    else:
+        (formulas, terms) = (query, [])
+    formulas = list(formulas)
+    return (index, Serializer.dump(formulas + list(terms)), len(formulas), logic, timeout)
+
+
+def _start_worker():
+    global _contexts  # pylint: disable=W0603
+    _contexts = ContextPool()
+
+
+def _check(task):
+    (index, blob, count, logic, timeout) = task
+    try:
+        terms = Serializer.load(blob)
+        with _contexts.context(logic) as context:
+            context.assert_formulas(terms[:count])
+            status = context.check_context(None, timeout)
+            values = None
+            if status == Status.SAT and len(terms) > count:
+                with Model.from_context(context, 1) as model:
+                    values = _values(model, terms[count:])
+        return (index, status, values)
+    except Exception as exc:  # pylint: disable=W0703
+        return (index, Status.ERROR, str(exc))
+
+
+def _values(model, terms):
+    values = model.get_values(terms)
+    for (k, term) in enumerate(terms):
+        if Terms.is_scalar(term):
+            # scalar constants are only meaningful in this process, their index is not
+            values[k] = model.get_scalar_value(term)
+        elif isinstance(values[k], FunctionValue):
+            values[k] = (dict(values[k]), values[k].default)
+    return values
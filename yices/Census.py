@@ -1,19 +1,191 @@
-"""For leak detection"""
+"""For leak detection.
 
+A census counts what a process holds on to: the terms and types in libyices (all of them, and
+those with a positive reference count), the resident set size of the process, and the live
+Context, Config, Model and Parameters objects. A sampler can take one every so often, to chart
+the growth of a long running service, and with track_allocations each undisposed object can be
+traced back to the code that made it.
+
+The sampler calls into libyices from its own thread, holding the library lock so that a
+yices_exit or yices_reset elsewhere waits for it; the counts it reads are plain counters, but a
+library built without thread safety may report them slightly out of date.
+
+Objects made before the last yices_exit or yices_reset were freed along with the rest of the
+library, so they are not counted as leaks, only as stale.
+"""
+import collections
+import csv
+import os
+import threading
+import time
+
+import yices_api as yapi
+
+from .Allocations import Allocations
 from .Context import Context
 from .Config import Config
 from .Parameters import Parameters
 from .Model import Model
 from .StringBuilder import StringBuilder
+from .YicesException import YicesException
+
+
+# the columns of a census, in the order dump and write_csv show them
+FIELDS = ('time', 'terms', 'types', 'posref_terms', 'posref_types', 'rss_bytes',
+          'contexts', 'configs', 'models', 'parameters')
+
+_PACKAGE = os.path.dirname(os.path.abspath(__file__))
+
 
 class Census:
 
+    """the thread taking samples, the event that stops it, and the samples it has taken."""
+    __sampler = None
+    __stop = None
+    __samples = collections.deque(maxlen=1024)
+
+    __lock = threading.Lock()
+
+    @staticmethod
+    def snapshot():
+        """returns the current census as a dict with the keys in FIELDS; the libyices counts are None when it is not inited."""
+        with yapi.yices_library_lock():
+            inited = yapi.yices_is_inited()
+            counts = {'terms': yapi.yices_num_terms() if inited else None,
+                      'types': yapi.yices_num_types() if inited else None,
+                      'posref_terms': yapi.yices_num_posref_terms() if inited else None,
+                      'posref_types': yapi.yices_num_posref_types() if inited else None}
+        return {'time': time.time(),
+                **counts,
+                'rss_bytes': _resident_bytes(),
+                'contexts': Context.population(),
+                'configs': Config.population(),
+                'models': Model.population(),
+                'parameters': Parameters.population()}
+
+    @staticmethod
+    def track_allocations(flag=True, depth=16):
+        """starts (or with False stops) keeping the stack, depth frames deep, that made each Context, Config, Model and Parameters."""
+        if flag:
+            Allocations.start(depth)
+        else:
+            Allocations.stop()
+
+    @staticmethod
+    def is_tracking_allocations():
+        return Allocations.is_tracking()
+
+    @staticmethod
+    def undisposed():
+        """returns the (kind, stack) of each object made while tracking that is still alive, stack being a traceback.StackSummary.
+
+        Objects made before the last yices_exit or yices_reset are left out, see stale.
+        """
+        generation = yapi.yices_generation()
+        return [(kind, stack) for (kind, made, stack) in Allocations.undisposed() if made == generation]
+
+    @staticmethod
+    def stale():
+        """returns the number of objects still alive that were made while tracking, before the last yices_exit or yices_reset."""
+        generation = yapi.yices_generation()
+        return sum(1 for (_, made, _) in Allocations.undisposed() if made != generation)
+
+    @staticmethod
+    def leak_sites(limit=10):
+        """returns the limit call sites with the most undisposed objects, as (kind, 'file:line in function', count) tuples.
+
+        The call site of an object is the innermost frame of its stack outside the yices package;
+        objects made before the last yices_exit or yices_reset are left out.
+        """
+        counts = collections.Counter((kind, _call_site(stack)) for (kind, stack) in Census.undisposed())
+        return [(kind, site, count) for ((kind, site), count) in counts.most_common(limit)]
+
+    @staticmethod
+    def start_sampler(interval=60.0, capacity=1024, callback=None):
+        """starts taking a census every interval seconds, keeping the last capacity of them; callback, if given, is passed each one."""
+        with Census.__lock:
+            if Census.__sampler is not None:
+                raise YicesException(msg='Census.start_sampler: the sampler is already running\n')
+            Census.__samples = collections.deque(maxlen=capacity)
+            stop = Census.__stop = threading.Event()
+            samples = Census.__samples
+
+            def sample():
+                while True:
+                    census = Census.snapshot()
+                    samples.append(census)
+                    if callback is not None:
+                        callback(census)
+                    if stop.wait(interval):
+                        return
+
+            Census.__sampler = threading.Thread(target=sample, name='yices census', daemon=True)
+            Census.__sampler.start()
+
+    @staticmethod
+    def stop_sampler():
+        """stops the sampler, waiting for it to finish; the samples it took are kept."""
+        with Census.__lock:
+            (sampler, stop) = (Census.__sampler, Census.__stop)
+            Census.__sampler = Census.__stop = None
+        if sampler is not None:
+            stop.set()
+            sampler.join()
+
     @staticmethod
-    def dump():
+    def is_sampling():
+        return Census.__sampler is not None
+
+    @staticmethod
+    def samples():
+        """returns the censuses the sampler has taken, oldest first."""
+        return list(Census.__samples)
+
+    @staticmethod
+    def write_csv(path):
+        """writes the samples to path, one row per census with the columns in FIELDS, for charting."""
+        with open(path, 'w', newline='') as stream:
+            writer = csv.DictWriter(stream, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(Census.samples())
+
+    @staticmethod
+    def dump(limit=10):
+        census = Census.snapshot()
         sb = StringBuilder()
         sb.append('\nCensus:\n')
-        sb.append(f'\tContexts     {Context.population()}\n')
-        sb.append(f'\tConfigs      {Config.population()}\n')
-        sb.append(f'\tModels       {Model.population()}\n')
-        sb.append(f'\tParameters   {Parameters.population()}\n')
+        sb.append(f'\tContexts     {census["contexts"]}\n')
+        sb.append(f'\tConfigs      {census["configs"]}\n')
+        sb.append(f'\tModels       {census["models"]}\n')
+        sb.append(f'\tParameters   {census["parameters"]}\n')
+        if census['terms'] is not None:
+            sb.append(f'\tTerms        {census["terms"]} ({census["posref_terms"]} referenced)\n')
+            sb.append(f'\tTypes        {census["types"]} ({census["posref_types"]} referenced)\n')
+        if census['rss_bytes'] is not None:
+            sb.append(f'\tResident     {census["rss_bytes"] / (1 << 20):.1f} MiB\n')
+        if Allocations.is_tracking():
+            sites = Census.leak_sites(limit)
+            sb.append(f'\nUndisposed objects by call site{":" if sites else ": none"}\n')
+            for (kind, site, count) in sites:
+                sb.append(f'\t{count:8} {kind:12} {site}\n')
+            stale = Census.stale()
+            if stale:
+                sb.append(f'\t{stale} more from before the last exit or reset, already freed by libyices\n')
         return str(sb)
+
+
+def _resident_bytes():
+    """the resident set size of this process, or None when /proc is not available."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _call_site(stack):
+    for frame in reversed(stack):
+        if not os.path.abspath(frame.filename).startswith(_PACKAGE + os.sep):
+            return f'{frame.filename}:{frame.lineno} in {frame.name}'
+    frame = stack[-1]
+    return f'{frame.filename}:{frame.lineno} in {frame.name}'
@@ -1,15 +1,34 @@
 """Config is a Pythonesque wrapper around a yices2 ctx_config_t object. Used to configure Contexts."""
+import threading
+import weakref
+
 import yices_api as yapi
 
+from .Allocations import Allocations
+from .Releases import Releases
 from .YicesException import YicesException
 
 class Config:
 
     __population = 0
+    # finalizers change the population from any thread
+    __population_lock = threading.RLock()
 
     def __init__(self):
+        Releases.drain()
         self.config = yapi.yices_new_config()
-        Config.__population += 1
+        with Config.__population_lock:
+            Config.__population += 1
+        # frees the config when this object is collected, unless dispose got there first
+        self._finalizer = weakref.finalize(self, Config._release, self.config, yapi.yices_generation(), threading.get_ident())
+        self._finalizer.atexit = False
+        Allocations.born('Config', self._finalizer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose()
 
     def default_config_for_logic(self, logicstr):
         assert self.config is not None
@@ -24,9 +43,16 @@ class Config:
             raise YicesException('yices_set_config')
 
     def dispose(self):
-        yapi.yices_free_config(self.config)
+        """Frees the config; disposing of it a second time does nothing."""
+        self._finalizer()
         self.config = None
-        Config.__population -= 1
+
+    @staticmethod
+    def _release(config, generation, owner):
+        with Config.__population_lock:
+            Config.__population -= 1
+        # this may run on any thread; Releases leaves the free to the owner
+        Releases.release(owner, yapi.yices_free_config, config, generation)
 
     @staticmethod
     def population():
@@ -4,25 +4,55 @@ A context contains one or more solvers and supports operations for
 manipulating assertions and for checking whether these assertions are
 satisfiable. If they are, a model can be constructed from the context."""
 
+import asyncio
+import os
 import threading
+import weakref
+
+from concurrent.futures import ThreadPoolExecutor
 
 import yices_api as yapi
 
+from .Allocations import Allocations
+from .Releases import Releases
 from .YicesException import YicesException
 
 from .Status import Status
+from .VectorPool import VectorPool
+from .Watchdog import Watchdog
 from .Yices import Yices
 
 class Context:
 
     __population = 0
+    # finalizers change the population from any thread
+    __population_lock = threading.RLock()
+
+    # runs the checks of the *_async methods, created on first use
+    __executor = None
+
+    __executor_lock = threading.Lock()
 
     def __init__(self, config=None):
+        Releases.drain()
         cfg = config.config if config else None
         self.context = Yices.new_context(cfg)
         if self.context == -1:
             raise YicesException('yices_new_context')
-        Context.__population += 1
+        # the formulas asserted at each push level, so that an interrupted context can be restored
+        self._asserted = [[]]
+        with Context.__population_lock:
+            Context.__population += 1
+        # frees the context when this object is collected, unless dispose got there first
+        self._finalizer = weakref.finalize(self, Context._release, self.context, yapi.yices_generation(), threading.get_ident())
+        self._finalizer.atexit = False
+        Allocations.born('Context', self._finalizer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose()
 
     # option is a string
     def enable_option(self, option):
@@ -51,6 +81,7 @@ class Context:
         errcode = Yices.assert_formula(self.context, term)
         if errcode == -1:
             raise YicesException('yices_assert_formula')
+        self._asserted[-1].append(term)
         return True
 
     # to be very pythonesque we should handle iterables, but we do need to know the length
@@ -61,6 +92,7 @@ class Context:
         errcode = Yices.assert_formulas(self.context, alen, a)
         if errcode == -1:
             raise YicesException('yices_assert_formulas')
+        self._asserted[-1].extend(a)
         return True
 
 
@@ -69,18 +101,25 @@ class Context:
         # unwrap the params object
         if params is not None:
             params = params.params
-        # set the timeout
-        if timeout is not None:
-            timer = threading.Timer(timeout, Context.stop_search, [self])
-            timer.start()
-        status = Yices.check_context(self.context, params)
-        if timeout is not None:
-            timer.cancel()
+        watch = self._watch(timeout)
+        try:
+            status = Yices.check_context(self.context, params)
+        finally:
+            self._unwatch(watch)
         if status == -1:
             raise YicesException('yices_check_context')
         return status
 
 
+    def _watch(self, timeout):
+        """arms the shared watchdog to stop the search in timeout seconds, if there is a timeout."""
+        return Watchdog.arm(timeout, self.stop_search) if timeout is not None else None
+
+    @staticmethod
+    def _unwatch(watch):
+        if watch is not None:
+            Watchdog.disarm(watch)
+
     def stop_search(self):
         assert self.context is not None
         #yapi.yices_stop_search(self.context)
@@ -90,6 +129,7 @@ class Context:
         assert self.context is not None
         #yapi.yices_reset_context(self.context)
         Yices.reset_context(self.context)
+        self._asserted = [[]]
 
     def assert_blocking_clause(self):
         assert self.context is not None
@@ -104,6 +144,7 @@ class Context:
         errcode = Yices.push(self.context)
         if errcode == -1:
             raise YicesException('yices_push')
+        self._asserted.append([])
         return True
 
     def pop(self):
@@ -111,28 +152,121 @@ class Context:
         errcode = Yices.pop(self.context)
         if errcode == -1:
             raise YicesException('yices_pop')
+        self._asserted.pop()
         return True
 
 
-    def check_context_with_assumptions(self, params, python_array_or_tuple):
+    def check_context_with_assumptions(self, params, python_array_or_tuple, timeout=None):
         assert self.context is not None
         alen = len(python_array_or_tuple)
         a = yapi.make_term_array(python_array_or_tuple)
-        status = Yices.check_context_with_assumptions(self.context, params, alen, a)
+        watch = self._watch(timeout)
+        try:
+            status = Yices.check_context_with_assumptions(self.context, params, alen, a)
+        finally:
+            self._unwatch(watch)
         if status == Status.ERROR:
             raise YicesException('check_context_with_assumptions')
         return status
 
-    def check_context_with_model(self, params, model, python_array_or_tuple):
+    def check_context_with_model(self, params, model, python_array_or_tuple, timeout=None):
         assert self.context is not None
         assert model is not None
         alen = len(python_array_or_tuple)
         a = yapi.make_term_array(python_array_or_tuple)
-        status = yapi.yices_check_context_with_model(self.context, params, model.model, alen, a)
+        watch = self._watch(timeout)
+        try:
+            status = yapi.yices_check_context_with_model(self.context, params, model.model, alen, a)
+        finally:
+            self._unwatch(watch)
         if status == Status.ERROR:
             raise YicesException('check_context_with_model')
         return status
 
+    # asyncio counterparts of the check methods
+    #
+    # The check runs on a dedicated executor (ctypes releases the GIL during the C call), so the
+    # event loop keeps running. Cancelling the awaiting task stops the search and waits for the
+    # check to return before the CancelledError is propagated, so the context is never left in
+    # the middle of a search; a check cancelled before it started is simply dropped.
+    #
+    # Unless libyices is thread safe, the check holds yices_api.yices_library_lock(), which keeps
+    # yices_exit, yices_reset and the Census sampler out, but nothing else: the caller must make
+    # no other call into libyices (assertions, term construction, checks of other contexts)
+    # until the check is over. stop_search is the exception, it is meant to be called meanwhile.
+
+    async def check_context_async(self, params=None, timeout=None):
+        return await self._check_async(lambda: self.check_context(params, timeout))
+
+    async def check_context_with_assumptions_async(self, params, python_array_or_tuple, timeout=None):
+        return await self._check_async(lambda: self.check_context_with_assumptions(params, python_array_or_tuple, timeout))
+
+    async def check_context_with_model_async(self, params, model, python_array_or_tuple, timeout=None):
+        return await self._check_async(lambda: self.check_context_with_model(params, model, python_array_or_tuple, timeout))
+
+    @staticmethod
+    def executor():
+        """returns the executor the *_async checks run on; it has a single worker unless libyices is thread safe."""
+        with Context.__executor_lock:
+            if Context.__executor is None:
+                workers = (os.cpu_count() or 1) if Yices.is_thread_safe() else 1
+                Context.__executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='yices-check')
+            return Context.__executor
+
+    async def _check_async(self, check):
+        """runs check on the executor; if cancelled, stops the search, and restores the context if it was interrupted.
+
+        An interrupted context takes no more assertions or checks until it is reset, so a
+        cancelled check that was already searching resets the context and asserts again what
+        was asserted at each push level (blocking clauses excepted).
+        """
+        lock = threading.Lock()
+        state = {'cancelled': False, 'started': False}
+        library = None if Yices.is_thread_safe() else yapi.yices_library_lock()
+        def guarded():
+            with lock:
+                # a check cancelled while still queued never starts
+                if state['cancelled']:
+                    return None
+                state['started'] = True
+            if library is None:
+                return check()
+            with library:
+                return check()
+        future = asyncio.get_running_loop().run_in_executor(Context.executor(), guarded)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            with lock:
+                state['cancelled'] = True
+                started = state['started']
+            if not started:
+                raise
+            # the search may start just after a stop_search, and then ignore it, so keep asking
+            while not future.done():
+                self.stop_search()
+                try:
+                    await asyncio.wait([future], timeout=0.01)
+                except asyncio.CancelledError:
+                    pass
+            # the outcome of a cancelled check is of no interest, errors included
+            if not future.cancelled():
+                future.exception()
+            if self.context is not None and self.status() == Status.INTERRUPTED:
+                self._restore()
+            raise
+
+    def _restore(self):
+        """resets the context, and asserts again the formulas that were asserted at each push level."""
+        asserted = self._asserted
+        self.reset_context()
+        for (level, terms) in enumerate(asserted):
+            if level:
+                self.push()
+            if terms:
+                self.assert_formulas(terms)
+
+
     def check_context_with_model_and_hint(self, params, model, python_array_or_tuple, python_array_or_tuple_hints):
         assert self.context is not None
         assert model is not None
@@ -166,22 +300,28 @@ class Context:
 
 
     def get_unsat_core(self):
-        retval = []
-        unsat_core = yapi.term_vector_t()
-        yapi.yices_init_term_vector(unsat_core)
-        errcode = Yices.get_unsat_core(self.context, unsat_core)
-        if errcode == -1:
-            raise YicesException('yices_get_unsat_core')
-
-        for i in range(0, unsat_core.size):
-            retval.append(unsat_core.data[i])
-        return retval
+        """Returns the unsat core, after a call to check_context_with_assumptions, as an array('i') of terms."""
+        unsat_core = VectorPool.acquire_term_vector()
+        try:
+            errcode = Yices.get_unsat_core(self.context, unsat_core)
+            if errcode == -1:
+                raise YicesException('yices_get_unsat_core')
+            return VectorPool.to_array(unsat_core)
+        finally:
+            VectorPool.release_term_vector(unsat_core)
 
 
     def dispose(self):
-        Yices.free_context(self.context)
+        """Frees the context; disposing of it a second time does nothing."""
+        self._finalizer()
         self.context = None
-        Context.__population -= 1
+
+    @staticmethod
+    def _release(context, generation, owner):
+        with Context.__population_lock:
+            Context.__population -= 1
+        # this may run on any thread; Releases leaves the free to the owner
+        Releases.release(owner, Yices.free_context, context, generation)
 
     @staticmethod
     def population():
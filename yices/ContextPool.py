@@ -0,0 +1,161 @@
+"""ContextPool hands out warm contexts, so that a context is not created and freed for every query.
+
+Contexts are pooled by configuration: a Config object, a logic name (for which the pool keeps
+its own Config), or None for the default configuration. A context given back to the pool is
+emptied with reset_context, or, when it was acquired with a setup function, popped back to
+the assertions made by that function, so the next user of the same setup can skip them.
+"""
+import contextlib
+import threading
+import time
+
+from .Config import Config
+from .Context import Context
+from .YicesException import YicesException
+
+
+class ContextPool:
+
+    def __init__(self, max_idle=8, max_total=None):
+        """max_idle bounds the contexts kept waiting for reuse, max_total (if not None) all the contexts of the pool."""
+        self.max_idle = max_idle
+        self.max_total = max_total
+        self._condition = threading.Condition()
+        # key -> list of idle contexts, most recently released last
+        self._idle = {}
+        # id(context) -> key, for the contexts that are out
+        self._busy = {}
+        self._configs = {}
+        self._total = 0
+        self.acquires = 0
+        self.reuses = 0
+        self.creates = 0
+        self.discards = 0
+        self.acquire_seconds = 0.0
+
+    def acquire(self, config=None, setup=None, timeout=None):
+        """returns a context for config (a Config, a logic name, or None), give it back with release.
+
+        If setup is not None, setup(context) is called once, when the context is created, followed by
+        a push; release then pops back to that point. When the pool is at max_total, acquire waits up
+        to timeout seconds (forever if None) for a context to be released, then raises YicesException.
+        """
+        start = time.perf_counter()
+        key = (config, setup)
+        with self._condition:
+            self.acquires += 1
+            while True:
+                idle = self._idle.get(key)
+                if idle:
+                    context = idle.pop()
+                    self.reuses += 1
+                    break
+                if self.max_total is None or self._total < self.max_total or self._evict_idle():
+                    context = None
+                    self._total += 1
+                    self.creates += 1
+                    break
+                if not self._condition.wait(timeout):
+                    self.acquire_seconds += time.perf_counter() - start
+                    raise YicesException(msg=f'ContextPool.acquire: no context became available within {timeout}s\n')
+        if context is None:
+            try:
+                context = self._create(config, setup)
+            except Exception:
+                with self._condition:
+                    self._total -= 1
+                    self._condition.notify()
+                raise
+        with self._condition:
+            self._busy[id(context)] = key
+            self.acquire_seconds += time.perf_counter() - start
+        return context
+
+    def release(self, context):
+        """gives back a context obtained from acquire; it is reset (or popped back to its setup) for reuse."""
+        with self._condition:
+            key = self._busy.pop(id(context))
+        try:
+            if key[1] is None:
+                context.reset_context()
+            else:
+                context.pop()
+                context.push()
+            keep = True
+        except YicesException:
+            keep = False
+        with self._condition:
+            if keep and sum(len(idle) for idle in self._idle.values()) < self.max_idle:
+                self._idle.setdefault(key, []).append(context)
+                context = None
+            else:
+                self._total -= 1
+                self.discards += 1
+            self._condition.notify()
+        if context is not None:
+            context.dispose()
+
+    @contextlib.contextmanager
+    def context(self, config=None, setup=None, timeout=None):
+        """a with statement version of acquire and release."""
+        context = self.acquire(config, setup, timeout)
+        try:
+            yield context
+        finally:
+            self.release(context)
+
+    def stats(self):
+        """returns the pool's counters, along with its reuse rate and mean acquire latency (in seconds)."""
+        with self._condition:
+            return {'acquires': self.acquires,
+                    'reuses': self.reuses,
+                    'creates': self.creates,
+                    'discards': self.discards,
+                    'idle': sum(len(idle) for idle in self._idle.values()),
+                    'busy': len(self._busy),
+                    'reuse_rate': self.reuses / self.acquires if self.acquires else 0.0,
+                    'mean_acquire_latency': self.acquire_seconds / self.acquires if self.acquires else 0.0}
+
+    def dispose(self):
+        """frees the idle contexts and the configs the pool created; contexts that are out are left alone."""
+        with self._condition:
+            idle = [context for contexts in self._idle.values() for context in contexts]
+            self._idle = {}
+            self._total -= len(idle)
+            configs = list(self._configs.values())
+            self._configs = {}
+        for context in idle:
+            context.dispose()
+        for config in configs:
+            config.dispose()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose()
+
+    def _create(self, config, setup):
+        if isinstance(config, str):
+            with self._condition:
+                cfg = self._configs.get(config)
+                if cfg is None:
+                    cfg = Config()
+                    cfg.default_config_for_logic(config)
+                    self._configs[config] = cfg
+            config = cfg
+        context = Context(config)
+        if setup is not None:
+            setup(context)
+            context.push()
+        return context
+
+    def _evict_idle(self):
+        # called with the lock held, frees the least recently released context of any key to make room
+        for idle in self._idle.values():
+            if idle:
+                idle.pop(0).dispose()
+                self._total -= 1
+                self.discards += 1
+                return True
+        return False
@@ -0,0 +1,168 @@
+"""Elementwise applies a term constructor lane by lane across arrays of terms.
+
+Encoders of hardware models build the same operation over wide vectors of terms, such as
+bvadd(a[i], b[i]) for every lane i. Elementwise.bvadd(a, b) does this in one call: the
+arguments are int32 arrays of terms (array('i'), NumPy arrays, or any sequence of terms), or a
+single term that is used in every lane, and the result is an array('i') of the terms built,
+or an int32 NumPy array if any of the arguments is a NumPy array.
+
+The lengths are checked once, the raw ctypes constructor is driven by map, and the results
+are checked for errors once at the end, so the cost per lane is little more than the call
+into libyices itself. While yices_api is instrumented (see Profiler.instrument) or recording,
+each lane is reported as one call of the constructor.
+"""
+from array import array
+from itertools import repeat, takewhile
+from numbers import Integral
+
+import yices_api as yapi
+
+from .YicesException import YicesException
+
+
+_INT32_MAX = (1 << 31) - 1
+
+
+def _lanes(argument):
+    """returns (iterable of python ints, length or None for a single term, is it a NumPy array)."""
+    if isinstance(argument, Integral):
+        return (None, None, False)
+    numpy = yapi.numpy if yapi.hasNumPy() else None
+    is_numpy = numpy is not None and isinstance(argument, numpy.ndarray)
+    if is_numpy:
+        if argument.ndim != 1:
+            raise YicesException(msg=f'Elementwise: term arrays must be one dimensional, not of shape {argument.shape}\n')
+        if argument.dtype != numpy.int32:
+            # a cast would silently wrap an out of range id around to some unrelated term
+            if argument.dtype.kind not in 'iu' or (len(argument) and (argument.min() < 0 or argument.max() > _INT32_MAX)):
+                raise YicesException(msg=f'Elementwise: a {argument.dtype} array does not hold term ids\n')
+            argument = argument.astype(numpy.int32)
+        # iterating the memoryview yields python ints, which ctypes takes without conversion
+        return (memoryview(argument), len(argument), True)
+    if isinstance(argument, array) and argument.typecode == 'i':
+        return (argument, len(argument), False)
+    argument = array('i', argument)
+    return (argument, len(argument), False)
+
+
+def _apply(name, arguments):
+    if not yapi.yices_is_inited():
+        raise YicesException(msg='Elementwise: yices is not inited\n')
+    lanes = [_lanes(argument) for argument in arguments]
+    lengths = {length for (_, length, _) in lanes if length is not None}
+    if len(lengths) > 1:
+        raise YicesException(msg=f'Elementwise.{name}: the arrays have different lengths {sorted(lengths)}\n')
+    if not lengths:
+        raise YicesException(msg=f'Elementwise.{name}: at least one argument must be an array of terms\n')
+    iterables = [repeat(int(argument)) if values is None else values
+                 for (argument, (values, _, _)) in zip(arguments, lanes)]
+    # stop at the first failure, so that the error string is the one of the lane reported
+    results = array('i', takewhile((0).__le__, map(yapi.raw_function(_CONSTRUCTORS[name]), *iterables)))
+    if len(results) < lengths.pop():
+        raise YicesException(msg=f'Elementwise.{name}: lane {len(results)}: {yapi.yices_error_string()}\n')
+    if any(is_numpy for (_, _, is_numpy) in lanes):
+        return yapi.numpy.frombuffer(results, dtype=yapi.numpy.int32)
+    return results
+
+
+def _elementwise(name, arity):
+    def function(*arguments):
+        if len(arguments) != arity:
+            raise TypeError(f'Elementwise.{name} takes {arity} arguments, not {len(arguments)}')
+        return _apply(name, arguments)
+    function.__name__ = name
+    function.__qualname__ = f'Elementwise.{name}'
+    function.__doc__ = f'applies {_CONSTRUCTORS[name]} to each lane of its {arity} arguments.'
+    return staticmethod(function)
+
+
+# the Elementwise name of each constructor, named as in Terms, and its libyices symbol
+_CONSTRUCTORS = {
+    # boolean
+    'ynot': 'yices_not', 'yand': 'yices_and2', 'yor': 'yices_or2', 'xor': 'yices_xor2',
+    'iff': 'yices_iff', 'implies': 'yices_implies', 'eq': 'yices_eq', 'neq': 'yices_neq',
+    'ite': 'yices_ite',
+    # arithmetic
+    'neg': 'yices_neg', 'square': 'yices_square', 'abs': 'yices_abs', 'floor': 'yices_floor', 'ceil': 'yices_ceil',
+    'add': 'yices_add', 'sub': 'yices_sub', 'mul': 'yices_mul', 'division': 'yices_division',
+    'idiv': 'yices_idiv', 'imod': 'yices_imod',
+    'arith_eq_atom': 'yices_arith_eq_atom', 'arith_neq_atom': 'yices_arith_neq_atom',
+    'arith_geq_atom': 'yices_arith_geq_atom', 'arith_leq_atom': 'yices_arith_leq_atom',
+    'arith_gt_atom': 'yices_arith_gt_atom', 'arith_lt_atom': 'yices_arith_lt_atom',
+    # bit-vectors
+    'bvneg': 'yices_bvneg', 'bvnot': 'yices_bvnot', 'bvsquare': 'yices_bvsquare',
+    'redor': 'yices_redor', 'redand': 'yices_redand',
+    'bvadd': 'yices_bvadd', 'bvsub': 'yices_bvsub', 'bvmul': 'yices_bvmul',
+    'bvdiv': 'yices_bvdiv', 'bvrem': 'yices_bvrem', 'bvsdiv': 'yices_bvsdiv', 'bvsrem': 'yices_bvsrem',
+    'bvsmod': 'yices_bvsmod', 'bvand': 'yices_bvand2', 'bvor': 'yices_bvor2', 'bvxor': 'yices_bvxor2',
+    'bvnand': 'yices_bvnand', 'bvnor': 'yices_bvnor', 'bvxnor': 'yices_bvxnor',
+    'bvshl': 'yices_bvshl', 'bvlshr': 'yices_bvlshr', 'bvashr': 'yices_bvashr', 'bvconcat': 'yices_bvconcat2',
+    'bveq_atom': 'yices_bveq_atom', 'bvneq_atom': 'yices_bvneq_atom',
+    'bvge_atom': 'yices_bvge_atom', 'bvgt_atom': 'yices_bvgt_atom', 'bvle_atom': 'yices_bvle_atom', 'bvlt_atom': 'yices_bvlt_atom',
+    'bvsge_atom': 'yices_bvsge_atom', 'bvsgt_atom': 'yices_bvsgt_atom', 'bvsle_atom': 'yices_bvsle_atom', 'bvslt_atom': 'yices_bvslt_atom',
+}
+
+
+class Elementwise:
+
+    ynot = _elementwise('ynot', 1)
+    yand = _elementwise('yand', 2)
+    yor = _elementwise('yor', 2)
+    xor = _elementwise('xor', 2)
+    iff = _elementwise('iff', 2)
+    implies = _elementwise('implies', 2)
+    eq = _elementwise('eq', 2)
+    neq = _elementwise('neq', 2)
+    ite = _elementwise('ite', 3)
+
+    neg = _elementwise('neg', 1)
+    square = _elementwise('square', 1)
+    abs = _elementwise('abs', 1)
+    floor = _elementwise('floor', 1)
+    ceil = _elementwise('ceil', 1)
+    add = _elementwise('add', 2)
+    sub = _elementwise('sub', 2)
+    mul = _elementwise('mul', 2)
+    division = _elementwise('division', 2)
+    idiv = _elementwise('idiv', 2)
+    imod = _elementwise('imod', 2)
+    arith_eq_atom = _elementwise('arith_eq_atom', 2)
+    arith_neq_atom = _elementwise('arith_neq_atom', 2)
+    arith_geq_atom = _elementwise('arith_geq_atom', 2)
+    arith_leq_atom = _elementwise('arith_leq_atom', 2)
+    arith_gt_atom = _elementwise('arith_gt_atom', 2)
+    arith_lt_atom = _elementwise('arith_lt_atom', 2)
+
+    bvneg = _elementwise('bvneg', 1)
+    bvnot = _elementwise('bvnot', 1)
+    bvsquare = _elementwise('bvsquare', 1)
+    redor = _elementwise('redor', 1)
+    redand = _elementwise('redand', 1)
+    bvadd = _elementwise('bvadd', 2)
+    bvsub = _elementwise('bvsub', 2)
+    bvmul = _elementwise('bvmul', 2)
+    bvdiv = _elementwise('bvdiv', 2)
+    bvrem = _elementwise('bvrem', 2)
+    bvsdiv = _elementwise('bvsdiv', 2)
+    bvsrem = _elementwise('bvsrem', 2)
+    bvsmod = _elementwise('bvsmod', 2)
+    bvand = _elementwise('bvand', 2)
+    bvor = _elementwise('bvor', 2)
+    bvxor = _elementwise('bvxor', 2)
+    bvnand = _elementwise('bvnand', 2)
+    bvnor = _elementwise('bvnor', 2)
+    bvxnor = _elementwise('bvxnor', 2)
+    bvshl = _elementwise('bvshl', 2)
+    bvlshr = _elementwise('bvlshr', 2)
+    bvashr = _elementwise('bvashr', 2)
+    bvconcat = _elementwise('bvconcat', 2)
+    bveq_atom = _elementwise('bveq_atom', 2)
+    bvneq_atom = _elementwise('bvneq_atom', 2)
+    bvge_atom = _elementwise('bvge_atom', 2)
+    bvgt_atom = _elementwise('bvgt_atom', 2)
+    bvle_atom = _elementwise('bvle_atom', 2)
+    bvlt_atom = _elementwise('bvlt_atom', 2)
+    bvsge_atom = _elementwise('bvsge_atom', 2)
+    bvsgt_atom = _elementwise('bvsgt_atom', 2)
+    bvsle_atom = _elementwise('bvsle_atom', 2)
+    bvslt_atom = _elementwise('bvslt_atom', 2)
@@ -0,0 +1,92 @@
+"""FunctionValue is the Python representation of a function (or array) value in a Model.
+
+A function value is a finite table of (argument tuple, result) entries plus a default
+result. The table is only expanded, through yices_val_expand_function, the first time
+it is needed, and its entries are decoded with the model's memoized yval decoder, so
+subvalues shared by several functions are decoded once.
+"""
+from collections.abc import Mapping
+
+import yices_api as yapi
+
+from .YicesException import YicesException
+
+
+class FunctionValue(Mapping):
+
+    """A lazily expanded, hashable, read only mapping from argument tuples to values.
+
+    Calling a FunctionValue on an argument tuple applies the function, i.e. returns the
+    default when the tuple is not in the table; indexing it only looks at the table.
+    """
+
+    __slots__ = ('_model', '_node_id', '_node_tag', '_arity', '_table', '_default', '_hash')
+
+    def __init__(self, model, yval, arity):
+        self._model = model
+        self._node_id = yval.node_id
+        self._node_tag = yval.node_tag
+        self._arity = arity
+        self._table = None
+        self._default = None
+        self._hash = None
+
+    def _expand(self):
+        if self._table is not None:
+            return self._table
+        model = self._model
+        if model.model is None:
+            raise YicesException(msg='FunctionValue: the model has been disposed\n')
+        yval = yapi.yval_t(self._node_id, self._node_tag)
+        (default, entries) = model.expand_function_yval(yval)
+        self._default = default
+        self._table = dict(entries)
+        return self._table
+
+    @property
+    def arity(self):
+        """the number of arguments of the function."""
+        return self._arity
+
+    @property
+    def default(self):
+        """the value of the function on the arguments that are not in the table."""
+        self._expand()
+        return self._default
+
+    def __call__(self, args):
+        if not isinstance(args, tuple):
+            args = (args,)
+        return self._expand().get(args, self._default)
+
+    def __getitem__(self, args):
+        return self._expand()[args]
+
+    def __iter__(self):
+        return iter(self._expand())
+
+    def __len__(self):
+        return len(self._expand())
+
+    def __eq__(self, other):
+        if not isinstance(other, FunctionValue):
+            return NotImplemented
+        # values are hash consed within a model, so equal nodes are equal values.
+        if self._model is other._model and self._node_id == other._node_id:
+            return True
+        return self.default == other.default and self._table == other._table
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        if self._hash is None:
+            table = self._expand()
+            self._hash = hash((self._arity, self._default, frozenset(table.items())))
+        return self._hash
+
+    def __repr__(self):
+        if self._table is None:
+            return f'FunctionValue(node={self._node_id}, arity={self._arity}, unexpanded)'
+        return f'FunctionValue({self._table!r}, default={self._default!r})'
@@ -0,0 +1,146 @@
+"""Interning lets Terms and Types serve repeated requests for the same constant or type from a Python side cache.
+
+libyices hash-conses its terms and types, so building the constant 42 twice returns the same
+term both times; interning remembers that answer and skips the call into the library. An
+InternTable is off until enabled, is bounded (least recently used entries are evicted), and
+is emptied when the library is reset or exited, since the ids it holds die with the session,
+and after yices_garbage_collect, which can free unreferenced terms and types and reuse their ids.
+
+A ParseCache does the same for the parsers, whose result also depends on the names in scope:
+it remembers which symbols each cached string mentions, and forgets the strings that mention
+a name when that name is bound, unbound or cleared through Terms or Types.
+"""
+import functools
+import re
+
+import yices_api as yapi
+
+from .LRUCache import LRUCache
+
+
+class InternTable:
+    """The cache behind the functions decorated with interned, and the session it belongs to."""
+
+    def __init__(self):
+        self.cache = None
+        self.generation = None
+
+    def enable(self, maxsize):
+        self.cache = LRUCache(maxsize)
+        self.generation = _epoch()
+
+    def disable(self):
+        self.cache = None
+
+    def stats(self):
+        return self.cache.stats() if self.cache is not None else None
+
+    def current(self):
+        """returns the cache, emptied first if the session has changed, or garbage was collected, since it was filled, or None."""
+        cache = self.cache
+        if cache is not None:
+            generation = _epoch()
+            if generation != self.generation:
+                cache.clear()
+                self.generation = generation
+        return cache
+
+
+def _epoch():
+    """what the ids in a cache depend on: the session, and the garbage collections within it."""
+    return (yapi.yices_generation(), yapi.yices_collections())
+
+
+def interned(table, kind, arity):
+    """Serves calls with exactly arity positional arguments from table, when it is enabled.
+
+    The arguments are the key (with kind), so they must be hashable; calls with other arguments,
+    such as a name for a type, always go to the builder.
+    """
+    def decorator(builder):
+        @functools.wraps(builder)
+        def wrapper(*args, **kwargs):
+            cache = table.current()
+            if cache is None or kwargs or len(args) != arity:
+                return builder(*args, **kwargs)
+            key = (kind,) + args
+            value = cache.lookup(key)
+            if value is LRUCache.MISSING:
+                value = builder(*args)
+                cache.store(key, value)
+            return value
+        return wrapper
+    return decorator
+
+
+_SYMBOL = re.compile(r'[^\s()]+')
+
+
+def _symbols(source):
+    return set(_SYMBOL.findall(source))
+
+
+class ParseCache(InternTable):
+    """The cache of a parser, from source strings to the terms (or types) they parse to."""
+
+    def __init__(self):
+        super().__init__()
+        self.uses = {}
+
+    def enable(self, maxsize):
+        super().enable(maxsize)
+        self.uses = {}
+
+    def disable(self):
+        super().disable()
+        self.uses = {}
+
+    def current(self):
+        if self.cache is not None and self.generation != _epoch():
+            self.uses = {}
+        return super().current()
+
+    def parse(self, source, parser):
+        """returns parser(source), from the cache when possible; errors (-1, or exceptions) are not cached."""
+        cache = self.current()
+        if cache is None:
+            return parser(source)
+        value = cache.lookup(source)
+        if value is LRUCache.MISSING:
+            value = parser(source)
+            if value == -1:
+                return value
+            evicted = cache.store(source, value)
+            uses = self.uses
+            for symbol in _symbols(source):
+                uses.setdefault(symbol, set()).add(source)
+            if evicted is not LRUCache.MISSING:
+                self._unindex(evicted)
+        return value
+
+    def forget(self, name):
+        """drops the cached strings that mention name, whose meaning may just have changed."""
+        cache = self.cache
+        if cache is None or not name:
+            return
+        sources = self.uses.pop(name, None)
+        if sources:
+            for source in sources:
+                cache.discard(source)
+                self._unindex(source)
+
+    def _unindex(self, source):
+        uses = self.uses
+        for symbol in _symbols(source):
+            sources = uses.get(symbol)
+            if sources is not None:
+                sources.discard(source)
+                if not sources:
+                    del uses[symbol]
+
+
+# the parse caches of Terms.parse_term and Types.parse_type; term strings can mention type
+# names, so a change to a type name concerns both.
+term_parses = ParseCache()
+
+type_parses = ParseCache()
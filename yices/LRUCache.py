@@ -0,0 +1,77 @@
+"""LRUCache is a small, size bounded, least recently used cache that counts its hits and misses.
+
+It takes no lock: the OrderedDict operations it makes are each atomic, and another thread
+evicting a key between two of them is tolerated, so it can be shared between threads.
+"""
+from collections import OrderedDict
+
+
+class LRUCache:
+
+    """returned by lookup when the key is not in the cache (None is a legitimate cached value)."""
+    MISSING = object()
+
+    def __init__(self, maxsize):
+        if maxsize <= 0:
+            raise ValueError(f'LRUCache: maxsize must be positive, not {maxsize}')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def lookup(self, key):
+        """returns the value cached under key, or LRUCache.MISSING; a hit makes the key the most recently used."""
+        entries = self._entries
+        value = entries.get(key, LRUCache.MISSING)
+        if value is LRUCache.MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            try:
+                entries.move_to_end(key)
+            except KeyError:
+                # evicted by another thread in the meantime
+                pass
+        return value
+
+    def store(self, key, value):
+        """caches value under key, evicting the least recently used entry if the cache is full.
+
+        Returns the key of the evicted entry, or LRUCache.MISSING if there was none.
+        """
+        entries = self._entries
+        if key in entries:
+            entries[key] = value
+            try:
+                entries.move_to_end(key)
+            except KeyError:
+                # evicted by another thread in the meantime
+                entries[key] = value
+        else:
+            # a new key goes in last, where the most recently used belongs
+            entries[key] = value
+        if len(entries) > self.maxsize:
+            try:
+                return entries.popitem(last=False)[0]
+            except KeyError:
+                # emptied by another thread in the meantime
+                pass
+        return LRUCache.MISSING
+
+    def discard(self, key):
+        """drops the entry for key, if there is one."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """drops all the entries, but not the counters."""
+        self._entries.clear()
+
+    def stats(self):
+        """returns a dict with the hits, misses, size and maxsize of the cache."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
@@ -0,0 +1,176 @@
+"""Linear builds the linear polynomials and constraints of a coefficient matrix, one library call per row.
+
+Encoding A x <= b one coefficient at a time costs a Terms.mul and a Terms.add per nonzero entry.
+Linear instead hands each row to yices_poly_int64 when its coefficients are 64 bit integers,
+to yices_poly_rational64 when they are rationals whose numerators and denominators fit in 64
+bits, and to yices_poly_mpq otherwise (which needs libgmp).
+
+A matrix is either dense, a sequence of rows (a list of lists, or a 2 dimensional NumPy array),
+or sparse in CSR form: anything with indptr, indices and data attributes, such as a
+scipy.sparse.csr_matrix. Coefficients can be ints, Fractions, or floats (taken exactly). A
+dense NumPy array of integers is read without copying its rows.
+"""
+from fractions import Fraction
+from numbers import Integral
+
+import yices_api as yapi
+
+from .Terms import Terms
+from .YicesException import YicesException
+
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+class Linear:
+
+    """the relations accepted by constraints, and the atoms they make of (polynomial - b)."""
+    RELATIONS = {
+        '<=': Terms.arith_leq_atom,
+        '>=': Terms.arith_geq_atom,
+        '=':  Terms.arith_eq_atom,
+        '<':  Terms.arith_lt_atom,
+        '>':  Terms.arith_gt_atom,
+        '!=': Terms.arith_neq_atom,
+    }
+
+    @staticmethod
+    def polynomial(coefficients, terms):
+        """returns the term coefficients[0] * terms[0] + ... + coefficients[n-1] * terms[n-1]."""
+        if len(coefficients) != len(terms):
+            raise YicesException(msg=f'Linear.polynomial: {len(coefficients)} coefficients for {len(terms)} terms\n')
+        return _poly(coefficients, yapi.make_term_array(terms, copy=True))
+
+    @staticmethod
+    def polynomials(matrix, terms):
+        """returns the list of the polynomials row . terms, one for each row of matrix."""
+        return list(_polynomials(matrix, terms))
+
+    @staticmethod
+    def constraints(matrix, terms, bounds, relation='<='):
+        """returns the list of the atoms (row . terms relation bound), one for each row of matrix and bound in bounds."""
+        atom = Linear.RELATIONS.get(relation)
+        if atom is None:
+            raise YicesException(msg=f'Linear.constraints: unknown relation {relation!r}\n')
+        bounds = list(bounds)
+        retval = []
+        for (i, poly) in enumerate(_polynomials(matrix, terms)):
+            if i >= len(bounds):
+                raise YicesException(msg=f'Linear.constraints: more rows than the {len(bounds)} bounds\n')
+            retval.append(atom(poly, _constant(bounds[i])))
+        if len(retval) != len(bounds):
+            raise YicesException(msg=f'Linear.constraints: {len(retval)} rows for {len(bounds)} bounds\n')
+        return retval
+
+    @staticmethod
+    def assert_constraints(context, matrix, terms, bounds, relation='<='):
+        """asserts the constraints of the matrix in context, in one call to assert_formulas; returns the atoms."""
+        atoms = Linear.constraints(matrix, terms, bounds, relation)
+        context.assert_formulas(atoms)
+        return atoms
+
+
+def _polynomials(matrix, terms):
+    ncols = len(terms)
+    if all(hasattr(matrix, attribute) for attribute in ('indptr', 'indices', 'data')):
+        yield from _sparse_polynomials(matrix, terms)
+        return
+    tarray = yapi.make_term_array(terms, copy=True)
+    if yapi.hasNumPy() and isinstance(matrix, yapi.numpy.ndarray) and matrix.ndim == 2 and _is_int64(matrix):
+        if matrix.shape[1] != ncols:
+            raise YicesException(msg=f'Linear: the matrix has {matrix.shape[1]} columns for {ncols} terms\n')
+        matrix = yapi.numpy.ascontiguousarray(matrix, dtype=yapi.numpy.int64)
+        for row in matrix:
+            retval = yapi.yices_poly_int64(ncols, yapi.make_int64_array(row), tarray)
+            if retval == Terms.NULL_TERM:
+                raise YicesException('yices_poly_int64')
+            yield retval
+        return
+    for row in matrix:
+        if len(row) != ncols:
+            raise YicesException(msg=f'Linear: a row has {len(row)} coefficients for {ncols} terms\n')
+        yield _poly(row, tarray)
+
+
+def _sparse_polynomials(matrix, terms):
+    indptr = matrix.indptr
+    indices = matrix.indices
+    data = matrix.data
+    if yapi.hasNumPy():
+        np = yapi.numpy
+        tvector = np.asarray(terms, dtype=np.int32)
+        integral = _is_int64(data)
+        if integral:
+            data = np.ascontiguousarray(data, dtype=np.int64)
+        for i in range(len(indptr) - 1):
+            (start, end) = (indptr[i], indptr[i + 1])
+            tarray = yapi.make_term_array(tvector[indices[start:end]])
+            if integral:
+                retval = yapi.yices_poly_int64(end - start, yapi.make_int64_array(data[start:end]), tarray)
+                if retval == Terms.NULL_TERM:
+                    raise YicesException('yices_poly_int64')
+                yield retval
+            else:
+                yield _poly(data[start:end], tarray)
+        return
+    for i in range(len(indptr) - 1):
+        (start, end) = (indptr[i], indptr[i + 1])
+        yield _poly(data[start:end], yapi.make_term_array([terms[j] for j in indices[start:end]]))
+
+
+def _is_int64(array):
+    """is array a NumPy array whose elements all fit in an int64?"""
+    if not yapi.hasNumPy() or not isinstance(array, yapi.numpy.ndarray):
+        return False
+    kind = array.dtype.kind
+    return kind in 'ib' or (kind == 'u' and array.dtype.itemsize < 8)
+
+
+def _poly(coefficients, tarray):
+    """the polynomial of one row, with the narrowest constructor its coefficients fit."""
+    n = len(coefficients)
+    values = [_rational(c) for c in coefficients]
+    if all(isinstance(v, Integral) and _INT64_MIN <= v <= _INT64_MAX for v in values):
+        retval = yapi.yices_poly_int64(n, yapi.make_int64_array(values), tarray)
+        if retval == Terms.NULL_TERM:
+            raise YicesException('yices_poly_int64')
+        return retval
+    fractions = [Fraction(v) for v in values]
+    if all(_INT64_MIN <= f.numerator <= _INT64_MAX and f.denominator <= _INT64_MAX for f in fractions):
+        retval = yapi.yices_poly_rational64(n, yapi.make_int64_array([f.numerator for f in fractions]),
+                                            yapi.make_int64_array([f.denominator for f in fractions]), tarray)
+        if retval == Terms.NULL_TERM:
+            raise YicesException('yices_poly_rational64')
+        return retval
+    if not yapi.hasGMP():
+        raise YicesException(msg='Linear: coefficients beyond 64 bits need libgmp\n')
+    qarray = yapi.make_mpq_array(fractions)
+    try:
+        retval = yapi.yices_poly_mpq(n, qarray, tarray)
+    finally:
+        yapi.clear_mpq_array(qarray)
+    if retval == Terms.NULL_TERM:
+        raise YicesException('yices_poly_mpq')
+    return retval
+
+
+def _rational(value):
+    """value as an int or a Fraction; floats (and NumPy scalars) are converted exactly."""
+    if isinstance(value, (int, Fraction)):
+        return value
+    if isinstance(value, Integral):
+        return int(value)
+    return Fraction(value)
+
+
+def _constant(value):
+    value = _rational(value)
+    if isinstance(value, int) or value.denominator == 1:
+        value = int(value)
+        if _INT64_MIN <= value <= _INT64_MAX:
+            return Terms.integer(value)
+        return Terms.parse_rational(str(value))
+    if _INT64_MIN <= value.numerator <= _INT64_MAX and value.denominator <= _INT64_MAX:
+        return Terms.rational(value.numerator, value.denominator)
+    return Terms.parse_rational(f'{value.numerator}/{value.denominator}')
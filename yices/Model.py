@@ -9,31 +9,80 @@ to explore this DAG and get the values of tuples or functions.
 """
 
 import ctypes
+import functools
+import threading
+import weakref
 
+from array import array
 from fractions import Fraction
 
 import yices_api as yapi
 
 from .Yvals import Yval
+from .FunctionValue import FunctionValue
+from .LRUCache import LRUCache
+from .VectorPool import VectorPool
+from .Allocations import Allocations
+from .Releases import Releases
 from .YicesException import YicesException
 from .Yices import Yices
 
+
+def cached_value(kind):
+    """Serves a per term getter from the model's value cache, when it has one (see Model.enable_value_cache)."""
+    def decorator(getter):
+        @functools.wraps(getter)
+        def wrapper(self, term, *args, **kwargs):
+            cache = self._value_cache
+            if cache is None:
+                return getter(self, term, *args, **kwargs)
+            key = (kind, term, args, tuple(sorted(kwargs.items()))) if args or kwargs else (kind, term)
+            value = cache.lookup(key)
+            if value is LRUCache.MISSING:
+                value = getter(self, term, *args, **kwargs)
+                cache.store(key, value)
+            return value
+        return wrapper
+    return decorator
+
+
 class Model:
 
     GEN_DEFAULT    = yapi.YICES_GEN_DEFAULT
     GEN_BY_SUBST   = yapi.YICES_GEN_BY_SUBST
     GEN_BY_PROJ    = yapi.YICES_GEN_BY_PROJ
 
+    INT64_MIN      = -(1 << 63)
+    INT64_MAX      = (1 << 63) - 1
+    UINT64_MAX     = (1 << 64) - 1
 
     __population = 0
+    # finalizers change the population from any thread
+    __population_lock = threading.RLock()
 
 
     def __init__(self, model=None):
+        Releases.drain()
         if model is not None:
             self.model =  model
         else:
             self.model = Yices.new_model()
-        Model.__population += 1
+        # decoded values, by yval node_id; the value table of a model only ever grows, so entries stay valid
+        self._yval_memo = {}
+        # (kind, term) -> value, only when enabled by enable_value_cache
+        self._value_cache = None
+        with Model.__population_lock:
+            Model.__population += 1
+        # frees the model when this object is collected, unless dispose got there first
+        self._finalizer = weakref.finalize(self, Model._release, self.model, yapi.yices_generation(), threading.get_ident())
+        self._finalizer.atexit = False
+        Allocations.born('Model', self._finalizer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose()
 
 
     @staticmethod
@@ -57,24 +106,51 @@ class Model:
 
 
     def collect_defined_terms(self):
-        defined_terms = yapi.term_vector_t()
-        yapi.yices_init_term_vector(defined_terms)
-        #yapi.yices_model_collect_defined_terms(self.model, defined_terms)
-        Yices.model_collect_defined_terms(self.model, defined_terms)
-        retval = []
-        for i in range(0, defined_terms.size):
-            retval.append(defined_terms.data[i])
-        yapi.yices_delete_term_vector(defined_terms)
-        return retval
+        """Returns the uninterpreted terms that have a value in the model as an array('i')."""
+        defined_terms = VectorPool.acquire_term_vector()
+        try:
+            #yapi.yices_model_collect_defined_terms(self.model, defined_terms)
+            Yices.model_collect_defined_terms(self.model, defined_terms)
+            return VectorPool.to_array(defined_terms)
+        finally:
+            VectorPool.release_term_vector(defined_terms)
 
     def dispose(self):
-        assert self.model is not None
-        #yapi.yices_free_model(self.model)
-        Yices.free_model(self.model)
+        """Frees the model; disposing of it a second time does nothing."""
+        self._finalizer()
         self.model = None
-        Model.__population -= 1
+        self._yval_memo = {}
+        self._value_cache = None
+
+    @staticmethod
+    def _release(model, generation, owner):
+        with Model.__population_lock:
+            Model.__population -= 1
+        # this may run on any thread; Releases leaves the free to the owner
+        Releases.release(owner, Yices.free_model, model, generation)
+
 
+    def enable_value_cache(self, maxsize=4096):
+        """Caches the results of the per term getters, at most maxsize of them, least recently used first out.
 
+        The cache is cleared whenever the model is modified by one of the set_* methods.
+        """
+        self._value_cache = LRUCache(maxsize)
+
+    def disable_value_cache(self):
+        """Drops the value cache, if there is one."""
+        self._value_cache = None
+
+    def value_cache_stats(self):
+        """Returns the hits, misses, size and maxsize of the value cache as a dict, or None if there is no cache."""
+        return self._value_cache.stats() if self._value_cache is not None else None
+
+    def _invalidate_values(self):
+        if self._value_cache is not None:
+            self._value_cache.clear()
+
+
+    @cached_value('bool')
     def get_bool_value(self, term):
         ytval = ctypes.c_int32()
         errcode = yapi.yices_get_bool_value(self.model, term, ytval)
@@ -83,6 +159,7 @@ class Model:
         return bool(ytval.value)
 
 
+    @cached_value('integer')
     def get_integer_value(self, term):
         ytval = ctypes.c_int64()
         errcode = yapi.yices_get_int64_value(self.model, term, ytval)
@@ -90,6 +167,7 @@ class Model:
             raise YicesException('yices_get_int64_value')
         return ytval.value
 
+    @cached_value('fraction')
     def get_fraction_value(self, term):
         ytnum = ctypes.c_int64()
         ytden = ctypes.c_uint64()
@@ -99,6 +177,7 @@ class Model:
         return Fraction(ytnum.value, ytden.value)
 
 
+    @cached_value('float')
     def get_float_value(self, term):
         ytval = ctypes.c_double()
         errcode = yapi.yices_get_double_value(self.model, term, ytval)
@@ -106,6 +185,25 @@ class Model:
             raise YicesException('yices_get_double_value')
         return ytval.value
 
+    @cached_value('bv')
+    def get_bv_value(self, term, signed=False):
+        """Returns the value of the bitvector term as an int, read as two's complement if signed is True."""
+        bitsize = yapi.yices_term_bitsize(term)
+        if bitsize == 0:
+            raise YicesException('yices_term_bitsize')
+        bvarray = yapi.make_empty_int32_array(bitsize)
+        errcode = yapi.yices_get_bv_value(self.model, term, bvarray)
+        if errcode == -1:
+            raise YicesException('yices_get_bv_value')
+        return Model._to_integer(yapi.bv_array_to_int(bvarray, bitsize), bitsize, signed)
+
+    @staticmethod
+    def _to_integer(value, bitsize, signed):
+        if signed and value >> (bitsize - 1):
+            return value - (1 << bitsize)
+        return value
+
+    @cached_value('scalar')
     def get_scalar_value(self, term):
         """ Returns the index of the value. This is the low level version, and does not use yapi.yices_constant. """
         ytval = ctypes.c_int32()
@@ -117,6 +215,7 @@ class Model:
 
     def set_bool(self, term, val):
         """set the value of a boolean term."""
+        self._invalidate_values()
         yval = ctypes.c_int32()
         yval.value = 1 if val else 0
         errcode = yapi.yices_model_set_bool(self.model, term, val)
@@ -125,6 +224,7 @@ class Model:
 
     def set_integer(self, term, val):
         """set the value of an integer term."""
+        self._invalidate_values()
         yval = ctypes.c_int64()
         yval.value = val
         errcode = yapi.yices_model_set_int64(self.model, term, val)
@@ -133,6 +233,7 @@ class Model:
 
     def set_fraction(self, term, fraction):
         """set the value of an real term."""
+        self._invalidate_values()
         ytnum = ctypes.c_int64()
         ytnum.value = fraction.numerator
         ytden = ctypes.c_uint64()
@@ -142,20 +243,35 @@ class Model:
             raise YicesException('yices_model_set_rational64')
 
     def set_bv(self, term, integer):
-        """set the value of an bv term."""
-        ytnum = ctypes.c_int64()
-        ytnum.value = integer
-        errcode = yapi.yices_model_set_bv_int64(self.model, term, ytnum)
-        if errcode == -1:
-            raise YicesException('yices_model_set_bv_int64')
+        """set the value of an bv term, integer may be any python int, it is truncated to the width of the term."""
+        self._invalidate_values()
+        if Model.INT64_MIN <= integer <= Model.INT64_MAX:
+            ytnum = ctypes.c_int64()
+            ytnum.value = integer
+            errcode = yapi.yices_model_set_bv_int64(self.model, term, ytnum)
+            if errcode == -1:
+                raise YicesException('yices_model_set_bv_int64')
+        elif 0 <= integer <= Model.UINT64_MAX:
+            errcode = yapi.yices_model_set_bv_uint64(self.model, term, ctypes.c_uint64(integer))
+            if errcode == -1:
+                raise YicesException('yices_model_set_bv_uint64')
+        else:
+            bitsize = yapi.yices_term_bitsize(term)
+            if bitsize == 0:
+                raise YicesException('yices_term_bitsize')
+            errcode = yapi.yices_model_set_bv_from_array(self.model, term, bitsize, yapi.int_to_bv_array(integer, bitsize))
+            if errcode == -1:
+                raise YicesException('yices_model_set_bv_from_array')
 
     def set_bv_from_array(self, term, int_array):
         """set the value of an bv term from an array of integers."""
+        self._invalidate_values()
         iarray = yapi.make_int32_array(int_array)
         errcode = yapi.yices_model_set_bv_from_array(self.model, term, len(int_array), iarray)
         if errcode == -1:
             raise YicesException('yices_model_set_bv_from_array')
 
+    @cached_value('true')
     def formula_true_in_model(self, term):
         return yapi.yices_formula_true_in_model(self.model, term) == 1
         #return Yices.formula_true_in_model(self.model, term) == 1
@@ -201,6 +317,22 @@ class Model:
         return yapi.yices_constant(typev.value, value.value)
 
     def get_value_from_bv_yval(self, yval):
+        """Returns the bits of the bitvector value, least significant first, as a tuple.
+
+        A tuple rather than a list, since decoded values are shared (see get_value_from_yval),
+        and so that function values with bitvector arguments or results can be hashed.
+        """
+        bvsize = yapi.yices_val_bitsize(self.model, yval)
+        if bvsize <= 0:
+            return None
+        bvarray = yapi.make_empty_int32_array(bvsize)
+        errcode = yapi.yices_val_get_bv(self.model, yval, bvarray)
+        if errcode == -1:
+            raise YicesException('yices_val_get_bv')
+        return tuple(bvarray)
+
+    def get_int_value_from_bv_yval(self, yval, signed=False):
+        """Returns the bitvector value of the node descriptor as an int, rather than a list of bits."""
         bvsize = yapi.yices_val_bitsize(self.model, yval)
         if bvsize <= 0:
             return None
@@ -208,7 +340,7 @@ class Model:
         errcode = yapi.yices_val_get_bv(self.model, yval, bvarray)
         if errcode == -1:
             raise YicesException('yices_val_get_bv')
-        return [ bvarray[i] for i in range(0, bvsize) ]
+        return Model._to_integer(yapi.bv_array_to_int(bvarray, bvsize), bvsize, signed)
 
     #this problem is part of the gmp libpoly conundrum
     def get_value_from_algebraic_yval(self, yval):
@@ -243,51 +375,58 @@ class Model:
         return (tuple(src), tgt)
 
     def get_value_from_function_yval(self, yval):
+        """Returns the function value as a FunctionValue, whose table is only expanded when first used."""
         function_size = yapi.yices_val_function_arity(self.model, yval)
         if function_size <= 0:
             return None
+        return FunctionValue(self, yval, function_size)
+
+    def expand_function_yval(self, yval):
+        """Returns the default value and the list of (argument tuple, value) entries of a function yval."""
         ydefault = yapi.yval_t()
-        ymapping = yapi.yval_vector_t()
-        yapi.yices_init_yval_vector(ymapping)
-        errcode = yapi.yices_val_expand_function(self.model, yval, ydefault, ymapping)
-        if errcode == -1:
-            yapi.yices_delete_yval_vector(ymapping)
-            raise YicesException('yices_val_expand_function')
-        default = self.get_value_from_yval(ydefault)
-        mapping = [ self.get_value_from_yval(ymapping.data[i]) for i in range(0, ymapping.size) ]
-        dict_map = {}
-        for (src, tgt) in mapping:
-            dict_map[src] = tgt
-        yapi.yices_delete_yval_vector(ymapping)
-        def retfun(src):
-            if src in dict_map:
-                return dict_map[src]
-            return default
-        return retfun
+        ymapping = VectorPool.acquire_yval_vector()
+        try:
+            errcode = yapi.yices_val_expand_function(self.model, yval, ydefault, ymapping)
+            if errcode == -1:
+                raise YicesException('yices_val_expand_function')
+            default = self.get_value_from_yval(ydefault)
+            mapping = [ self.get_value_from_yval(ymapping.data[i]) for i in range(0, ymapping.size) ]
+        finally:
+            VectorPool.release_yval_vector(ymapping)
+        return (default, mapping)
 
 
     def get_value_from_yval(self, yval):
+        """Decodes the value DAG rooted at yval; each node is decoded once per model and then remembered."""
+        node_id = yval.node_id
+        memo = self._yval_memo
+        if node_id in memo:
+            return memo[node_id]
         tag = yval.node_tag
         if tag == Yval.BOOL:
-            return self.get_value_from_bool_yval(yval)
-        if tag == Yval.RATIONAL:
-            return self.get_value_from_rational_yval(yval)
-        if tag == Yval.SCALAR:
-            return self.get_value_from_scalar_yval(yval)
-        if tag == Yval.BV:
-            return self.get_value_from_bv_yval(yval)
-        if tag == Yval.ALGEBRAIC:
-            return self.get_value_from_algebraic_yval(yval)
-        if tag == Yval.TUPLE:
-            return self.get_value_from_tuple_yval(yval)
-        if tag == Yval.MAPPING:
-            return self.get_value_from_mapping_yval(yval)
-        if tag == Yval.FUNCTION:
-            return self.get_value_from_function_yval(yval)
-        raise YicesException(msg='Model.get_value_from_yval: unexpected yval tag {0}\n'.format(tag))
+            retval = self.get_value_from_bool_yval(yval)
+        elif tag == Yval.RATIONAL:
+            retval = self.get_value_from_rational_yval(yval)
+        elif tag == Yval.SCALAR:
+            retval = self.get_value_from_scalar_yval(yval)
+        elif tag == Yval.BV:
+            retval = self.get_value_from_bv_yval(yval)
+        elif tag == Yval.ALGEBRAIC:
+            retval = self.get_value_from_algebraic_yval(yval)
+        elif tag == Yval.TUPLE:
+            retval = self.get_value_from_tuple_yval(yval)
+        elif tag == Yval.MAPPING:
+            retval = self.get_value_from_mapping_yval(yval)
+        elif tag == Yval.FUNCTION:
+            retval = self.get_value_from_function_yval(yval)
+        else:
+            raise YicesException(msg='Model.get_value_from_yval: unexpected yval tag {0}\n'.format(tag))
+        memo[node_id] = retval
+        return retval
 
 
 
+    @cached_value('value')
     def get_value(self, term):
         yval = yapi.yval_t()
         errcode = yapi.yices_get_value(self.model, term, yval)
@@ -296,110 +435,207 @@ class Model:
         return self.get_value_from_yval(yval)
 
 
+    # bulk value extraction
+    #
+    # These evaluate all the terms in one yices_term_array_value call, which returns
+    # each value as a constant term. Constants are hash consed, so each distinct value
+    # is decoded just once however many terms share it.
+
+    def get_values_as_terms(self, terms):
+        """Returns the values of the terms, as constant terms, in an array('i')."""
+        n = len(terms)
+        values = array('i', [0]) * n
+        errcode = yapi.yices_term_array_value(self.model, n, yapi.make_term_array(terms), yapi.make_term_array(values))
+        if errcode == -1:
+            raise YicesException('yices_term_array_value')
+        return values
+
+    def get_bool_values(self, terms, as_numpy=False):
+        """Returns the values of the boolean terms as a list of bools, or a NumPy bool array if as_numpy is True."""
+        values = self.get_values_as_terms(terms)
+        true = yapi.yices_true()
+        if as_numpy and Model._numpy():
+            return yapi.numpy.frombuffer(values, dtype=yapi.numpy.int32) == true
+        return [value == true for value in values]
+
+    def get_integer_values(self, terms, as_numpy=False):
+        """Returns the values of the integer terms as a list of ints, or a NumPy int64 array if as_numpy is True."""
+        return self._decode_values(terms, self._decode_integer, 'int64' if as_numpy else None)
+
+    def get_fraction_values(self, terms):
+        """Returns the values of the arithmetic terms as a list of Fractions."""
+        return self._decode_values(terms, self._decode_fraction, None)
+
+    def get_float_values(self, terms, as_numpy=False):
+        """Returns the values of the arithmetic terms as a list of floats, or a NumPy float64 array if as_numpy is True."""
+        return self._decode_values(terms, self._decode_float, 'float64' if as_numpy else None)
+
+    def get_bv_values(self, terms, as_numpy=False):
+        """Returns the values of the bitvector terms as a list of unsigned ints.
+
+        If as_numpy is True the values are returned in a NumPy uint64 array, which
+        requires that all the bitvectors are 64 bits or fewer.
+        """
+        values = self.get_values_as_terms(terms)
+        if as_numpy and Model._numpy():
+            if any(yapi.yices_term_bitsize(value) > 64 for value in set(values)):
+                raise YicesException(msg='Model.get_bv_values: bitvectors wider than 64 bits do not fit in a uint64 array')
+        return Model._lookup(values, self._decode_bv, 'uint64' if as_numpy else None)
+
+    def get_values(self, terms):
+        """Returns the values of the terms as a list, each value decoded as get_value would, except that
+        bitvectors are returned as unsigned ints, and non integral arithmetic values as Fractions.
+        """
+        values = self.get_values_as_terms(terms)
+        return Model._lookup(values, self._decode_constant, None)
+
+    def _decode_values(self, terms, decode, dtype):
+        return Model._lookup(self.get_values_as_terms(terms), decode, dtype)
+
+    @staticmethod
+    def _lookup(values, decode, dtype):
+        decoded = {value: decode(value) for value in set(values)}
+        retval = [decoded[value] for value in values]
+        if dtype is not None and Model._numpy():
+            return yapi.numpy.array(retval, dtype=dtype)
+        return retval
+
+    @staticmethod
+    def _numpy():
+        if not yapi.hasNumPy():
+            raise YicesException(msg='NumPy arrays were requested, but NumPy could not be imported')
+        return True
+
+    def _decode_integer(self, value):
+        ytval = ctypes.c_int64()
+        if yapi.yices_get_int64_value(self.model, value, ytval) == 0:
+            return ytval.value
+        return int(Model._constant_string(value))
+
+    def _decode_fraction(self, value):
+        ytnum = ctypes.c_int64()
+        ytden = ctypes.c_uint64()
+        if yapi.yices_get_rational64_value(self.model, value, ytnum, ytden) == 0:
+            return Fraction(ytnum.value, ytden.value)
+        return Fraction(Model._constant_string(value))
+
+    def _decode_float(self, value):
+        ytval = ctypes.c_double()
+        errcode = yapi.yices_get_double_value(self.model, value, ytval)
+        if errcode == -1:
+            raise YicesException('yices_get_double_value')
+        return ytval.value
+
+    @staticmethod
+    def _decode_bv(value):
+        bitsize = yapi.yices_term_bitsize(value)
+        bvarray = yapi.make_empty_int32_array(bitsize)
+        errcode = yapi.yices_bv_const_value(value, bvarray)
+        if errcode == -1:
+            raise YicesException('yices_bv_const_value')
+        return yapi.bv_array_to_int(bvarray, bitsize)
+
+    def _decode_constant(self, value):
+        if yapi.yices_term_is_bool(value):
+            return value == yapi.yices_true()
+        if yapi.yices_term_is_arithmetic(value):
+            fraction = self._decode_fraction(value)
+            return fraction.numerator if fraction.denominator == 1 else fraction
+        if yapi.yices_term_is_bitvector(value):
+            return Model._decode_bv(value)
+        if yapi.yices_term_is_scalar(value):
+            return value
+        return self.get_value(value)
+
+    @staticmethod
+    def _constant_string(value):
+        """the printed form of a constant term, used for arithmetic values too big for the 64 bit getters."""
+        return yapi.yices_term_to_string(value, yapi.MAX_INT32_SIZE, 1, 0)
+
+
     #yices tuples should be returned as python tuples
 
     #yices functions should be returned as closures (i.e functions)
 
+    @cached_value('term')
     def get_value_as_term(self, term):
         return yapi.yices_get_value_as_term(self.model, term)
 
     def implicant_for_formula(self, term):
-        termv = yapi.term_vector_t()
-        yapi.yices_init_term_vector(termv)
+        """Returns an implicant, as an array('i') of literals, for the formula that is true in the model."""
+        termv = VectorPool.acquire_term_vector()
         try:
             code = yapi.yices_implicant_for_formula(self.model, term, termv)
-            retval = []
-            if code != -1:
-                for i in range(0, termv.size):
-                    retval.append(termv.data[i])
-            yapi.yices_delete_term_vector(termv)
-            return retval
+            return VectorPool.to_array(termv) if code != -1 else array('i')
         except yapi.YicesAPIException as catastrophy:
-            yapi.yices_delete_term_vector(termv)
             raise YicesException('implicant_for_formula') from catastrophy
+        finally:
+            VectorPool.release_term_vector(termv)
 
 
     def implicant_for_formulas(self, term_array):
+        """Returns an implicant, as an array('i') of literals, for the formulas that are true in the model."""
         tarray = yapi.make_term_array(term_array)
-        termv = yapi.term_vector_t()
-        yapi.yices_init_term_vector(termv)
+        termv = VectorPool.acquire_term_vector()
         try:
             code = yapi.yices_implicant_for_formulas(self.model, len(term_array), tarray, termv)
-            retval = []
-            if code != -1:
-                for i in range(0, termv.size):
-                    retval.append(termv.data[i])
-            yapi.yices_delete_term_vector(termv)
-            return retval
+            return VectorPool.to_array(termv) if code != -1 else array('i')
         except yapi.YicesAPIException as catastrophy:
-            yapi.yices_delete_term_vector(termv)
             raise YicesException('implicant_for_formulas') from catastrophy
+        finally:
+            VectorPool.release_term_vector(termv)
 
     def generalize_model(self, term, elim_array, mode):
+        """Returns the generalization of the model for the formula term, eliminating the variables in elim_array, as an array('i')."""
         var_array = yapi.make_term_array(elim_array)
-        termv = yapi.term_vector_t()
-        yapi.yices_init_term_vector(termv)
-        errcode = yapi.yices_generalize_model(self.model, term, len(elim_array), var_array, mode, termv)
-        if errcode == -1:
-            yapi.yices_delete_term_vector(termv)
-            raise YicesException('yices_generalize_model')
-        retval = []
-        for i in range(0, termv.size):
-            retval.append(termv.data[i])
-        yapi.yices_delete_term_vector(termv)
-        return retval
+        termv = VectorPool.acquire_term_vector()
+        try:
+            errcode = yapi.yices_generalize_model(self.model, term, len(elim_array), var_array, mode, termv)
+            if errcode == -1:
+                raise YicesException('yices_generalize_model')
+            return VectorPool.to_array(termv)
+        finally:
+            VectorPool.release_term_vector(termv)
 
     def generalize_model_array(self, term_array, elim_array, mode):
+        """Returns the generalization of the model for the formulas, eliminating the variables in elim_array, as an array('i')."""
         tarray = yapi.make_term_array(term_array)
         var_array = yapi.make_term_array(elim_array)
-        termv = yapi.term_vector_t()
-        yapi.yices_init_term_vector(termv)
-        errcode = yapi.yices_generalize_model_array(self.model, len(term_array), tarray, len(elim_array), var_array, mode, termv)
-        if errcode == -1:
-            yapi.yices_delete_term_vector(termv)
-            raise YicesException('yices_generalize_model_array')
-        retval = []
-        for i in range(0, termv.size):
-            retval.append(termv.data[i])
-        yapi.yices_delete_term_vector(termv)
-        return retval
+        termv = VectorPool.acquire_term_vector()
+        try:
+            errcode = yapi.yices_generalize_model_array(self.model, len(term_array), tarray, len(elim_array), var_array, mode, termv)
+            if errcode == -1:
+                raise YicesException('yices_generalize_model_array')
+            return VectorPool.to_array(termv)
+        finally:
+            VectorPool.release_term_vector(termv)
 
     # new in 2.6.2
     # term support
     def support_for_term(self, term):
-        """Returns the list of uninterpreted terms that fix the value of the given term in the model."""
-        termv = yapi.term_vector_t()
-        yapi.yices_init_term_vector(termv)
+        """Returns the array('i') of uninterpreted terms that fix the value of the given term in the model."""
+        termv = VectorPool.acquire_term_vector()
         try:
             code = yapi.yices_model_term_support(self.model, term, termv)
-            retval = []
-            if code != -1:
-                for i in range(0, termv.size):
-                    retval.append(termv.data[i])
-            yapi.yices_delete_term_vector(termv)
-            return retval
+            return VectorPool.to_array(termv) if code != -1 else array('i')
         except yapi.YicesAPIException as catastrophy:
-            yapi.yices_delete_term_vector(termv)
             raise YicesException('support_for_term') from catastrophy
+        finally:
+            VectorPool.release_term_vector(termv)
 
     # new in 2.6.2
     # term array support
     def support_for_terms(self, term_array):
-        """Returns the list of uninterpreted terms that fix the value in the model of every term in the given array."""
+        """Returns the array('i') of uninterpreted terms that fix the value in the model of every term in the given array."""
         tarray = yapi.make_term_array(term_array)
-        termv = yapi.term_vector_t()
+        termv = VectorPool.acquire_term_vector()
         try:
-            yapi.yices_init_term_vector(termv)
             code = yapi.yices_model_term_array_support(self.model, len(term_array), tarray, termv)
-            retval = []
-            if code != -1:
-                for i in range(0, termv.size):
-                    retval.append(termv.data[i])
-            yapi.yices_delete_term_vector(termv)
-            return retval
+            return VectorPool.to_array(termv) if code != -1 else array('i')
         except yapi.YicesAPIException as catastrophy:
-            yapi.yices_delete_term_vector(termv)
             raise YicesException('support_for_terms') from catastrophy
+        finally:
+            VectorPool.release_term_vector(termv)
 
 
     # printing
@@ -3,18 +3,36 @@
 A parameter record stores search parameters and options that control the heuristics used by a solver.
 """
 
+import threading
+import weakref
 
 import yices_api as yapi
 
+from .Allocations import Allocations
+from .Releases import Releases
 from .YicesException import YicesException
 
 class Parameters:
 
     __population = 0
+    # finalizers change the population from any thread
+    __population_lock = threading.RLock()
 
     def __init__(self):
+        Releases.drain()
         self.params =  yapi.yices_new_param_record()
-        Parameters.__population += 1
+        with Parameters.__population_lock:
+            Parameters.__population += 1
+        # frees the record when this object is collected, unless dispose got there first
+        self._finalizer = weakref.finalize(self, Parameters._release, self.params, yapi.yices_generation(), threading.get_ident())
+        self._finalizer.atexit = False
+        Allocations.born('Parameters', self._finalizer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose()
 
     def set_param(self, key, value):
         assert self.params is not None
@@ -28,10 +46,16 @@ class Parameters:
         yapi.yices_default_params_for_context(context.context, self.params)
 
     def dispose(self):
-        assert self.params is not None
-        yapi.yices_free_param_record(self.params)
+        """Frees the parameter record; disposing of it a second time does nothing."""
+        self._finalizer()
         self.params = None
-        Parameters.__population -= 1
+
+    @staticmethod
+    def _release(params, generation, owner):
+        with Parameters.__population_lock:
+            Parameters.__population -= 1
+        # this may run on any thread; Releases leaves the free to the owner
+        Releases.release(owner, yapi.yices_free_param_record, params, generation)
 
     @staticmethod
     def population():
@@ -0,0 +1,163 @@
+"""Portfolio races several solver configurations on the same assertions, each in its own process.
+
+There is no single best configuration for hard QF_BV or QF_NRA problems, so Portfolio.solve
+serializes the assertions (see Serializer), hands them to one worker process per strategy,
+returns the first definitive answer (SAT or UNSAT), and terminates the other workers.
+
+A strategy is a dict with the optional entries:
+
+    'logic'   the logic passed to Config.default_config_for_logic
+    'config'  a dict of Config.set_config settings
+    'params'  a dict of Parameters.set_param settings
+
+Workers are started with the 'spawn' method, so the main module of a program that uses
+Portfolio must be guarded by if __name__ == '__main__'.
+"""
+import multiprocessing
+import queue
+import time
+
+from .Config import Config
+from .Constructors import Constructor
+from .Context import Context
+from .Model import Model
+from .Parameters import Parameters
+from .Serializer import Serializer
+from .Status import Status
+from .Terms import Terms
+from .Types import Types
+from .Yices import Yices
+from .YicesException import YicesException
+
+
+class Portfolio:
+
+    """how often, in seconds, solve checks that its workers are still alive while it waits for an answer."""
+    POLL = 0.1
+
+    @staticmethod
+    def default_strategies(logic=None):
+        """returns a few strategies that tend to behave differently: plain, other branching, randomized, and mcsat."""
+        strategies = [{},
+                      {'params': {'branching': 'negative'}},
+                      {'params': {'random-seed': '7', 'randomness': '0.1'}}]
+        if Yices.has_mcsat():
+            strategies.append({'config': {'solver-type': 'mcsat'}})
+        if logic is not None:
+            for strategy in strategies:
+                strategy['logic'] = logic
+        return strategies
+
+    @staticmethod
+    def solve(formulas, strategies=None, timeout=None):
+        """returns (status, model, winner) for the first strategy to find the formulas SAT or UNSAT.
+
+        model is a Model of the uninterpreted terms of atomic type (Booleans, numbers, bit-vectors and
+        scalars) if the status is SAT, and None otherwise; winner is the index of the winning strategy.
+        If no strategy is definitive within timeout seconds, or at all, the status is Status.UNKNOWN
+        and winner is None. If every strategy fails, the first error is raised as a YicesException.
+        """
+        if strategies is None:
+            strategies = Portfolio.default_strategies()
+        (blob, node_terms) = Serializer.dump_nodes(formulas)
+        spawn = multiprocessing.get_context('spawn')
+        answers = spawn.Queue()
+        workers = [spawn.Process(target=_solve, args=(index, strategy, blob, answers), daemon=True)
+                   for (index, strategy) in enumerate(strategies)]
+        for worker in workers:
+            worker.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        errors = []
+        try:
+            pending = len(workers)
+            while pending:
+                wait = Portfolio.POLL
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        break
+                try:
+                    (index, status, answer) = answers.get(timeout=wait)
+                except queue.Empty:
+                    # a worker that crashed will never answer
+                    if not any(worker.is_alive() for worker in workers) and answers.empty():
+                        break
+                    continue
+                pending -= 1
+                if status == Status.SAT:
+                    return (status, _rebuild_model(node_terms, answer), index)
+                if status == Status.UNSAT:
+                    return (status, None, index)
+                if status == Status.ERROR:
+                    errors.append(f'strategy {index}: {answer}')
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+            for worker in workers:
+                worker.join()
+            answers.close()
+        if errors and len(errors) == len(workers):
+            raise YicesException(msg=f'Portfolio.solve: every strategy failed, {errors[0]}\n')
+        return (Status.UNKNOWN, None, None)
+
+
+def _atomic(tau):
+    return Types.is_bool(tau) or Types.is_arithmetic(tau) or Types.is_bitvector(tau) or Types.is_scalar(tau)
+
+
+def _solve(index, strategy, blob, answers):
+    """the worker: rebuilds the formulas, checks them, and puts (index, status, answer) on the answers queue."""
+    try:
+        nodes = Serializer.load_nodes(blob)
+        cfg = Config()
+        if strategy.get('logic'):
+            cfg.default_config_for_logic(strategy['logic'])
+        for (key, value) in strategy.get('config', {}).items():
+            cfg.set_config(key, value)
+        ctx = Context(cfg)
+        params = Parameters()
+        params.default_params_for_context(ctx)
+        for (key, value) in strategy.get('params', {}).items():
+            params.set_param(key, value)
+        ctx.assert_formulas([nodes[root] for root in blob[3]])
+        status = ctx.check_context(params)
+        answer = None
+        if status == Status.SAT:
+            answer = _model_values(nodes, blob, Model.from_context(ctx, 1))
+        answers.put((index, status, answer))
+    except Exception as exc:  # pylint: disable=W0703
+        answers.put((index, Status.ERROR, str(exc)))
+
+
+def _model_values(nodes, blob, model):
+    """the values of the atomic uninterpreted terms, as (node indices, value blob, {node index: scalar index})."""
+    leaves = []
+    values = []
+    scalars = {}
+    for (position, entry) in enumerate(blob[2]):
+        if entry[0] != Constructor.UNINTERPRETED_TERM:
+            continue
+        term = nodes[position]
+        tau = Terms.type_of_term(term)
+        if not _atomic(tau):
+            continue
+        if Types.is_scalar(tau):
+            # scalar types are made afresh in every process, so only the index of the value travels
+            scalars[position] = model.get_scalar_value(term)
+        else:
+            value = model.get_value_as_term(term)
+            # irrational (algebraic) values have no term
+            if value != Terms.NULL_TERM:
+                leaves.append(position)
+                values.append(value)
+    return (leaves, Serializer.dump(values), scalars)
+
+
+def _rebuild_model(node_terms, answer):
+    (leaves, value_blob, scalars) = answer
+    mapping = dict(zip([node_terms[leaf] for leaf in leaves], Serializer.load(value_blob)))
+    for (leaf, value) in scalars.items():
+        term = node_terms[leaf]
+        mapping[term] = Terms.constant(Terms.type_of_term(term), value)
+    return Model.from_map(mapping)
@@ -1,72 +1,399 @@
-"""Profiler is for measuring how much time (nanoseconds) spent in the Yices shared library."""
+"""Profiler is for measuring how much time (nanoseconds) spent in the Yices shared library.
 
-import functools
+Every thread records into its own shard, without locking; the shards are merged when the
+profile is read. For each function the profile keeps the number of calls, the total, minimum
+and maximum time, and a histogram of the call times with four buckets per power of two,
+from which the percentiles are estimated (to within about 20%).
+
+A call made within another recorded call, a yices_* call inside a @profile function say, is
+counted in both of their entries, but only once in the total time.
+"""
 
+import collections
+import functools
+import json
+import marshal
+import os
+import threading
 import time
 
+import yices_api as yapi
+
 from .StringBuilder import StringBuilder
 
+
+# module level, rather than a Profiler attribute, so that the disabled path of profile is a single global lookup
+_enabled = True
+
+# the ring buffer of (name, thread ident, start ns, duration ns, C ns) spans, or None when spans are off
+_spans = None
+
+
 def profile(func):
     """Record the runtime of the decorated function"""
+    fname = func.__name__
     @functools.wraps(func)
     def wrapper_timer(*args, **kwargs):
-        if Profiler.is_enabled():
-            start = time.perf_counter_ns()
-            value = func(*args, **kwargs)
+        if not _enabled:
+            return func(*args, **kwargs)
+        local = _local
+        local.depth += 1
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
             stop = time.perf_counter_ns()
-            Profiler.delta(func.__name__, start, stop)
-            return value
-        return func(*args, **kwargs)
+            local.depth -= 1
+            Profiler.delta(fname, start, stop)
     return wrapper_timer
 
 
-class Profiler:
+def _bucket(nanos):
+    """the histogram bucket of a duration: exact below 4ns, then four buckets per power of two."""
+    bits = nanos.bit_length()
+    if bits <= 2:
+        return nanos
+    return ((bits - 2) << 2) + ((nanos >> (bits - 3)) & 3)
+
+
+def _bucket_bounds(index):
+    """the durations [low, high) that fall in bucket index."""
+    if index < 4:
+        return (index, index + 1)
+    (bits, quarter) = ((index >> 2) + 2, index & 3)
+    return ((4 + quarter) << (bits - 3), (5 + quarter) << (bits - 3))
+
+
+class _Item:
+    """What one shard knows about one function."""
+
+    __slots__ = ('count', 'total', 'c_total', 'min', 'max', 'histogram')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.c_total = 0
+        self.min = None
+        self.max = 0
+        self.histogram = {}
+
+    def add(self, nanos):
+        self.count += 1
+        self.total += nanos
+        if self.min is None or nanos < self.min:
+            self.min = nanos
+        if nanos > self.max:
+            self.max = nanos
+        index = _bucket(nanos)
+        histogram = self.histogram
+        histogram[index] = histogram.get(index, 0) + 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.c_total += other.c_total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        for (index, count) in list(other.histogram.items()):
+            self.histogram[index] = self.histogram.get(index, 0) + count
 
-    __enabled = True
+    def percentile(self, q):
+        """estimates the duration below which a fraction q of the calls fall."""
+        if self.count == 0:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.histogram):
+            count = self.histogram[index]
+            if seen + count >= rank:
+                (low, high) = _bucket_bounds(index)
+                estimate = low + (high - low) * (rank - seen) / count
+                return int(min(max(estimate, self.min), self.max))
+            seen += count
+        return self.max
 
-    """maps (yices API) function names to the total accumulated time spent within them."""
-    __line_items = {}
+    def summary(self):
+        return {'count': self.count,
+                'total_ns': self.total,
+                'c_ns': self.c_total,
+                'min_ns': self.min if self.min is not None else 0,
+                'max_ns': self.max,
+                'mean_ns': self.total // self.count if self.count else 0,
+                'p50_ns': self.percentile(0.5),
+                'p90_ns': self.percentile(0.9),
+                'p99_ns': self.percentile(0.99)}
 
-    """keeps track of the total time spent in the shared library."""
-    __total = 0
 
-    __max_len = 0
+class _Shard:
+    """The items recorded by one thread, the time of its calls not made within others, and that thread."""
+
+    __slots__ = ('items', 'outer', 'thread')
+
+    def __init__(self):
+        self.items = {}
+        self.outer = 0
+        self.thread = threading.current_thread()
+
+
+class _Local(threading.local):
+    """Gives each thread its own _Shard, registered with the Profiler on first use, and its @profile depth."""
+
+    def __init__(self):
+        super().__init__()
+        self.depth = 0
+        self.shard = _Shard()
+        Profiler._register(self.shard)  # pylint: disable=W0212
+
+
+class Profiler:
+
+    """guards the list of shards, and the items of the threads that have gone."""
+    __lock = threading.Lock()
+
+    """the shard of every thread that has recorded something, with the thread it belongs to."""
+    __shards = []
+
+    """the merged items of the shards whose threads have exited, and the sum of their outer times."""
+    __retired = {}
+    __retired_outer = 0
 
     @staticmethod
     def set_enabled(value):
-        Profiler.__enabled = bool(value)
+        global _enabled  # pylint: disable=W0603
+        _enabled = bool(value)
 
 
     @staticmethod
     def is_enabled():
-        return Profiler.__enabled
+        return _enabled
 
     @staticmethod
     def get_time(fname):
-        return Profiler.__line_items.get(fname, 0)
+        """returns the total nanoseconds recorded for fname, across all threads."""
+        item = Profiler._merged().get(fname)
+        return item.total if item is not None else 0
 
     @staticmethod
     def delta(fname, start, stop):
-        nanos = stop - start
-        Profiler.__total += nanos
-        if Profiler.__max_len < len(fname):
-            Profiler.__max_len = len(fname)
-        if fname in Profiler.__line_items:
-            Profiler.__line_items[fname] += nanos
-        else:
-            Profiler.__line_items[fname] = nanos
+        """records one call of fname that started and stopped at the given perf_counter_ns times."""
+        local = _local
+        items = local.shard.items
+        item = items.get(fname)
+        if item is None:
+            item = items[fname] = _Item()
+        item.add(stop - start)
+        if local.depth == 0:
+            local.shard.outer += stop - start
+        spans = _spans
+        if spans is not None:
+            spans.append((fname, threading.get_ident(), start, stop - start, 0))
+
+    @staticmethod
+    def record_call(fname, total_ns, c_ns):
+        """records one call of fname that took total_ns, of which c_ns were spent in libyices."""
+        if not _enabled:
+            return
+        local = _local
+        items = local.shard.items
+        item = items.get(fname)
+        if item is None:
+            item = items[fname] = _Item()
+        item.add(total_ns)
+        item.c_total += c_ns
+        if local.depth == 0 and yapi.yices_call_depth() == 0:
+            local.shard.outer += total_ns
+        spans = _spans
+        if spans is not None:
+            # the call has just returned, so it started total_ns ago
+            spans.append((fname, threading.get_ident(), time.perf_counter_ns() - total_ns, total_ns, c_ns))
+
+    @staticmethod
+    def total_time():
+        """returns the total nanoseconds recorded across all threads, counting a call made within another only once."""
+        with Profiler.__lock:
+            Profiler._retire()
+            return Profiler.__retired_outer + sum(shard.outer for shard in Profiler.__shards)
+
+    @staticmethod
+    def instrument(flag=True):
+        """starts (or with False stops) recording every call into libyices made through yices_api."""
+        yapi.yices_set_instrumentation(Profiler.record_call if flag else None)
+
+    @staticmethod
+    def is_instrumenting():
+        return yapi.yices_instrumentation() is not None
+
+    @staticmethod
+    def snapshot():
+        """returns a dict from function names to a dict of their count, total, min, max, mean, p50, p90 and p99 in ns.
+
+        c_ns is the part of the total spent in libyices, as measured by instrument (0 otherwise).
+        """
+        return {fname: item.summary() for (fname, item) in Profiler._merged().items()}
+
+    @staticmethod
+    def enable_spans(capacity=65536):
+        """starts keeping the last capacity calls as spans, for the write_* methods."""
+        global _spans  # pylint: disable=W0603
+        _spans = collections.deque(maxlen=capacity)
+
+    @staticmethod
+    def disable_spans():
+        """stops keeping spans, and drops those kept so far."""
+        global _spans  # pylint: disable=W0603
+        _spans = None
+
+    @staticmethod
+    def spans():
+        """returns the spans kept so far, oldest first, as (name, thread ident, start ns, duration ns, C ns) tuples."""
+        spans = _spans
+        return list(spans) if spans is not None else []
+
+    @staticmethod
+    def write_chrome_trace(path):
+        """writes the spans to path in the Chrome trace event format, one complete event per call."""
+        spans = Profiler.spans()
+        pid = os.getpid()
+        names = _thread_names()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': names.get(tid, f'thread {tid}')}}
+                  for tid in sorted({span[1] for span in spans})]
+        for (name, tid, start, duration, c_ns) in spans:
+            events.append({'name': name, 'cat': 'yices', 'ph': 'X', 'pid': pid, 'tid': tid,
+                           'ts': start / 1e3, 'dur': duration / 1e3, 'args': {'c_us': c_ns / 1e3}})
+        with open(path, 'w') as stream:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ns'}, stream)
+
+    @staticmethod
+    def write_speedscope(path):
+        """writes the spans to path in the speedscope file format, one evented profile per thread."""
+        spans = Profiler.spans()
+        frames = []
+        frame_index = {}
+        by_thread = collections.defaultdict(list)
+        for (name, tid, start, duration, _) in spans:
+            if name not in frame_index:
+                frame_index[name] = len(frames)
+                frames.append({'name': name})
+            by_thread[tid].append((start, start + duration, frame_index[name]))
+        names = _thread_names()
+        profiles = [_speedscope_profile(names.get(tid, f'thread {tid}'), calls) for (tid, calls) in sorted(by_thread.items())]
+        document = {'$schema': 'https://www.speedscope.app/file-format-schema.json',
+                    'shared': {'frames': frames},
+                    'profiles': profiles,
+                    'name': 'yices',
+                    'exporter': 'yices.Profiler'}
+        with open(path, 'w') as stream:
+            json.dump(document, stream)
+
+    @staticmethod
+    def write_pstats(path):
+        """writes the totals (not just the spans) to path as a pstats file, that pstats.Stats(path) reads.
+
+        Each function's own time is the time spent in libyices when that was measured (see
+        instrument), and its cumulative time is the total.
+        """
+        stats = {}
+        for (fname, item) in Profiler._merged().items():
+            own = item.c_total if item.c_total else item.total
+            stats[('yices', 0, fname)] = (item.count, item.count, own / 1e9, item.total / 1e9, {})
+        with open(path, 'wb') as stream:
+            marshal.dump(stats, stream)
+
+    @staticmethod
+    def reset():
+        """forgets everything recorded so far, in every thread, spans included."""
+        spans = _spans
+        if spans is not None:
+            spans.clear()
+        with Profiler.__lock:
+            Profiler.__retired = {}
+            Profiler.__retired_outer = 0
+            for shard in Profiler.__shards:
+                shard.items.clear()
+                shard.outer = 0
 
     @staticmethod
     def dump():
-        def percent(nanos):
-            return (nanos * 100) // Profiler.__total
-        def pad(fname):
-            return ' ' * (Profiler.__max_len - len(fname))
+        items = Profiler._merged()
+        total = Profiler.total_time()
+        width = max([len('Total:')] + [len(fname) for fname in items])
         sb = StringBuilder()
         sb.append('\nYices API Call Profile:\n')
-        for fname, cost in Profiler.__line_items.items():
-            pc = percent(cost)
-            if pc > 0:
-                sb.append(f'\t{fname}{pad(fname)}\t\t{pc}%\n')
-        sb.append(f'\n\tTotal:{pad("Total:")}\t\t{int(Profiler.__total / 10e6)} milliseconds\n')
+        sb.append(f'\t{"":{width}}\t{"calls":>10}{"ms":>12}{"C ms":>12}{"%":>6}{"mean µs":>12}{"p50 µs":>12}{"p99 µs":>12}\n')
+        for (fname, item) in sorted(items.items(), key=lambda entry: entry[1].total, reverse=True):
+            summary = item.summary()
+            pc = (item.total * 100) // total if total else 0
+            sb.append(f'\t{fname:{width}}\t{item.count:10}{item.total / 1e6:12.3f}{item.c_total / 1e6:12.3f}{pc:5}%'
+                      f'{summary["mean_ns"] / 1e3:12.2f}{summary["p50_ns"] / 1e3:12.2f}{summary["p99_ns"] / 1e3:12.2f}\n')
+        sb.append(f'\n\t{"Total:":{width}}\t\t{int(total / 1e6)} milliseconds\n')
+        if sum(item.total for item in items.values()) > total:
+            sb.append('\n\tCalls made within other calls count towards both, so the percentages add up to more than 100.\n')
         return str(sb)
+
+    @staticmethod
+    def _register(shard):
+        with Profiler.__lock:
+            Profiler._retire()
+            Profiler.__shards.append(shard)
+
+    @staticmethod
+    def _retire():
+        """folds the shards of the threads that are gone into the retired items; the lock must be held."""
+        live = []
+        for shard in Profiler.__shards:
+            if shard.thread.is_alive():
+                live.append(shard)
+            else:
+                _merge_into(Profiler.__retired, shard.items)
+                Profiler.__retired_outer += shard.outer
+        Profiler.__shards = live
+
+    @staticmethod
+    def _merged():
+        """merges the shards into a fresh dict of _Items, retiring the shards of the threads that are gone."""
+        merged = {}
+        with Profiler.__lock:
+            Profiler._retire()
+            _merge_into(merged, Profiler.__retired)
+            for shard in Profiler.__shards:
+                _merge_into(merged, shard.items)
+        return merged
+
+
+def _merge_into(items, other):
+    # another thread may be adding to other as we read it, hence the copy
+    for (fname, item) in list(other.items()):
+        mine = items.get(fname)
+        if mine is None:
+            mine = items[fname] = _Item()
+        mine.merge(item)
+
+
+def _thread_names():
+    return {thread.ident: thread.name for thread in threading.enumerate()}
+
+
+def _speedscope_profile(name, calls):
+    """the evented profile of one thread's calls, given as (start, end, frame); they must nest properly."""
+    calls.sort(key=lambda call: (call[0], -call[1]))
+    events = []
+    stack = []
+    for (start, end, frame) in calls:
+        while stack and stack[-1][0] <= start:
+            (close, closing) = stack.pop()
+            events.append({'type': 'C', 'frame': closing, 'at': close})
+        if stack and end > stack[-1][0]:
+            # the start of an instrumented call is reconstructed, so it can overhang its caller a little
+            end = stack[-1][0]
+        events.append({'type': 'O', 'frame': frame, 'at': start})
+        stack.append((end, frame))
+    while stack:
+        (close, closing) = stack.pop()
+        events.append({'type': 'C', 'frame': closing, 'at': close})
+    return {'type': 'evented', 'name': name, 'unit': 'nanoseconds',
+            'startValue': calls[0][0] if calls else 0, 'endValue': events[-1]['at'] if events else 0,
+            'events': events}
+
+
+_local = _Local()
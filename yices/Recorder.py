@@ -0,0 +1,446 @@
+"""Recorder writes every call made into libyices through yices_api to a compact binary log, for Replay to run again.
+
+A slow query is usually built by thousands of Terms and Context calls, which are hard to
+reproduce away from the program that made them. While the Recorder is on, each call that
+returns is appended to the log with its arguments and its result: ints (term and type ids
+among them), strings, ctypes arrays (by value), and the out parameters (c_int32, yval_t,
+term_vector_t, ...) that the call filled in. The calls made through yices_api.raw_function,
+such as the lanes of Elementwise, are recorded one by one. Contexts, models, configs and parameter records
+are pointers, which mean nothing in another process; they are written as handles, numbered
+in the order the calls that made them returned, and Replay maps them to the pointers its own
+calls return.
+
+Term and type ids are written as they are: yices numbers its terms deterministically, so a
+replay that starts from the same state (start recording right after Yices.init(), and replay
+in a freshly inited library) makes the same ids. Replay reports the results that differ.
+
+The log starts with a magic number and the libyices version. Every call is then its function
+name, its positional arguments, its keyword arguments, its result, and the nanoseconds it took
+when recorded. Names (of functions, keywords and ctypes types) are written in full the first
+time and by number afterwards. Integers are varints, signed ones zigzag encoded.
+"""
+import collections
+import ctypes
+import struct
+import threading
+
+import yices_api as yapi
+
+from .YicesException import YicesException
+
+
+_MAGIC = b'YREC\x01'
+
+# value tags
+(_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _BYTES, _LIST, _HANDLE,
+ _ARRAY, _CELL, _STRUCT, _OPAQUE) = range(13)
+
+# how an out parameter was passed: the object itself, pointer(object), or byref(object)
+DIRECT, POINTER, BYREF = range(3)
+
+_CArgObject = type(ctypes.byref(ctypes.c_int()))
+
+_INTEGER_CTYPES = frozenset([ctypes.c_byte, ctypes.c_ubyte, ctypes.c_short, ctypes.c_ushort,
+                             ctypes.c_int, ctypes.c_uint, ctypes.c_long, ctypes.c_ulong,
+                             ctypes.c_longlong, ctypes.c_ulonglong, ctypes.c_int8, ctypes.c_uint8,
+                             ctypes.c_int16, ctypes.c_uint16, ctypes.c_int32, ctypes.c_uint32,
+                             ctypes.c_int64, ctypes.c_uint64, ctypes.c_size_t, ctypes.c_bool])
+
+_FLOAT_CTYPES = frozenset([ctypes.c_float, ctypes.c_double])
+
+_DOUBLE = struct.Struct('<d')
+
+
+"""a pointer made by a recorded call; the number is the order in which the calls that made them returned."""
+Handle = collections.namedtuple('Handle', ['id'])
+
+"""a ctypes scalar passed as an out parameter: its identity in the log, its type, and its value after the call."""
+Cell = collections.namedtuple('Cell', ['how', 'id', 'ctype', 'value'])
+
+"""a ctypes structure passed as an out parameter; fields is None for structures that hold pointers."""
+Struct = collections.namedtuple('Struct', ['how', 'id', 'ctype', 'fields'])
+
+"""a ctypes array of scalars, by value."""
+CArray = collections.namedtuple('CArray', ['ctype', 'values'])
+
+"""an argument that cannot be written down, such as an array of mpq_t or a callback."""
+Opaque = collections.namedtuple('Opaque', ['ctype'])
+
+"""one recorded call, index being its position in the log."""
+Call = collections.namedtuple('Call', ['index', 'name', 'args', 'kwargs', 'result', 'ns'])
+
+
+class Recorder:
+
+    """guards the writer, which the calls of every thread go through."""
+    __lock = threading.Lock()
+
+    __writer = None
+
+    @staticmethod
+    def start(path):
+        """starts recording every call into libyices made through yices_api to the file path, which is overwritten."""
+        with Recorder.__lock:
+            if Recorder.__writer is not None:
+                raise YicesException(msg='Recorder.start: already recording\n')
+            Recorder.__writer = _Writer(open(path, 'wb'))
+        yapi.yices_set_recorder(Recorder._record)
+
+    @staticmethod
+    def stop():
+        """stops recording, and closes the log; returns the number of calls recorded."""
+        yapi.yices_set_recorder(None)
+        with Recorder.__lock:
+            writer = Recorder.__writer
+            Recorder.__writer = None
+        if writer is None:
+            return 0
+        writer.stream.close()
+        return writer.count
+
+    @staticmethod
+    def is_recording():
+        return Recorder.__writer is not None
+
+    @staticmethod
+    def read(path):
+        """yields the calls recorded in the log at path, as Call tuples, in the order they returned."""
+        with open(path, 'rb') as stream:
+            yield from _Reader(stream.read()).calls()
+
+    @staticmethod
+    def library_version(path):
+        """returns the version of libyices that the log at path was recorded with."""
+        with open(path, 'rb') as stream:
+            return _Reader(stream.read()).version
+
+    @staticmethod
+    def _record(name, args, kwargs, result, total_ns):
+        with Recorder.__lock:
+            writer = Recorder.__writer
+            if writer is not None:
+                writer.call(name, args, kwargs, result, total_ns)
+
+
+def _array_kind(element):
+    """how the elements of an array of ctypes type element are written: 'i', 'f', 's', or None if they are not."""
+    if element in _INTEGER_CTYPES:
+        return 'i'
+    if element in _FLOAT_CTYPES:
+        return 'f'
+    if element is ctypes.c_char_p:
+        return 's'
+    return None
+
+
+def _plain_fields(ctype):
+    """the fields of a structure type if they are all integers, which are then written by value, otherwise None."""
+    fields = getattr(ctype, '_fields_', ())
+    if all(field[1] in _INTEGER_CTYPES for field in fields):
+        return [field[0] for field in fields]
+    return None
+
+
+def _ctype(name):
+    """the ctypes type of the given name, as yices_api or ctypes define it."""
+    ctype = getattr(yapi, name, None)
+    if not isinstance(ctype, type):
+        ctype = getattr(ctypes, name, None)
+    if not isinstance(ctype, type):
+        raise YicesException(msg=f'Recorder: unknown ctypes type {name} in the log\n')
+    return ctype
+
+
+class _Writer:
+    """The state of a log being written: the names and pointers numbered so far."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+        self.symbols = {}
+        self.handles = {}
+        self.made = 0
+        self.objects = {}
+        self.restypes = {}
+        out = bytearray(_MAGIC)
+        self.string(out, yapi.yices_version)
+        stream.write(out)
+
+    def call(self, name, args, kwargs, result, total_ns):
+        out = bytearray()
+        self.symbol(out, name)
+        (restype, argtypes) = self.signature(name)
+        self.uint(out, len(args))
+        for (position, arg) in enumerate(args):
+            # an int is a pointer made earlier, unless the C function declares that argument as something else
+            declared = argtypes is not None and position < len(argtypes)
+            pointer = not declared or argtypes[position] is ctypes.c_void_p
+            if declared and pointer and type(arg) is int and arg not in self.handles:
+                # made before the recording started, so a replay has nothing to stand for it
+                out.append(_OPAQUE)
+                self.symbol(out, 'c_void_p')
+            else:
+                self.value(out, arg, pointer)
+        self.uint(out, len(kwargs))
+        for (key, arg) in kwargs.items():
+            self.symbol(out, key)
+            self.value(out, arg, True)
+        if restype is ctypes.c_void_p and isinstance(result, int) and result:
+            # a freed pointer can come back from a later call, as another object
+            handle = self.handles[result] = self.made
+            self.made += 1
+            out.append(_HANDLE)
+            self.uint(out, handle)
+        else:
+            self.value(out, result, False)
+        self.uint(out, total_ns)
+        self.stream.write(out)
+        self.count += 1
+
+    def signature(self, name):
+        """the restype and argtypes of the ctypes function of name."""
+        signature = self.restypes.get(name)
+        if signature is None:
+            try:
+                function = yapi.raw_function(name)
+                signature = (function.restype, function.argtypes)
+            except AttributeError:
+                signature = (None, None)
+            self.restypes[name] = signature
+        return signature
+
+    def value(self, out, value, pointer):
+        if value is None:
+            out.append(_NONE)
+        elif value is True or value is False:
+            out.append(_TRUE if value else _FALSE)
+        elif isinstance(value, int):
+            handle = self.handles.get(value) if pointer else None
+            if handle is not None:
+                out.append(_HANDLE)
+                self.uint(out, handle)
+            else:
+                out.append(_INT)
+                self.sint(out, value)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out.extend(_DOUBLE.pack(value))
+        elif isinstance(value, str):
+            out.append(_STR)
+            self.string(out, value)
+        elif isinstance(value, bytes):
+            out.append(_BYTES)
+            self.uint(out, len(value))
+            out.extend(value)
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST)
+            self.uint(out, len(value))
+            for item in value:
+                self.value(out, item, pointer)
+        elif isinstance(value, ctypes.Array):
+            self.array(out, value)
+        elif isinstance(value, _CArgObject):
+            self.cell(out, BYREF, value._obj)  # pylint: disable=W0212
+        elif isinstance(value, ctypes._Pointer):  # pylint: disable=W0212
+            if value:
+                self.cell(out, POINTER, value.contents)
+            else:
+                out.append(_NONE)
+        elif isinstance(value, (ctypes._SimpleCData, ctypes.Structure)):  # pylint: disable=W0212
+            self.cell(out, DIRECT, value)
+        else:
+            out.append(_OPAQUE)
+            self.symbol(out, type(value).__name__)
+
+    def array(self, out, value):
+        element = value._type_  # pylint: disable=W0212
+        kind = _array_kind(element)
+        if kind is None:
+            out.append(_OPAQUE)
+            self.symbol(out, f'{element.__name__} array')
+            return
+        out.append(_ARRAY)
+        self.symbol(out, element.__name__)
+        self.uint(out, len(value))
+        if kind == 'i':
+            for item in value:
+                self.sint(out, item)
+        elif kind == 'f':
+            for item in value:
+                out.extend(_DOUBLE.pack(item))
+        else:
+            for item in value:
+                self.optional_bytes(out, item)
+
+    def cell(self, out, how, obj):
+        ctype = type(obj)
+        if isinstance(obj, ctypes.Structure):
+            fields = _plain_fields(ctype)
+            if fields is None and ctype.__name__ not in ('term_vector_t', 'type_vector_t', 'yval_vector_t'):
+                # its pointers would need the calls that set them up, which are not libyices calls
+                out.append(_OPAQUE)
+                self.symbol(out, ctype.__name__)
+                return
+            out.append(_STRUCT)
+        elif ctype in _INTEGER_CTYPES or ctype in _FLOAT_CTYPES:
+            fields = None
+            out.append(_CELL)
+        else:
+            out.append(_OPAQUE)
+            self.symbol(out, ctype.__name__)
+            return
+        key = (ctypes.addressof(obj), ctype)
+        identity = self.objects.get(key)
+        if identity is None:
+            identity = self.objects[key] = len(self.objects)
+        self.uint(out, how)
+        self.uint(out, identity)
+        self.symbol(out, ctype.__name__)
+        if isinstance(obj, ctypes.Structure):
+            if fields is None:
+                self.uint(out, 0)
+            else:
+                self.uint(out, len(fields) + 1)
+                for field in fields:
+                    self.sint(out, int(getattr(obj, field)))
+        elif ctype in _FLOAT_CTYPES:
+            out.extend(_DOUBLE.pack(obj.value))
+        else:
+            self.sint(out, int(obj.value))
+
+    def symbol(self, out, name):
+        number = self.symbols.get(name)
+        if number is None:
+            self.symbols[name] = len(self.symbols) + 1
+            self.uint(out, 0)
+            self.string(out, name)
+        else:
+            self.uint(out, number)
+
+    def optional_bytes(self, out, data):
+        if data is None:
+            self.uint(out, 0)
+        else:
+            self.uint(out, len(data) + 1)
+            out.extend(data)
+
+    @staticmethod
+    def string(out, text):
+        data = text.encode()
+        _Writer.uint(out, len(data))
+        out.extend(data)
+
+    @staticmethod
+    def sint(out, n):
+        _Writer.uint(out, (n << 1) if n >= 0 else ((-n << 1) - 1))
+
+    @staticmethod
+    def uint(out, n):
+        while n >= 0x80:
+            out.append((n & 0x7f) | 0x80)
+            n >>= 7
+        out.append(n)
+
+
+class _Reader:
+    """Decodes a log, in one pass."""
+
+    def __init__(self, data):
+        if data[:len(_MAGIC)] != _MAGIC:
+            raise YicesException(msg='Recorder.read: not a yices call log, or an unsupported version\n')
+        self.data = memoryview(data)
+        self.pos = len(_MAGIC)
+        self.symbols = []
+        self.version = self.string()
+
+    def calls(self):
+        index = 0
+        while self.pos < len(self.data):
+            name = self.symbol()
+            args = tuple(self.value() for _ in range(self.uint()))
+            kwargs = {}
+            for _ in range(self.uint()):
+                key = self.symbol()
+                kwargs[key] = self.value()
+            result = self.value()
+            yield Call(index, name, args, kwargs, result, self.uint())
+            index += 1
+
+    def value(self):
+        tag = self.uint()
+        if tag == _NONE:
+            return None
+        if tag in (_FALSE, _TRUE):
+            return tag == _TRUE
+        if tag == _INT:
+            return self.sint()
+        if tag == _FLOAT:
+            return _DOUBLE.unpack(self.raw(_DOUBLE.size))[0]
+        if tag == _STR:
+            return self.string()
+        if tag == _BYTES:
+            return bytes(self.raw(self.uint()))
+        if tag == _LIST:
+            return [self.value() for _ in range(self.uint())]
+        if tag == _HANDLE:
+            return Handle(self.uint())
+        if tag == _ARRAY:
+            name = self.symbol()
+            kind = _array_kind(_ctype(name))
+            size = self.uint()
+            if kind == 'i':
+                values = [self.sint() for _ in range(size)]
+            elif kind == 'f':
+                values = [_DOUBLE.unpack(self.raw(_DOUBLE.size))[0] for _ in range(size)]
+            else:
+                values = [self.optional_bytes() for _ in range(size)]
+            return CArray(name, values)
+        if tag == _CELL:
+            (how, identity, name) = (self.uint(), self.uint(), self.symbol())
+            if _ctype(name) in _FLOAT_CTYPES:
+                return Cell(how, identity, name, _DOUBLE.unpack(self.raw(_DOUBLE.size))[0])
+            return Cell(how, identity, name, self.sint())
+        if tag == _STRUCT:
+            (how, identity, name) = (self.uint(), self.uint(), self.symbol())
+            count = self.uint()
+            fields = tuple(self.sint() for _ in range(count - 1)) if count else None
+            return Struct(how, identity, name, fields)
+        if tag == _OPAQUE:
+            return Opaque(self.symbol())
+        raise YicesException(msg=f'Recorder.read: unknown tag {tag} at byte {self.pos}\n')
+
+    def symbol(self):
+        number = self.uint()
+        if number == 0:
+            self.symbols.append(self.string())
+            return self.symbols[-1]
+        return self.symbols[number - 1]
+
+    def raw(self, size):
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return chunk
+
+    def string(self):
+        return bytes(self.raw(self.uint())).decode()
+
+    def optional_bytes(self):
+        size = self.uint()
+        return None if size == 0 else bytes(self.raw(size - 1))
+
+    def sint(self):
+        n = self.uint()
+        return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+
+    def uint(self):
+        data = self.data
+        byte = data[self.pos]
+        self.pos += 1
+        value = byte & 0x7f
+        shift = 7
+        while byte >= 0x80:
+            byte = data[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7f) << shift
+            shift += 7
+        return value
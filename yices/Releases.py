@@ -0,0 +1,85 @@
+"""Releases frees the libyices objects whose finalizers run on a thread other than the one that made them.
+
+A weakref finalizer runs on whichever thread drops the last reference to its object, or happens
+to run the garbage collector: an executor worker, a Watchdog timer or the Census sampler as
+likely as the thread that made the object. Unless libyices is thread safe, freeing the object
+there could overlap with a call the owning thread is making into libyices, so the free is
+queued instead, and the owning thread makes it the next time it makes or disposes of a Context,
+Config, Model or Parameters, or calls Releases.drain.
+
+A thread that made its objects up front may never do so again, so a free does not wait for its
+owner forever: once it has been queued for Releases.patience seconds, or the queue holds more
+than Releases.capacity frees, whichever thread drains next makes it, as it does the frees queued
+for threads that have since finished. Every finalizer drains, wherever it runs. The frees of an
+earlier generation are dropped, yices_exit and yices_reset having already freed their objects.
+"""
+import collections
+import threading
+import time
+
+import yices_api as yapi
+
+
+class Releases:
+
+    """how many seconds a free waits for its owning thread, and how many may wait, before any thread makes them."""
+    patience = 1.0
+    capacity = 1024
+
+    """the frees waiting for their owning threads, as (owner, free, handle, generation, queued at) tuples."""
+    __pending = collections.deque()
+
+    """whether libyices is thread safe, once known."""
+    __thread_safe = None
+
+    @staticmethod
+    def release(owner, free, handle, generation):
+        """frees handle with free now if called on the owner thread, and otherwise queues the free for the owner."""
+        if threading.get_ident() == owner or Releases._thread_safe():
+            _free(free, handle, generation)
+        else:
+            Releases.__pending.append((owner, free, handle, generation, time.monotonic()))
+        Releases.drain()
+
+    @staticmethod
+    def drain():
+        """makes the queued frees of this thread, those of the threads that have finished, and those overdue."""
+        pending = Releases.__pending
+        if not pending:
+            return
+        ident = threading.get_ident()
+        live = {thread.ident for thread in threading.enumerate()}
+        generation = yapi.yices_generation()
+        deadline = time.monotonic() - Releases.patience
+        excess = len(pending) - Releases.capacity
+        # popleft and append are atomic, so finalizers running meanwhile, here or elsewhere, lose nothing
+        for _ in range(len(pending)):
+            try:
+                entry = pending.popleft()
+            except IndexError:
+                return
+            (owner, free, handle, made, queued) = entry
+            excess -= 1
+            if made != generation:
+                continue
+            # the queue is oldest first, so the excess is made from its front
+            if owner == ident or owner not in live or queued <= deadline or excess >= 0:
+                _free(free, handle, made)
+            else:
+                pending.append(entry)
+
+    @staticmethod
+    def pending():
+        """returns the number of frees still waiting for their owning threads."""
+        return len(Releases.__pending)
+
+    @staticmethod
+    def _thread_safe():
+        if Releases.__thread_safe is None and yapi.yices_is_inited():
+            Releases.__thread_safe = yapi.yices_is_thread_safe() == 1
+        return bool(Releases.__thread_safe)
+
+
+def _free(free, handle, generation):
+    if yapi.yices_is_inited() and yapi.yices_generation() == generation:
+        free(handle)
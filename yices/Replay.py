@@ -0,0 +1,145 @@
+"""Replay runs the calls of a Recorder log against libyices again, and times each of them.
+
+The calls are made through yices_api, in the order they were recorded. A pointer handle in
+the log stands for whatever the replayed call that made it returned, and the out parameters
+of the log are made anew (once per object of the recording, so that a term_vector_t that was
+initialized once and used many times is again). Calls that cannot be replayed, because they
+use a pointer made before the recording started or an argument the log could not describe,
+are skipped, and the results that differ from the recorded ones are reported: the first
+difference is where the replay stopped doing the same work, and replaying only the calls up
+to a limit narrows a slow workload down.
+"""
+import ctypes
+import time
+
+import yices_api as yapi
+
+from .Recorder import Recorder, Handle, Cell, Struct, CArray, Opaque, POINTER, BYREF, _ctype
+from .StringBuilder import StringBuilder
+
+
+class _Unreplayable(Exception):
+    """a call whose arguments cannot be made again."""
+
+
+class Replay:
+
+    def __init__(self, path):
+        self.path = path
+        self.version = Recorder.library_version(path)
+        self.timings = []
+        self.skipped = []
+        self.failed = []
+        self.mismatches = []
+        self._handles = {}
+        self._objects = {}
+
+    def run(self, limit=None):
+        """replays the calls of the log, or only the first limit of them; returns self."""
+        for call in Recorder.read(self.path):
+            if limit is not None and call.index >= limit:
+                break
+            try:
+                args = [self._materialize(arg) for arg in call.args]
+                kwargs = {key: self._materialize(arg) for (key, arg) in call.kwargs.items()}
+            except _Unreplayable as error:
+                self.skipped.append((call.index, call.name, str(error)))
+                continue
+            function = getattr(yapi, call.name)
+            start = time.perf_counter_ns()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as error:  # pylint: disable=W0703
+                self.failed.append((call.index, call.name, repr(error)))
+                continue
+            elapsed = time.perf_counter_ns() - start
+            self.timings.append((call.index, call.name, elapsed, call.ns))
+            if isinstance(call.result, Handle):
+                self._handles[call.result.id] = result
+            elif _comparable(call.result) and result != call.result:
+                self.mismatches.append((call.index, call.name, call.result, result))
+        return self
+
+    def snapshot(self):
+        """returns a dict from function names to a dict of their count, replayed and recorded totals, mean, p50, p99 and max in ns."""
+        durations = {}
+        recorded = {}
+        for (_, name, elapsed, then) in self.timings:
+            durations.setdefault(name, []).append(elapsed)
+            recorded[name] = recorded.get(name, 0) + then
+        retval = {}
+        for (name, values) in durations.items():
+            values.sort()
+            count = len(values)
+            retval[name] = {'count': count,
+                            'total_ns': sum(values),
+                            'recorded_ns': recorded[name],
+                            'mean_ns': sum(values) // count,
+                            'p50_ns': values[(count - 1) // 2],
+                            'p99_ns': values[min(count - 1, (99 * count) // 100)],
+                            'max_ns': values[-1]}
+        return retval
+
+    def slowest(self, n=10):
+        """returns the n slowest replayed calls, as (index, name, replayed ns, recorded ns) tuples."""
+        return sorted(self.timings, key=lambda timing: timing[2], reverse=True)[:n]
+
+    def dump(self, n=10):
+        snapshot = self.snapshot()
+        total = sum(item['total_ns'] for item in snapshot.values())
+        recorded = sum(item['recorded_ns'] for item in snapshot.values())
+        width = max([len('Total:')] + [len(name) for name in snapshot])
+        sb = StringBuilder()
+        sb.append(f'\nYices API Call Replay of {self.path}:\n')
+        if self.version != yapi.yices_version:
+            sb.append(f'\trecorded with libyices {self.version}, replayed with {yapi.yices_version}\n')
+        sb.append(f'\t{"":{width}}\t{"calls":>10}{"ms":>12}{"then ms":>12}{"mean µs":>12}{"p50 µs":>12}{"p99 µs":>12}\n')
+        for (name, item) in sorted(snapshot.items(), key=lambda entry: entry[1]['total_ns'], reverse=True):
+            sb.append(f'\t{name:{width}}\t{item["count"]:10}{item["total_ns"] / 1e6:12.3f}{item["recorded_ns"] / 1e6:12.3f}'
+                      f'{item["mean_ns"] / 1e3:12.2f}{item["p50_ns"] / 1e3:12.2f}{item["p99_ns"] / 1e3:12.2f}\n')
+        sb.append(f'\n\t{"Total:":{width}}\t{len(self.timings):10}{total / 1e6:12.3f}{recorded / 1e6:12.3f}\n')
+        if self.timings:
+            sb.append('\nSlowest calls:\n')
+            for (index, name, elapsed, then) in self.slowest(n):
+                sb.append(f'\t#{index:<10}{name:{width}}{elapsed / 1e3:12.2f} µs{then / 1e3:12.2f} µs then\n')
+        for (label, entries) in (('Skipped', self.skipped), ('Failed', self.failed)):
+            if entries:
+                (index, name, reason) = entries[0]
+                sb.append(f'\n{label}: {len(entries)} calls, the first #{index} {name}: {reason}\n')
+        if self.mismatches:
+            (index, name, then, now) = self.mismatches[0]
+            sb.append(f'\nDiffering results: {len(self.mismatches)}, the first #{index} {name}: {then!r} then, {now!r} now\n')
+        return str(sb)
+
+    def _materialize(self, value):
+        """the argument of the replayed call that stands for the recorded value."""
+        if isinstance(value, Handle):
+            if value.id not in self._handles:
+                raise _Unreplayable(f'pointer {value.id} was not made by a replayed call')
+            return self._handles[value.id]
+        if isinstance(value, (Cell, Struct)):
+            ctype = _ctype(value.ctype)
+            obj = self._objects.get(value.id)
+            if obj is None or not isinstance(obj, ctype):
+                obj = self._objects[value.id] = ctype()
+            if isinstance(value, Cell):
+                obj.value = value.value
+            elif value.fields is not None:
+                for (field, item) in zip(ctype._fields_, value.fields):  # pylint: disable=W0212
+                    setattr(obj, field[0], item)
+            if value.how == POINTER:
+                return ctypes.pointer(obj)
+            if value.how == BYREF:
+                return ctypes.byref(obj)
+            return obj
+        if isinstance(value, CArray):
+            return (_ctype(value.ctype) * len(value.values))(*value.values)
+        if isinstance(value, Opaque):
+            raise _Unreplayable(f'a {value.ctype} was recorded without its contents')
+        if isinstance(value, list):
+            return [self._materialize(item) for item in value]
+        return value
+
+
+def _comparable(value):
+    return value is None or isinstance(value, (bool, int, float, str, bytes))
@@ -0,0 +1,459 @@
+"""Serializer turns terms into plain Python data that can be pickled, sent to another process, and rebuilt there.
+
+Term and type ids only mean something inside the process that made them, so a term is described
+structurally instead: the serialized form lists every distinct type and subterm once, children
+before parents, and refers to earlier entries by their position in the list. Uninterpreted terms
+and types keep their names; when a blob is loaded, a named uninterpreted term (or type) that
+already exists with the right type is reused, everything else is made anew.
+
+The same description can also be written in a compact binary form (to_bytes, save) in which
+integers are varints and subterms are referred to by their distance back in the node list.
+
+Reading the coefficients of arithmetic sums needs libgmp (see Terms.sum_component).
+"""
+from .Constructors import Constructor
+from .Terms import Terms
+from .Traversal import Traversal
+from .Types import Types
+from .YicesException import YicesException
+
+
+# type tags
+_BOOL, _INT, _REAL, _BV, _SCALAR, _UNINTERPRETED, _TUPLE, _FUNCTION = range(8)
+
+# the constructors whose children are all terms, and the term constructor that rebuilds them
+_REBUILD = {
+    Constructor.ITE_TERM:      lambda c: Terms.ite(c[0], c[1], c[2]),
+    Constructor.APP_TERM:      lambda c: Terms.application(c[0], c[1:]),
+    Constructor.UPDATE_TERM:   lambda c: Terms.update(c[0], c[1:-1], c[-1]),
+    Constructor.TUPLE_TERM:    Terms.tuple,
+    Constructor.EQ_TERM:       lambda c: Terms.eq(c[0], c[1]),
+    Constructor.DISTINCT_TERM: Terms.distinct,
+    Constructor.FORALL_TERM:   lambda c: Terms.forall(c[:-1], c[-1]),
+    Constructor.LAMBDA_TERM:   lambda c: Terms.ylambda(c[:-1], c[-1]),
+    Constructor.NOT_TERM:      lambda c: Terms.ynot(c[0]),
+    Constructor.OR_TERM:       Terms.yor,
+    Constructor.XOR_TERM:      Terms.xor,
+    Constructor.BV_ARRAY:      Terms.bvarray,
+    Constructor.BV_DIV:        lambda c: Terms.bvdiv(c[0], c[1]),
+    Constructor.BV_REM:        lambda c: Terms.bvrem(c[0], c[1]),
+    Constructor.BV_SDIV:       lambda c: Terms.bvsdiv(c[0], c[1]),
+    Constructor.BV_SREM:       lambda c: Terms.bvsrem(c[0], c[1]),
+    Constructor.BV_SMOD:       lambda c: Terms.bvsmod(c[0], c[1]),
+    Constructor.BV_SHL:        lambda c: Terms.bvshl(c[0], c[1]),
+    Constructor.BV_LSHR:       lambda c: Terms.bvlshr(c[0], c[1]),
+    Constructor.BV_ASHR:       lambda c: Terms.bvashr(c[0], c[1]),
+    Constructor.BV_GE_ATOM:    lambda c: Terms.bvge_atom(c[0], c[1]),
+    Constructor.BV_SGE_ATOM:   lambda c: Terms.bvsge_atom(c[0], c[1]),
+    Constructor.ARITH_GE_ATOM: lambda c: Terms.arith_geq_atom(c[0], c[1]) if len(c) > 1 else Terms.arith_geq0_atom(c[0]),
+    Constructor.ABS:           lambda c: Terms.abs(c[0]),
+    Constructor.CEIL:          lambda c: Terms.ceil(c[0]),
+    Constructor.FLOOR:         lambda c: Terms.floor(c[0]),
+    Constructor.RDIV:          lambda c: Terms.division(c[0], c[1]),
+    Constructor.IDIV:          lambda c: Terms.idiv(c[0], c[1]),
+    Constructor.IMOD:          lambda c: Terms.imod(c[0], c[1]),
+    Constructor.IS_INT_ATOM:   lambda c: Terms.is_int_atom(c[0]),
+    Constructor.DIVIDES_ATOM:  lambda c: Terms.divides_atom(c[0], c[1]),
+}
+
+
+class Serializer:
+
+    """the version of the serialized form, the first element of every blob."""
+    VERSION = 1
+
+    @staticmethod
+    def dump(terms):
+        """returns a picklable description of the terms, see load."""
+        return Serializer.dump_nodes(terms)[0]
+
+    @staticmethod
+    def load(blob, reuse_names=True):
+        """rebuilds the terms described by a blob made by dump, in this process; returns them as a list."""
+        nodes = Serializer.load_nodes(blob, reuse_names)
+        return [nodes[root] for root in blob[3]]
+
+    @staticmethod
+    def dump_nodes(terms):
+        """returns the blob describing the terms, and the list of the terms its nodes stand for, in node order."""
+        writer = _Writer()
+        roots = [writer.term(term) for term in terms]
+        return ((Serializer.VERSION, writer.types, writer.nodes, roots), writer.node_terms)
+
+    @staticmethod
+    def load_nodes(blob, reuse_names=True):
+        """rebuilds every node of a blob, returning the list of their terms in node order."""
+        (version, type_entries, node_entries, _) = blob
+        if version != Serializer.VERSION:
+            raise YicesException(msg=f'Serializer.load: unsupported version {version}\n')
+        types = []
+        for entry in type_entries:
+            types.append(_load_type(entry, types, reuse_names))
+        terms = []
+        for entry in node_entries:
+            terms.append(_load_node(entry, types, terms, reuse_names))
+        return terms
+
+    # the binary form
+
+    @staticmethod
+    def to_bytes(terms):
+        """returns the terms in a compact binary form, that from_bytes turns back into terms."""
+        return _encode(Serializer.dump(terms))
+
+    @staticmethod
+    def from_bytes(data, reuse_names=True):
+        """rebuilds the terms from their binary form, made by to_bytes; returns them as a list."""
+        return Serializer.load(_decode(data), reuse_names)
+
+    @staticmethod
+    def save(path, terms):
+        """writes the binary form of the terms to the file at path."""
+        with open(path, 'wb') as stream:
+            stream.write(Serializer.to_bytes(terms))
+
+    @staticmethod
+    def load_file(path, reuse_names=True):
+        """reads back the terms written by save."""
+        with open(path, 'rb') as stream:
+            return Serializer.from_bytes(stream.read(), reuse_names)
+
+
+class _Writer:
+    """accumulates the type and node entries of a blob, each distinct type or term once."""
+
+    def __init__(self):
+        self.types = []
+        self.type_index = {}
+        self.nodes = []
+        self.node_terms = []
+        self.node_index = {}
+        self.traversal = Traversal()
+        self.visited = set()
+
+    def type(self, tau):
+        index = self.type_index.get(tau)
+        if index is not None:
+            return index
+        if Types.is_bool(tau):
+            entry = (_BOOL,)
+        elif Types.is_int(tau):
+            entry = (_INT,)
+        elif Types.is_real(tau):
+            entry = (_REAL,)
+        elif Types.is_bitvector(tau):
+            entry = (_BV, Types.bvtype_size(tau))
+        elif Types.is_scalar(tau):
+            entry = (_SCALAR, Types.scalar_type_card(tau), Types.get_name(tau))
+        elif Types.is_uninterpreted(tau):
+            entry = (_UNINTERPRETED, Types.get_name(tau))
+        else:
+            children = [self.type(Types.child(tau, i)) for i in range(Types.num_children(tau))]
+            entry = (_TUPLE, children) if Types.is_tuple(tau) else (_FUNCTION, children)
+        index = len(self.types)
+        self.types.append(entry)
+        self.type_index[tau] = index
+        return index
+
+    def term(self, root):
+        node_index = self.node_index
+        for term in self.traversal.postorder([root], self.visited):
+            node_index[term] = len(self.nodes)
+            self.nodes.append(self.entry(term))
+            self.node_terms.append(term)
+        return node_index[root]
+
+    def entry(self, term):
+        # the traversal has already fetched the constructor and children of term
+        (constructor, children) = self.traversal.node(term)
+        index = self.node_index
+        if constructor == Constructor.BOOL_CONSTANT:
+            return (constructor, Terms.bool_const_value(term))
+        if constructor == Constructor.ARITH_CONSTANT:
+            return (constructor, str(Terms.rational_const_value(term)))
+        if constructor == Constructor.BV_CONSTANT:
+            return (constructor, Terms.bitsize(term), Terms.bv_const_integer_value(term))
+        if constructor == Constructor.SCALAR_CONSTANT:
+            return (constructor, self.type(Terms.type_of_term(term)), Terms.scalar_const_value(term))
+        if constructor in (Constructor.VARIABLE, Constructor.UNINTERPRETED_TERM):
+            return (constructor, self.type(Terms.type_of_term(term)), Terms.get_name(term))
+        if constructor in (Constructor.SELECT_TERM, Constructor.BIT_TERM):
+            return (constructor, Terms.proj_index(term), index[children[0]])
+        if constructor == Constructor.BV_SUM:
+            bitsize = Terms.bitsize(term)
+            monomials = []
+            for i in range(Terms.num_children(term)):
+                (bits, child) = Terms.bvsum_component(term, i)
+                coeff = sum(bit << k for (k, bit) in enumerate(bits))
+                monomials.append((coeff, -1 if child == Terms.NULL_TERM else index[child]))
+            return (constructor, bitsize, monomials)
+        if constructor == Constructor.ARITH_SUM:
+            monomials = []
+            for i in range(Terms.num_children(term)):
+                (coeff, child) = Terms.sum_component(term, i)
+                monomials.append((str(coeff), -1 if child == Terms.NULL_TERM else index[child]))
+            return (constructor, monomials)
+        if constructor == Constructor.POWER_PRODUCT:
+            factors = [Terms.product_component(term, i) for i in range(Terms.num_children(term))]
+            return (constructor, [(index[child], exponent) for (child, exponent) in factors])
+        if constructor in _REBUILD:
+            return (constructor, [index[child] for child in children])
+        raise YicesException(msg=f'Serializer.dump: cannot serialize terms with constructor {constructor}\n')
+
+
+def _load_type(entry, types, reuse_names):
+    tag = entry[0]
+    if tag == _BOOL:
+        return Types.bool_type()
+    if tag == _INT:
+        return Types.int_type()
+    if tag == _REAL:
+        return Types.real_type()
+    if tag == _BV:
+        return Types.bv_type(entry[1])
+    if tag == _TUPLE:
+        return Types.new_tuple_type([types[child] for child in entry[1]])
+    if tag == _FUNCTION:
+        children = [types[child] for child in entry[1]]
+        return Types.new_function_type(children[:-1], children[-1])
+    name = entry[-1]
+    if reuse_names and name is not None:
+        tau = Types.get_by_name(name)
+        if tau is not None and ((tag == _SCALAR and Types.is_scalar(tau) and Types.scalar_type_card(tau) == entry[1]) or
+                                (tag == _UNINTERPRETED and Types.is_uninterpreted(tau))):
+            return tau
+    if tag == _SCALAR:
+        return Types.new_scalar_type(entry[1], name)
+    return Types.new_uninterpreted_type(name)
+
+
+def _load_node(entry, types, terms, reuse_names):
+    constructor = entry[0]
+    if constructor == Constructor.BOOL_CONSTANT:
+        return Terms.true() if entry[1] else Terms.false()
+    if constructor == Constructor.ARITH_CONSTANT:
+        return Terms.parse_rational(entry[1])
+    if constructor == Constructor.BV_CONSTANT:
+        return Terms.bvconst_integer(entry[1], entry[2])
+    if constructor == Constructor.SCALAR_CONSTANT:
+        return Terms.constant(types[entry[1]], entry[2])
+    if constructor == Constructor.VARIABLE:
+        return Terms.new_variable(types[entry[1]])
+    if constructor == Constructor.UNINTERPRETED_TERM:
+        (tau, name) = (types[entry[1]], entry[2])
+        if reuse_names and name is not None:
+            term = Terms.get_by_name(name)
+            if term is not None and Terms.type_of_term(term) == tau:
+                return term
+        return Terms.new_uninterpreted_term(tau, name)
+    if constructor == Constructor.SELECT_TERM:
+        return Terms.select(entry[1], terms[entry[2]])
+    if constructor == Constructor.BIT_TERM:
+        return Terms.bitextract(terms[entry[2]], entry[1])
+    if constructor == Constructor.BV_SUM:
+        bitsize = entry[1]
+        monomials = [Terms.bvconst_integer(bitsize, coeff) if child < 0 else
+                     Terms.bvmul(Terms.bvconst_integer(bitsize, coeff), terms[child]) for (coeff, child) in entry[2]]
+        return Terms.bvsum(monomials)
+    if constructor == Constructor.ARITH_SUM:
+        monomials = []
+        for (coeff, child) in entry[1]:
+            constant = Terms.parse_rational(coeff)
+            monomials.append(constant if child < 0 else Terms.mul(constant, terms[child]))
+        return Terms.sum(monomials)
+    if constructor == Constructor.POWER_PRODUCT:
+        factors = [terms[child] for (child, _) in entry[1]]
+        if Terms.is_bitvector(factors[0]):
+            return Terms.bvproduct([Terms.bvpower(terms[child], exponent) for (child, exponent) in entry[1]])
+        return Terms.product([Terms.power(terms[child], exponent) for (child, exponent) in entry[1]])
+    rebuild = _REBUILD.get(constructor)
+    if rebuild is None:
+        raise YicesException(msg=f'Serializer.load: unexpected constructor {constructor}\n')
+    return rebuild([terms[child] for child in entry[1]])
+
+
+# The binary form: MAGIC, then the types, the nodes and the roots, each a count followed by the
+# entries. Integers are unsigned LEB128 varints; strings (names, rationals) are a varint length
+# and utf-8 bytes, a name's length is off by one so that 0 stands for no name; bit-vector values
+# are little endian bytes, as many as the width needs. A reference from a node to a subterm is
+# the distance back to it, or 0 for the constant monomial of a sum.
+
+_MAGIC = b'YTRM\x01'
+
+_LEAVES = (Constructor.VARIABLE, Constructor.UNINTERPRETED_TERM)
+
+_PROJECTIONS = (Constructor.SELECT_TERM, Constructor.BIT_TERM)
+
+
+def _encode(blob):
+    (_, types, nodes, roots) = blob
+    out = bytearray(_MAGIC)
+
+    def uint(n):
+        while n >= 0x80:
+            out.append((n & 0x7f) | 0x80)
+            n >>= 7
+        out.append(n)
+
+    def string(text):
+        data = text.encode()
+        uint(len(data))
+        out.extend(data)
+
+    def name(text):
+        if text is None:
+            uint(0)
+        else:
+            data = text.encode()
+            uint(len(data) + 1)
+            out.extend(data)
+
+    uint(len(types))
+    for entry in types:
+        tag = entry[0]
+        uint(tag)
+        if tag == _BV:
+            uint(entry[1])
+        elif tag == _SCALAR:
+            uint(entry[1])
+            name(entry[2])
+        elif tag == _UNINTERPRETED:
+            name(entry[1])
+        elif tag in (_TUPLE, _FUNCTION):
+            uint(len(entry[1]))
+            for child in entry[1]:
+                uint(child)
+    uint(len(nodes))
+    for (position, entry) in enumerate(nodes):
+        constructor = entry[0]
+        uint(constructor)
+        if constructor == Constructor.BOOL_CONSTANT:
+            uint(entry[1])
+        elif constructor == Constructor.ARITH_CONSTANT:
+            string(entry[1])
+        elif constructor == Constructor.BV_CONSTANT:
+            uint(entry[1])
+            out.extend(entry[2].to_bytes((entry[1] + 7) // 8, 'little'))
+        elif constructor == Constructor.SCALAR_CONSTANT:
+            uint(entry[1])
+            uint(entry[2])
+        elif constructor in _LEAVES:
+            uint(entry[1])
+            name(entry[2])
+        elif constructor in _PROJECTIONS:
+            uint(entry[1])
+            uint(position - entry[2])
+        elif constructor == Constructor.BV_SUM:
+            width = entry[1]
+            uint(width)
+            uint(len(entry[2]))
+            for (coeff, child) in entry[2]:
+                out.extend(coeff.to_bytes((width + 7) // 8, 'little'))
+                uint(0 if child < 0 else position - child)
+        elif constructor == Constructor.ARITH_SUM:
+            uint(len(entry[1]))
+            for (coeff, child) in entry[1]:
+                string(coeff)
+                uint(0 if child < 0 else position - child)
+        elif constructor == Constructor.POWER_PRODUCT:
+            uint(len(entry[1]))
+            for (child, exponent) in entry[1]:
+                uint(position - child)
+                uint(exponent)
+        else:
+            uint(len(entry[1]))
+            for child in entry[1]:
+                uint(position - child)
+    uint(len(roots))
+    for root in roots:
+        uint(root)
+    return bytes(out)
+
+
+def _decode(data):
+    if data[:len(_MAGIC)] != _MAGIC:
+        raise YicesException(msg='Serializer.from_bytes: not a serialized term, or an unsupported version\n')
+    data = memoryview(data)
+    pos = len(_MAGIC)
+
+    def uint():
+        nonlocal pos
+        byte = data[pos]
+        pos += 1
+        if byte < 0x80:
+            return byte
+        value = byte & 0x7f
+        shift = 7
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def raw(size):
+        nonlocal pos
+        chunk = data[pos:pos + size]
+        pos += size
+        return chunk
+
+    def string():
+        return bytes(raw(uint())).decode()
+
+    def name():
+        size = uint()
+        return None if size == 0 else bytes(raw(size - 1)).decode()
+
+    types = []
+    for _ in range(uint()):
+        tag = uint()
+        if tag == _BV:
+            entry = (tag, uint())
+        elif tag == _SCALAR:
+            entry = (tag, uint(), name())
+        elif tag == _UNINTERPRETED:
+            entry = (tag, name())
+        elif tag in (_TUPLE, _FUNCTION):
+            entry = (tag, [uint() for _ in range(uint())])
+        else:
+            entry = (tag,)
+        types.append(entry)
+    nodes = []
+    for position in range(uint()):
+        constructor = uint()
+        if constructor == Constructor.BOOL_CONSTANT:
+            entry = (constructor, uint())
+        elif constructor == Constructor.ARITH_CONSTANT:
+            entry = (constructor, string())
+        elif constructor == Constructor.BV_CONSTANT:
+            width = uint()
+            entry = (constructor, width, int.from_bytes(raw((width + 7) // 8), 'little'))
+        elif constructor == Constructor.SCALAR_CONSTANT:
+            entry = (constructor, uint(), uint())
+        elif constructor in _LEAVES:
+            entry = (constructor, uint(), name())
+        elif constructor in _PROJECTIONS:
+            entry = (constructor, uint(), position - uint())
+        elif constructor == Constructor.BV_SUM:
+            width = uint()
+            monomials = []
+            for _ in range(uint()):
+                coeff = int.from_bytes(raw((width + 7) // 8), 'little')
+                back = uint()
+                monomials.append((coeff, position - back if back else -1))
+            entry = (constructor, width, monomials)
+        elif constructor == Constructor.ARITH_SUM:
+            monomials = []
+            for _ in range(uint()):
+                coeff = string()
+                back = uint()
+                monomials.append((coeff, position - back if back else -1))
+            entry = (constructor, monomials)
+        elif constructor == Constructor.POWER_PRODUCT:
+            entry = (constructor, [(position - uint(), uint()) for _ in range(uint())])
+        else:
+            entry = (constructor, [position - uint() for _ in range(uint())])
+        nodes.append(entry)
+    roots = [uint() for _ in range(uint())]
+    return (Serializer.VERSION, types, nodes, roots)
@@ -1,10 +1,17 @@
 """ The Terms class provides Pythonesque static methods for constructing and manipulating yices' terms."""
 import ctypes
+
+from fractions import Fraction
+
 import yices_api as yapi
 
 from .YicesException import YicesException
 from .Types import Types
 from .Constructors import Constructor
+from .Interning import InternTable, interned, term_parses
+
+
+_constants = InternTable()
 
 
 class Terms:
@@ -17,6 +24,26 @@ class Terms:
     MINUS_ONE = yapi.yices_int32(-1)
 
 
+    @staticmethod
+    def enable_constant_cache(maxsize=4096):
+        """Makes integer, rational, rational_from_fraction and bvconst_integer remember the terms they return.
+
+        At most maxsize constants are kept, least recently used first out; the cache is emptied
+        when the library is reset or exited.
+        """
+        _constants.enable(maxsize)
+
+    @staticmethod
+    def disable_constant_cache():
+        """Drops the constant cache, if there is one."""
+        _constants.disable()
+
+    @staticmethod
+    def constant_cache_stats():
+        """Returns the hits, misses, size and maxsize of the constant cache as a dict, or None if there is no cache."""
+        return _constants.stats()
+
+
     #general logical term constructors
 
     @staticmethod
@@ -59,6 +86,7 @@ class Terms:
 
 
     @staticmethod
+    @interned(_constants, 'integer', 1)
     def integer(value):
         return yapi.yices_int64(int(value))
 
@@ -74,7 +102,7 @@ class Terms:
     @staticmethod
     def yand(terms):
         tlen = len(terms)
-        if not len:
+        if not tlen:
             return Terms.TRUE
         retval = yapi.yices_and(tlen, yapi.make_term_array(terms))
         if retval == Terms.NULL_TERM:
@@ -84,7 +112,7 @@ class Terms:
     @staticmethod
     def yor(terms):
         tlen = len(terms)
-        if not len:
+        if not tlen:
             return Terms.FALSE
         retval = yapi.yices_or(tlen, yapi.make_term_array(terms))
         if retval == Terms.NULL_TERM:
@@ -93,7 +121,7 @@ class Terms:
 
     @staticmethod
     def xor(terms):
-        assert terms
+        assert len(terms)
         return yapi.yices_xor(len(terms), yapi.make_term_array(terms))
 
     @staticmethod
@@ -163,7 +191,7 @@ class Terms:
 
     @staticmethod
     def update(fun, args, value):
-        assert args
+        assert len(args)
         retval = yapi.yices_update(fun, len(args), yapi.make_term_array(args), value)
         if retval == Terms.NULL_TERM:
             raise YicesException('yices_update')
@@ -171,7 +199,7 @@ class Terms:
 
     @staticmethod
     def distinct(args):
-        assert args
+        assert len(args)
         retval = yapi.yices_distinct(len(args), yapi.make_term_array(args))
         if retval == Terms.NULL_TERM:
             raise YicesException('yices_distinct')
@@ -201,6 +229,7 @@ class Terms:
     #arithmetic term constructors
 
     @staticmethod
+    @interned(_constants, 'rational', 2)
     def rational(n, d):
         assert d
         retval = yapi.yices_rational64(int(n), int(d))
@@ -210,10 +239,7 @@ class Terms:
 
     @staticmethod
     def rational_from_fraction(f):
-        retval = yapi.yices_rational64(int(f.numerator), int(f.denominator))
-        if retval == Terms.NULL_TERM:
-            raise YicesException('yices_rational64')
-        return retval
+        return Terms.rational(f.numerator, f.denominator)
 
     @staticmethod
     def parse_rational(s):
@@ -431,10 +457,20 @@ class Terms:
     #bv term constructors
 
     @staticmethod
+    @interned(_constants, 'bv', 2)
     def bvconst_integer(nbits, i):
-        retval = yapi.yices_bvconst_int64(nbits, int(i))
+        i = int(i)
+        if -(1 << 63) <= i < (1 << 63):
+            retval = yapi.yices_bvconst_int64(nbits, i)
+            if retval == Terms.NULL_TERM:
+                raise YicesException('yices_bvconst_int64')
+            return retval
+        # too wide for the 64 bit constructors
+        if nbits <= 0:
+            raise YicesException(msg='bvconst_integer: nbits must be positive')
+        retval = yapi.yices_bvconst_from_array(nbits, yapi.int_to_bv_array(i, nbits))
         if retval == Terms.NULL_TERM:
-            raise YicesException('yices_bvconst_int64')
+            raise YicesException('yices_bvconst_from_array')
         return retval
 
     @staticmethod
@@ -835,11 +871,43 @@ class Terms:
 
     @staticmethod
     def parse_term(s):
-        retval = yapi.yices_parse_term(s)
+        retval = term_parses.parse(s, yapi.yices_parse_term)
         if retval == Terms.NULL_TERM:
             raise YicesException('yices_parse_term')
         return retval
 
+    @staticmethod
+    def parse_terms(strings):
+        """Parses each of the strings, returning the list of the terms; a string that occurs more than once is parsed once."""
+        parsed = {}
+        retval = []
+        for s in strings:
+            term = parsed.get(s)
+            if term is None:
+                term = parsed[s] = Terms.parse_term(s)
+            retval.append(term)
+        return retval
+
+    @staticmethod
+    def enable_parse_cache(maxsize=1024):
+        """Makes parse_term remember the terms it returns, keyed by the string, at most maxsize of them.
+
+        A cached string is forgotten when a name it mentions is changed by set_name, remove_name
+        or clear_name, of Terms or of Types (but not by the yices_api functions called directly).
+        The cache is emptied when the library is reset or exited.
+        """
+        term_parses.enable(maxsize)
+
+    @staticmethod
+    def disable_parse_cache():
+        """Drops the parse cache, if there is one."""
+        term_parses.disable()
+
+    @staticmethod
+    def parse_cache_stats():
+        """Returns the hits, misses, size and maxsize of the parse cache as a dict, or None if there is no cache."""
+        return term_parses.stats()
+
 
     # substitutions
 
@@ -855,7 +923,8 @@ class Terms:
     @staticmethod
     def substs(variables, terms, list_o_terms):
         assert len(variables) == len(terms)
-        array_o_terms = yapi.make_term_array(list_o_terms)
+        # yices_subst_term_array overwrites its argument, so it must not share memory with list_o_terms
+        array_o_terms = yapi.make_term_array(list_o_terms, copy=True)
         errorcode = yapi.yices_subst_term_array(len(variables), yapi.make_term_array(variables), yapi.make_term_array(terms), len(array_o_terms), array_o_terms)
         if errorcode == -1:
             raise YicesException('yices_subst_term_array')
@@ -1006,6 +1075,19 @@ class Terms:
             return [ bvarray[i] for i in range(0, bitsize) ]
         raise YicesException('yices_bool_const_value')
 
+    @staticmethod
+    def bv_const_integer_value(term, signed=False):
+        """Returns the value of the bitvector constant as an int, read as two's complement if signed is True."""
+        bitsize = Terms.bitsize(term)
+        bvarray = yapi.make_empty_int32_array(bitsize)
+        errcode =  yapi.yices_bv_const_value(term, bvarray)
+        if errcode != 0:
+            raise YicesException('yices_bv_const_value')
+        value = yapi.bv_array_to_int(bvarray, bitsize)
+        if signed and value >> (bitsize - 1):
+            return value - (1 << bitsize)
+        return value
+
     @staticmethod
     def scalar_const_value(term):
         value = ctypes.c_int32()
@@ -1017,8 +1099,8 @@ class Terms:
     @staticmethod
     def bvsum_component(term, i):
         bitsize = Terms.bitsize(term)
-        if i >= bitsize:
-            raise YicesException('bvsum_component', 'index {0} too big >= bitsize {1}'.format(i, bitsize))
+        if i >= Terms.num_children(term):
+            raise YicesException(msg='bvsum_component: index {0} too big >= {1} monomials\n'.format(i, Terms.num_children(term)))
         bvarray = yapi.make_empty_int32_array(bitsize)
         termv = ctypes.c_int32()
         errcode =  yapi.yices_bvsum_component(term, i, bvarray, termv)
@@ -1028,18 +1110,46 @@ class Terms:
 
     @staticmethod
     def product_component(term, i):
-        expv = ctypes.c_uint32()
+        expv = ctypes.c_int32()
         termv = ctypes.c_int32()
-        errcode =  yapi.yices_bvsum_component(term, i, termv, expv)
+        errcode =  yapi.yices_product_component(term, i, termv, expv)
         if errcode == 0:
             return (termv.value, expv.value)
-        raise YicesException('yices_bvsum_component')
+        raise YicesException('yices_product_component')
+
 
 
+    # these two need libgmp, to unpack the mpq_t coefficients
+
+    @staticmethod
+    def rational_const_value(term):
+        """Returns the value of the arithmetic constant as a Fraction."""
+        if not yapi.hasGMP():
+            return Fraction(Terms.to_string(term))
+        value = yapi.yices_new_mpq()
+        try:
+            errcode = yapi.yices_rational_const_value(term, value)
+            if errcode != 0:
+                raise YicesException('yices_rational_const_value')
+            return Fraction(yapi.yices_get_mpq_str(value))
+        finally:
+            yapi.yices_clear_mpq(value)
+
+    @staticmethod
+    def sum_component(term, i):
+        """Returns the i-th monomial of an arithmetic sum as (coefficient, term), term is NULL_TERM for the constant."""
+        if not yapi.hasGMP():
+            raise YicesException(msg='Terms.sum_component: the coefficients of a sum can only be read with libgmp\n')
+        coeff = yapi.yices_new_mpq()
+        termv = yapi.term_t()
+        try:
+            errcode = yapi.yices_sum_component(term, i, coeff, termv)
+            if errcode != 0:
+                raise YicesException('yices_sum_component')
+            return (Fraction(yapi.yices_get_mpq_str(coeff)), termv.value)
+        finally:
+            yapi.yices_clear_mpq(coeff)
 
-# TBD: gmp issues
-#yices_rational_const_value
-#yices_sum_component
 
     # names
 
@@ -1050,6 +1160,7 @@ class Terms:
         errcode = yapi.yices_set_term_name(term, name)
         if errcode == -1:
             raise YicesException('yices_set_term_name')
+        term_parses.forget(name)
         return True
 
     @staticmethod
@@ -1057,11 +1168,13 @@ class Terms:
         if name is None:
             return False
         yapi.yices_remove_term_name(name)
+        term_parses.forget(name)
         return True
 
 
     @staticmethod
     def clear_name(term):
+        term_parses.forget(Terms.get_name(term))
         errcode = yapi.yices_clear_term_name(term)
         return errcode == 0
 
@@ -0,0 +1,168 @@
+"""Traversal walks term DAGs without recursion, visiting every shared subterm once.
+
+A Traversal fetches the constructor and the children of each term it meets from the library
+once, the children of composite terms in one call (yices_term_children), and keeps them
+keyed by term, so walking the same terms again, or terms that share subterms, costs no more
+calls. The walks use an explicit stack, so the depth of a term is not limited by the Python
+recursion limit.
+
+The children of a term are the terms it is built from: the arguments of a composite term, the
+argument of a projection (select or bit), the terms of the monomials of a sum (the constant
+monomial has none), and the factors of a power product. Reading the monomials of an arithmetic
+sum needs libgmp (see Terms.sum_component).
+
+A Traversal is only meaningful for the terms of one yices session: its cache is dropped when
+the library is reset or exited, or garbage is collected (which can reuse the ids of freed terms).
+"""
+import yices_api as yapi
+
+from .Constructors import Constructor
+from .Terms import Terms
+from .VectorPool import VectorPool
+from .YicesException import YicesException
+
+
+_LEAVES = frozenset([Constructor.BOOL_CONSTANT, Constructor.ARITH_CONSTANT, Constructor.BV_CONSTANT,
+                     Constructor.SCALAR_CONSTANT, Constructor.VARIABLE, Constructor.UNINTERPRETED_TERM])
+
+_NO_CHILDREN = ()
+
+
+class Traversal:
+
+    def __init__(self):
+        self._nodes = {}
+        self._generation = (yapi.yices_generation(), yapi.yices_collections())
+
+    def node(self, term):
+        """returns (constructor, children) for term, where children is a sequence of terms."""
+        node = self._nodes.get(term)
+        if node is None:
+            node = _fetch(term)
+            self._nodes[term] = node
+        return node
+
+    def constructor(self, term):
+        """returns the constructor of term, as Terms.constructor does."""
+        return self.node(term)[0]
+
+    def children(self, term):
+        """returns the children of term, possibly empty."""
+        return self.node(term)[1]
+
+    def postorder(self, roots, visited=None):
+        """yields the subterms of the roots, each once, children before their parents.
+
+        Terms in visited are skipped (along with the subterms only they lead to); visited, if
+        given, should be a set, and every term yielded is added to it.
+        """
+        self._check_generation()
+        if visited is None:
+            visited = set()
+        for term in self._postorder(roots, visited):
+            visited.add(term)
+            yield term
+
+    def preorder(self, roots, visited=None):
+        """yields the subterms of the roots, each once, parents before their children.
+
+        visited is as for postorder.
+        """
+        self._check_generation()
+        if visited is None:
+            visited = set()
+        children = self.children
+        stack = list(reversed(roots))
+        while stack:
+            term = stack.pop()
+            if term in visited:
+                continue
+            visited.add(term)
+            yield term
+            stack.extend(reversed(children(term)))
+
+    def fold(self, roots, function, memo=None):
+        """returns the list of the values of function on the roots, computed bottom up.
+
+        function is called once on each subterm as function(term, constructor, values), where
+        values are its results on the children of the term, in order. memo is a dict from terms
+        to their values; terms already in it are not visited again, and it is filled in as the
+        values are computed, so it can be passed to several calls to share the work.
+        """
+        self._check_generation()
+        if memo is None:
+            memo = {}
+        node = self.node
+        for term in self._postorder(roots, memo):
+            (constructor, children) = node(term)
+            memo[term] = function(term, constructor, [memo[child] for child in children])
+        return [memo[root] for root in roots]
+
+    def size(self, roots):
+        """returns the number of distinct subterms of the roots (their DAG size)."""
+        count = 0
+        for _ in self.postorder(roots):
+            count += 1
+        return count
+
+    def uninterpreted_terms(self, roots):
+        """returns the uninterpreted terms occurring in the roots, in the order of a post order walk."""
+        constructor = self.constructor
+        return [term for term in self.postorder(roots) if constructor(term) == Constructor.UNINTERPRETED_TERM]
+
+    def clear(self):
+        """forgets what was fetched so far."""
+        self._nodes.clear()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def _check_generation(self):
+        generation = (yapi.yices_generation(), yapi.yices_collections())
+        if generation != self._generation:
+            self._nodes.clear()
+            self._generation = generation
+
+    def _postorder(self, roots, seen):
+        # the caller marks each term as seen once it is yielded; since a DAG has no cycles, a term
+        # met again while still on the stack is impossible, so marking on the way out is enough.
+        children = self.children
+        for root in roots:
+            if root in seen:
+                continue
+            stack = [(root, iter(children(root)))]
+            while stack:
+                (term, pending) = stack[-1]
+                for child in pending:
+                    if child not in seen:
+                        stack.append((child, iter(children(child))))
+                        break
+                else:
+                    stack.pop()
+                    yield term
+
+
+def _fetch(term):
+    constructor = yapi.yices_term_constructor(term)
+    if constructor == Constructor.CONSTRUCTOR_ERROR:
+        raise YicesException('yices_term_constructor')
+    if constructor in _LEAVES:
+        return (constructor, _NO_CHILDREN)
+    if constructor in (Constructor.SELECT_TERM, Constructor.BIT_TERM):
+        return (constructor, (Terms.proj_arg(term),))
+    if constructor == Constructor.BV_SUM:
+        children = [Terms.bvsum_component(term, i)[1] for i in range(Terms.num_children(term))]
+        return (constructor, tuple(child for child in children if child != Terms.NULL_TERM))
+    if constructor == Constructor.ARITH_SUM:
+        children = [Terms.sum_component(term, i)[1] for i in range(Terms.num_children(term))]
+        return (constructor, tuple(child for child in children if child != Terms.NULL_TERM))
+    if constructor == Constructor.POWER_PRODUCT:
+        return (constructor, tuple(Terms.product_component(term, i)[0] for i in range(Terms.num_children(term))))
+    vector = VectorPool.acquire_term_vector()
+    try:
+        if yapi.yices_term_children(term, vector) == -1:
+            raise YicesException('yices_term_children')
+        return (constructor, VectorPool.to_array(vector))
+    finally:
+        VectorPool.release_term_vector(vector)
+
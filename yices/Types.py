@@ -1,8 +1,13 @@
 """ The Types class provides Pythonesque static methods for constructing and manipulating yices' types."""
 import yices_api as yapi
 
+from .Interning import InternTable, interned, term_parses, type_parses
 from .YicesException import YicesException
 
+
+_types = InternTable()
+
+
 class Types:
 
 
@@ -17,6 +22,26 @@ class Types:
 
 
     @staticmethod
+    def enable_type_cache(maxsize=1024):
+        """Makes bv_type (without a name) remember the types it returns, at most maxsize of them.
+
+        The cache is emptied when the library is reset or exited.
+        """
+        _types.enable(maxsize)
+
+    @staticmethod
+    def disable_type_cache():
+        """Drops the type cache, if there is one."""
+        _types.disable()
+
+    @staticmethod
+    def type_cache_stats():
+        """Returns the hits, misses, size and maxsize of the type cache as a dict, or None if there is no cache."""
+        return _types.stats()
+
+
+    @staticmethod
+    @interned(_types, 'bv', 1)
     def bv_type(nbits, name=None):
         if nbits <= 0:
             raise YicesException(msg="nbits must be positive")
@@ -128,6 +153,7 @@ class Types:
             errcode = yapi.yices_set_term_name(elements[i], ni)
             if errcode == -1:
                 raise YicesException('yices_set_term_name')
+            term_parses.forget(ni)
         return (tau, elements)
 
 
@@ -226,7 +252,38 @@ class Types:
 
     @staticmethod
     def parse_type(s):
-        return yapi.yices_parse_type(s)
+        return type_parses.parse(s, yapi.yices_parse_type)
+
+    @staticmethod
+    def parse_types(strings):
+        """Parses each of the strings, returning the list of the types; a string that occurs more than once is parsed once."""
+        parsed = {}
+        retval = []
+        for s in strings:
+            tau = parsed.get(s)
+            if tau is None:
+                tau = parsed[s] = Types.parse_type(s)
+            retval.append(tau)
+        return retval
+
+    @staticmethod
+    def enable_parse_cache(maxsize=1024):
+        """Makes parse_type remember the types it returns, keyed by the string, at most maxsize of them.
+
+        A cached string is forgotten when a type name it mentions is changed by set_name,
+        remove_name or clear_name (but not by the yices_api functions called directly).
+        """
+        type_parses.enable(maxsize)
+
+    @staticmethod
+    def disable_parse_cache():
+        """Drops the parse cache, if there is one."""
+        type_parses.disable()
+
+    @staticmethod
+    def parse_cache_stats():
+        """Returns the hits, misses, size and maxsize of the parse cache as a dict, or None if there is no cache."""
+        return type_parses.stats()
 
 
     # names
@@ -238,6 +295,7 @@ class Types:
         errcode = yapi.yices_set_type_name(tau, name)
         if errcode == -1:
             raise YicesException('yices_set_type_name')
+        Types._names_changed(name)
         return True
 
     @staticmethod
@@ -245,14 +303,21 @@ class Types:
         if name is None:
             return False
         yapi.yices_remove_type_name(name)
+        Types._names_changed(name)
         return True
 
 
     @staticmethod
     def clear_name(tau):
+        Types._names_changed(Types.get_name(tau))
         errcode = yapi.yices_clear_type_name(tau)
         return errcode == 0
 
+    @staticmethod
+    def _names_changed(name):
+        type_parses.forget(name)
+        term_parses.forget(name)
+
     @staticmethod
     def get_name(tau):
         name = yapi.yices_get_type_name(tau)
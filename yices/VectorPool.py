@@ -0,0 +1,104 @@
+"""VectorPool keeps a per thread supply of initialized term_vector_t and yval_vector_t structures.
+
+API calls that return their results in a vector borrow one from the pool, and hand it
+back when they are done. Returned vectors are reset rather than deleted, so the C buffers
+are allocated once per thread rather than once per call.
+"""
+import threading
+
+from array import array
+from ctypes import pointer, sizeof, string_at
+
+import yices_api as yapi
+
+
+class _Vectors:
+    """The idle vectors belonging to one thread."""
+
+    def __init__(self):
+        self.terms = []
+        self.yvals = []
+
+    def __del__(self):
+        # the thread is going away, and so are its vectors. Their buffers are malloc'd by
+        # the vector routines rather than owned by the library, so yices_exit does not free
+        # them, and deleting them (which only frees the buffer) is fine whether or not the
+        # library is inited; the raw functions skip the wrappers' check that it is.
+        delete_term_vector = yapi.raw_function('yices_delete_term_vector')
+        delete_yval_vector = yapi.raw_function('yices_delete_yval_vector')
+        for vector in self.terms:
+            delete_term_vector(pointer(vector))
+        for vector in self.yvals:
+            delete_yval_vector(pointer(vector))
+
+
+class _Shelf(threading.local):
+    """Hands each thread its own _Vectors, which is dropped (and so cleaned up) when the thread exits."""
+
+    def __init__(self):
+        super().__init__()
+        self.vectors = _Vectors()
+
+
+class VectorPool:
+
+    """the number of idle vectors of each kind a thread holds on to."""
+    MAX_IDLE = 4
+
+    """vectors that have grown beyond this many elements are deleted rather than kept."""
+    MAX_CAPACITY = 1 << 16
+
+    __shelf = _Shelf()
+
+    @staticmethod
+    def acquire_term_vector():
+        """returns an initialized, empty, term_vector_t; give it back with release_term_vector."""
+        shelf = VectorPool.__shelf.vectors.terms
+        if shelf:
+            return shelf.pop()
+        vector = yapi.term_vector_t()
+        yapi.yices_init_term_vector(vector)
+        return vector
+
+    @staticmethod
+    def release_term_vector(vector):
+        """returns a term_vector_t obtained from acquire_term_vector to the pool."""
+        shelf = VectorPool.__shelf.vectors.terms
+        if len(shelf) < VectorPool.MAX_IDLE and vector.capacity <= VectorPool.MAX_CAPACITY:
+            yapi.yices_reset_term_vector(vector)
+            shelf.append(vector)
+        else:
+            yapi.yices_delete_term_vector(vector)
+
+    @staticmethod
+    def acquire_yval_vector():
+        """returns an initialized, empty, yval_vector_t; give it back with release_yval_vector."""
+        shelf = VectorPool.__shelf.vectors.yvals
+        if shelf:
+            return shelf.pop()
+        vector = yapi.yval_vector_t()
+        yapi.yices_init_yval_vector(vector)
+        return vector
+
+    @staticmethod
+    def release_yval_vector(vector):
+        """returns a yval_vector_t obtained from acquire_yval_vector to the pool."""
+        shelf = VectorPool.__shelf.vectors.yvals
+        if len(shelf) < VectorPool.MAX_IDLE and vector.capacity <= VectorPool.MAX_CAPACITY:
+            yapi.yices_reset_yval_vector(vector)
+            shelf.append(vector)
+        else:
+            yapi.yices_delete_yval_vector(vector)
+
+    @staticmethod
+    def to_array(vector):
+        """returns the contents of a term (or type) vector as an array('i'), copied in one go."""
+        retval = array('i')
+        if vector.size > 0:
+            retval.frombytes(string_at(vector.data, vector.size * sizeof(yapi.term_t)))
+        return retval
+
+    @staticmethod
+    def idle():
+        """returns the number of idle (term, yval) vectors held by the current thread."""
+        return (len(VectorPool.__shelf.vectors.terms), len(VectorPool.__shelf.vectors.yvals))
@@ -0,0 +1,98 @@
+"""Watchdog is a single, process wide, daemon thread that enforces the timeouts of context checks.
+
+Starting a threading.Timer per check makes thread creation the dominant cost of short checks.
+Instead, each check arms a deadline with the Watchdog, which keeps all the deadlines in one
+heap, sleeps until the earliest one, and calls its callback (typically Context.stop_search)
+if the check has not disarmed it by then.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+
+class Watchdog:
+
+    __condition = threading.Condition()
+
+    # entries are [deadline, sequence number, callback]; disarming sets the callback to None
+    __heap = []
+
+    __sequence = itertools.count()
+
+    # disarmed entries still in the heap; once they are the majority the heap is rebuilt without them
+    __cancelled = 0
+
+    __thread = None
+
+    __fired = 0
+
+    @staticmethod
+    def arm(timeout, callback):
+        """calls callback() in timeout seconds, unless the returned entry is disarmed first.
+
+        The callback runs on the watchdog thread with the watchdog's lock held, so it should be
+        quick; in exchange, once disarm returns the callback is guaranteed not to run.
+        """
+        entry = [time.monotonic() + timeout, next(Watchdog.__sequence), callback]
+        with Watchdog.__condition:
+            if Watchdog.__thread is None:
+                Watchdog.__thread = threading.Thread(target=Watchdog.__run, name='yices-watchdog', daemon=True)
+                Watchdog.__thread.start()
+            heapq.heappush(Watchdog.__heap, entry)
+            # only wake the thread if its current nap is now too long
+            if Watchdog.__heap[0] is entry:
+                Watchdog.__condition.notify()
+        return entry
+
+    @staticmethod
+    def disarm(entry):
+        """cancels an entry returned by arm; returns False if its callback has already been called."""
+        with Watchdog.__condition:
+            armed = entry[2] is not None
+            if armed:
+                entry[2] = None
+                Watchdog.__cancelled += 1
+                heap = Watchdog.__heap
+                if Watchdog.__cancelled > 64 and 2 * Watchdog.__cancelled > len(heap):
+                    heap[:] = [live for live in heap if live[2] is not None]
+                    heapq.heapify(heap)
+                    Watchdog.__cancelled = 0
+            return armed
+
+    @staticmethod
+    def pending():
+        """returns the number of armed entries."""
+        with Watchdog.__condition:
+            return sum(1 for entry in Watchdog.__heap if entry[2] is not None)
+
+    @staticmethod
+    def fired():
+        """returns the number of callbacks the watchdog has called."""
+        return Watchdog.__fired
+
+    @staticmethod
+    def __run():
+        heap = Watchdog.__heap
+        condition = Watchdog.__condition
+        with condition:
+            while True:
+                while heap and heap[0][2] is None:
+                    heapq.heappop(heap)
+                    Watchdog.__cancelled -= 1
+                if not heap:
+                    condition.wait()
+                    continue
+                delay = heap[0][0] - time.monotonic()
+                if delay > 0:
+                    condition.wait(delay)
+                    continue
+                entry = heapq.heappop(heap)
+                callback = entry[2]
+                entry[2] = None
+                Watchdog.__fired += 1
+                try:
+                    callback()
+                except Exception:  # pylint: disable=W0703
+                    # the watchdog must outlive a misbehaving callback (e.g. on a disposed context)
+                    pass
@@ -6,33 +6,53 @@ import yices_api as yapi
 # ok).
 yapi.yices_init()  # pylint: disable=wrong-import-position
 
+from yices.Batch import Batch
 from yices.Census import Census
 from yices.Config import Config
 from yices.Context import Context
+from yices.ContextPool import ContextPool
 from yices.Constructors import Constructor
 from yices.Delegates import Delegates
+from yices.Elementwise import Elementwise
+from yices.FunctionValue import FunctionValue
+from yices.Linear import Linear
 from yices.Model import Model
 from yices.Profiler import Profiler
 from yices.Parameters import Parameters
+from yices.Portfolio import Portfolio
+from yices.Recorder import Recorder
+from yices.Replay import Replay
+from yices.Serializer import Serializer
 from yices.Status import Status
 from yices.Types import Types
 from yices.Terms import Terms
+from yices.Traversal import Traversal
 from yices.YicesException import YicesException
 from yices.Yices import Yices
 from yices.Yvals import Yval
 
 
-__all__ = ['Census',
+__all__ = ['Batch',
+           'Census',
            'Config',
            'Context',
+           'ContextPool',
            'Constructor',
            'Delegates',
+           'Elementwise',
+           'FunctionValue',
+           'Linear',
            'Model',
            'Parameters',
+           'Portfolio',
            'Profiler',
+           'Recorder',
+           'Replay',
+           'Serializer',
            'Status',
            'Types',
            'Terms',
+           'Traversal',
            'YicesException',
            'Yices',
            'Yval']
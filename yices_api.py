@@ -37,7 +37,10 @@ from __future__ import print_function
 
 import os
 import sys
+import threading
+import time
 
+from fractions import Fraction
 from functools import wraps
 
 from ctypes import (
@@ -46,6 +49,7 @@ from ctypes import (
     CDLL,
     cast,
     c_char_p,
+    create_string_buffer,
     c_double,
     c_int,
     c_uint,
@@ -58,6 +62,7 @@ from ctypes import (
     c_void_p,
     pointer,
     POINTER,
+    sizeof,
     Structure
     )
 
@@ -127,12 +132,32 @@ yices_recommended_version = '2.6.5'
 #then go on to try and do stuff.
 __yices_library_inited__ = False
 
+# bumped by yices_exit and yices_reset, both of which free every context, model, config and
+# param record; a handle obtained in an earlier generation must not be freed again.
+__yices_library_generation__ = 0
+
+# bumped by yices_garbage_collect, which can free unreferenced terms and types and later reuse
+# their ids; a cache of term or type ids must be dropped when it changes.
+__yices_library_collections__ = 0
+
+# held by yices_exit and yices_reset while they tear the library down, so that a thread that
+# only reads from the library (the Census sampler, say) can hold it to keep the library up.
+__yices_library_lock__ = threading.RLock()
+
 class YicesAPIException(Exception):
     """Base class for exceptions from Yices API."""
 
 #iam: 9/29/2018 turn this on to get entry and exit log messages on stderr.
 YICES_API_TRACE = False
 
+# Set the environment variable YICES_API_LAZY=1 (before importing) to defer
+# binding each libyices symbol until its first call, see LazyLibrary below.
+YICES_API_LAZY = os.environ.get('YICES_API_LAZY', '') not in ('', '0')
+
+# Set this (or the environment variable YICES_API_FAST=1) to have yices_init()
+# replace the checked wrappers with the raw ctypes functions, see FAST MODE below.
+YICES_API_FAST = os.environ.get('YICES_API_FAST', '') not in ('', '0')
+
 #iam: 9/19/2018 only throw an exception if the library is not inited.
 def catch_error(errval):
     """catches any error."""
@@ -231,8 +256,85 @@ def loadYices():
 
 
 
+class _LazyPrototype(object):
+    """Records the restype and argtypes of a libyices symbol until it is first called.
+
+    On the first call the symbol is resolved, the recorded prototype applied, and the
+    resulting ctypes function replaces this record in the owning LazyLibrary, so
+    subsequent calls go straight to ctypes. (Unless the record has itself been replaced
+    meanwhile, by an instrumentation shim that calls it, in which case the shim stays.)
+    """
+    __slots__ = ('_library', '_name', '_function', 'restype', 'argtypes')
+
+    def __init__(self, library, name):
+        self._library = library
+        self._name = name
+        self._function = None
+
+    def bind(self):
+        """resolves the symbol, applies the recorded prototype, and caches the result."""
+        function = self._function
+        if function is not None:
+            return function
+        function = getattr(self._library.dll, self._name)
+        # unset slots raise AttributeError, in which case ctypes' defaults are kept
+        try:
+            function.restype = self.restype
+        except AttributeError:
+            pass
+        try:
+            function.argtypes = self.argtypes
+        except AttributeError:
+            pass
+        self._function = function
+        if vars(self._library).get(self._name) is self:
+            setattr(self._library, self._name, function)
+        return function
+
+    def resolved(self):
+        """returns the ctypes function if the symbol has been bound, and this record otherwise."""
+        return self if self._function is None else self._function
+
+    def __call__(self, *args):
+        return self.bind()(*args)
+
+
+class LazyLibrary(object):
+    """A stand in for the libyices CDLL that binds symbols on first use rather than at import time."""
+
+    def __init__(self, dll):
+        self.dll = dll
+        # these two make in_dll and friends work on a LazyLibrary
+        self._handle = dll._handle
+        self._name = dll._name
+
+    def __getattr__(self, name):
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        prototype = _LazyPrototype(self, name)
+        setattr(self, name, prototype)
+        return prototype
+
+    def bound_symbols(self):
+        """returns the names of the symbols that have actually been resolved so far."""
+        names = []
+        for (name, value) in vars(self).items():
+            if not name.startswith('yices_'):
+                continue
+            # while instrumented the library holds timing shims, over what may still be records
+            value = __instrumented_raw__.get(name, value)
+            if isinstance(value, _LazyPrototype):
+                value = value.resolved()
+            if not isinstance(value, _LazyPrototype):
+                names.append(name)
+        return names
+
+
 loadYices()
 
+if YICES_API_LAZY:
+    libyices = LazyLibrary(libyices)
+
 ###########################
 #  Utilities
 ###########################
@@ -344,6 +446,28 @@ def hasGMP():
     libgmpFailed = True
     return False
 
+#like gmp, numpy is optional, it is only imported when a routine that can
+#return NumPy arrays is asked to do so.
+numpy = None
+numpyFailed = None
+
+
+def hasNumPy():
+    """Returns True if NumPy has been imported and is ready to use, False otherwise."""
+    global numpyFailed, numpy
+    if numpyFailed is True:
+        return False
+    if numpy is not None:
+        return True
+    try:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        numpyFailed = True
+        return False
+    numpy = np
+    numpyFailed = False
+    return True
+
 # From yices_limits.h
 
 # int32_t max (2^31 - 1)
@@ -547,6 +671,8 @@ def yices_init():
     global __yices_library_inited__
     __yices_library_inited__ = True
     libyices.yices_init()
+    if YICES_API_FAST:
+        _bind_api(True)
 
 # iam: 10/2/2018 N.B. Neither this nor yices_exit() get wrapped because either before or after execution
 # __yices_library_inited__ can be False
@@ -555,15 +681,32 @@ def yices_is_inited():
     global __yices_library_inited__
     return bool(__yices_library_inited__)
 
+def yices_generation():
+    """Returns a counter that changes every time yices_exit or yices_reset frees all the library's objects."""
+    global __yices_library_generation__
+    return __yices_library_generation__
+
+def yices_collections():
+    """Returns a counter that changes every time yices_garbage_collect may have freed terms and types."""
+    global __yices_library_collections__
+    return __yices_library_collections__
+
+def yices_library_lock():
+    """Returns the reentrant lock that yices_exit and yices_reset hold; holding it keeps the library from being torn down."""
+    return __yices_library_lock__
+
 
 # void yices_exit(void)
 libyices.yices_exit.restype = None
 def yices_exit():
     """Delete all internal data structures and objects - this must be called to avoid memory leaks."""
-    global __yices_library_inited__
-    if __yices_library_inited__:
-        libyices.yices_exit()
-        __yices_library_inited__ = False
+    global __yices_library_inited__, __yices_library_generation__
+    with __yices_library_lock__:
+        if __yices_library_inited__:
+            _bind_api(False)
+            libyices.yices_exit()
+            __yices_library_inited__ = False
+            __yices_library_generation__ += 1
 
 
 # void yices_reset(void)
@@ -571,7 +714,10 @@ libyices.yices_reset.restype = None
 @catch_uninitialized()
 def yices_reset():
     """A full reset of all internal data structures (terms, types, symbol tables, contexts, models, ...)."""
-    libyices.yices_reset()
+    global __yices_library_generation__
+    with __yices_library_lock__:
+        libyices.yices_reset()
+        __yices_library_generation__ += 1
 
 
 # void yices_free_string(char*)
@@ -647,12 +793,48 @@ def yices_error_string():
 # feel free to add more, or request that I (iam) add more.
 #
 
-def make_term_array(pyarray):
+# Sequences that are contiguous one dimensional buffers of signed integers of the right
+# size (array.array('i'), int32 NumPy arrays, memoryviews of either, ...) are not copied:
+# the C array is laid over the buffer's own memory. Anything else is unpacked element
+# by element. Pass copy=True when the C routine writes into the array (e.g. yices_subst_term_array)
+# and the caller's buffer must be left alone.
+
+_SIGNED_INTEGER_FORMATS = frozenset('bhilq')
+
+def _native_buffer(pyarray, ctype):
+    """Returns a memoryview of pyarray if its memory can be used as a C array of ctype as is, None otherwise."""
+    if isinstance(pyarray, (list, tuple)):
+        return None
+    try:
+        view = memoryview(pyarray)
+    except TypeError:
+        return None
+    code = view.format
+    if code[:1] in '@=':
+        code = code[1:]
+    elif code[:1] in '<>!':
+        if (code[0] == '<') != (sys.byteorder == 'little'):
+            return None
+        code = code[1:]
+    if view.ndim == 1 and view.itemsize == sizeof(ctype) and code in _SIGNED_INTEGER_FORMATS and view.c_contiguous:
+        return view
+    return None
+
+def _make_array(ctype, pyarray, copy):
+    """Makes a C array of ctype from a python sequence or buffer, sharing the buffer's memory if possible."""
+    view = _native_buffer(pyarray, ctype)
+    if view is None:
+        #weird python and ctype magic
+        return (ctype * len(pyarray))(*pyarray)
+    if copy or view.readonly:
+        return (ctype * len(view)).from_buffer_copy(view)
+    return (ctype * len(view)).from_buffer(view)
+
+def make_term_array(pyarray, copy=False):
     """Makes a C term array object from a python array object"""
     retval = None
     if pyarray is not None:
-        #weird python and ctype magic
-        retval = (term_t * len(pyarray))(*pyarray)
+        retval = _make_array(term_t, pyarray, copy)
     return retval
 
 def make_empty_term_array(n):
@@ -660,12 +842,11 @@ def make_empty_term_array(n):
     retval = (term_t * n)()
     return retval
 
-def make_type_array(pyarray):
+def make_type_array(pyarray, copy=False):
     """Makes a C term array object from a python array object"""
     retval = None
     if pyarray is not None:
-        #weird python and ctype magic
-        retval = (type_t * len(pyarray))(*pyarray)
+        retval = _make_array(type_t, pyarray, copy)
     return retval
 
 
@@ -675,12 +856,11 @@ def make_empty_type_array(n):
     return retval
 
 
-def make_int32_array(pyarray):
+def make_int32_array(pyarray, copy=False):
     """Makes a C int32 array object from a python array object"""
     retval = None
     if pyarray is not None:
-        #weird python and ctype magic
-        retval = (c_int32 * len(pyarray))(*pyarray)
+        retval = _make_array(c_int32, pyarray, copy)
     return retval
 
 
@@ -690,12 +870,11 @@ def make_empty_int32_array(n):
     return retval
 
 
-def make_int64_array(pyarray):
+def make_int64_array(pyarray, copy=False):
     """Makes a C int64 array object from a python array object"""
     retval = None
     if pyarray is not None:
-        #weird python and ctype magic
-        retval = (c_int64 * len(pyarray))(*pyarray)
+        retval = _make_array(c_int64, pyarray, copy)
     return retval
 
 
@@ -705,6 +884,30 @@ def make_empty_int64_array(n):
     return retval
 
 
+# yices represents a bitvector value as an array of int32s, one per bit, least significant
+# bit first. Rather than loop over the bits in python, we pick out the low order byte of
+# each element in one slice, and let int() parse the (reversed) result as a binary numeral.
+
+_BIT_OFFSET = 0 if sys.byteorder == 'little' else 3
+
+_BITS_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+def bv_array_to_int(bvarray, n):
+    """Returns the unsigned integer represented by the first n bits of the C int32 array bvarray."""
+    if n <= 0:
+        return 0
+    return int(bytes(bvarray)[_BIT_OFFSET:4 * n:4][::-1].translate(_BITS_TO_DIGITS), 2)
+
+_DIGITS_TO_BITS = bytes.maketrans(b'01', b'\x00\x01')
+
+def int_to_bv_array(value, n):
+    """Returns a C int32 array of the n low order bits of value (two's complement if negative), least significant first."""
+    digits = format(value & ((1 << n) - 1), '0{0}b'.format(n)).encode()
+    raw = bytearray(4 * n)
+    raw[_BIT_OFFSET::4] = digits[::-1].translate(_DIGITS_TO_BITS)
+    return (c_int32 * n).from_buffer(raw)
+
+
 def make_empty_yval_array(n):
     """Makes an empty C yval array object of length n"""
     retval = (yval_t * n)()
@@ -4344,6 +4547,8 @@ def yices_garbage_collect(t, nt, tau, ntau, keep_named):
     - keep_named specifies whether the named terms and types should
     all be preserved.
     """
+    global __yices_library_collections__
+    __yices_library_collections__ += 1
     return libyices.yices_garbage_collect(t, nt, tau, ntau, keep_named)
 
 
@@ -5725,3 +5930,356 @@ def yices_set_mpq(vmpq, num, den):
         raise TypeError('set_mpq: num and den should both be strings or integers')
     libgmp.__gmpq_canonicalize(byref(vmpq))
     return True
+
+def yices_get_mpq_str(vmpq):
+    """Returns the value of an mpq object as a decimal string, 'num/den' or just 'num', or None if there is no gmp."""
+    if not hasGMP():
+        return None
+    libgmp.__gmpz_sizeinbase.restype = c_size_t
+    # digits of both parts, their signs, the '/' and the terminating NUL
+    size = libgmp.__gmpz_sizeinbase(byref(vmpq._mp_num), 10) + libgmp.__gmpz_sizeinbase(byref(vmpq._mp_den), 10) + 3
+    buf = create_string_buffer(size)
+    libgmp.__gmpq_get_str(buf, 10, byref(vmpq))
+    return buf.value.decode()
+
+def yices_clear_mpq(vmpq):
+    """Frees the space used by an mpq object made by yices_new_mpq."""
+    if hasGMP():
+        libgmp.__gmpq_clear(byref(vmpq))
+
+def make_mpq_array(fractions):
+    """Makes a C array of canonical mpq objects from a sequence of Fractions (or ints), or None if there is no gmp.
+
+    Free it with clear_mpq_array.
+    """
+    if not hasGMP():
+        return None
+    retval = (mpq_t * len(fractions))()
+    for (i, value) in enumerate(fractions):
+        value = Fraction(value)
+        libgmp.__gmpq_init(byref(retval[i]))
+        if libgmp.__gmpq_set_str(byref(retval[i]), f'{value.numerator}/{value.denominator}'.encode(), 10) == -1:
+            clear_mpq_array(retval, i + 1)
+            raise TypeError(f'make_mpq_array: {value} is not a rational')
+    return retval
+
+def clear_mpq_array(vmpqs, n=None):
+    """Frees the first n (by default all) mpq objects of an array made by make_mpq_array."""
+    for i in range(len(vmpqs) if n is None else n):
+        libgmp.__gmpq_clear(byref(vmpqs[i]))
+
+
+#############################
+#  FAST MODE                #
+#############################
+
+# In fast mode the public names below, whose wrappers do nothing more than
+# check that the library is inited and call straight through to libyices,
+# are rebound to the raw ctypes functions themselves. This saves a Python frame
+# and a couple of global lookups per call, which adds up in term building loops.
+#
+# The wrappers that also assert a context or model handle is not None are left
+# out, so that a disposed Context or Model still fails with an AssertionError
+# rather than handing libyices a NULL pointer.
+#
+# The price is that nothing is checked: calling them after yices_exit() is a
+# crash rather than a YicesAPIException. That is why yices_init() only switches
+# them over once the library is up, and yices_exit() switches them back first.
+#
+# N.B. only code that looks the names up in this module (e.g. yapi.yices_and)
+# sees the rebinding, copies made by 'from yices_api import yices_and' do not.
+
+__fast_api__ = (
+    'yices_error_code', 'yices_print_error_fd', 'yices_bool_type', 'yices_int_type',
+    'yices_real_type', 'yices_new_scalar_type', 'yices_new_uninterpreted_type',
+    'yices_tuple_type', 'yices_tuple_type1', 'yices_tuple_type2', 'yices_tuple_type3',
+    'yices_function_type', 'yices_function_type1', 'yices_function_type2',
+    'yices_function_type3', 'yices_type_is_bool', 'yices_type_is_int', 'yices_type_is_real',
+    'yices_type_is_arithmetic', 'yices_type_is_bitvector', 'yices_type_is_tuple',
+    'yices_type_is_function', 'yices_type_is_scalar', 'yices_type_is_uninterpreted',
+    'yices_test_subtype', 'yices_compatible_types', 'yices_bvtype_size',
+    'yices_scalar_type_card', 'yices_type_num_children', 'yices_type_child',
+    'yices_type_children', 'yices_true', 'yices_false', 'yices_constant',
+    'yices_new_uninterpreted_term', 'yices_new_variable', 'yices_application',
+    'yices_application1', 'yices_application2', 'yices_application3', 'yices_ite', 'yices_eq',
+    'yices_neq', 'yices_not', 'yices_or', 'yices_and', 'yices_xor', 'yices_or2', 'yices_and2',
+    'yices_xor2', 'yices_or3', 'yices_and3', 'yices_xor3', 'yices_iff', 'yices_implies',
+    'yices_tuple', 'yices_pair', 'yices_triple', 'yices_select', 'yices_tuple_update',
+    'yices_update', 'yices_update1', 'yices_update2', 'yices_update3', 'yices_distinct',
+    'yices_forall', 'yices_exists', 'yices_lambda', 'yices_zero', 'yices_int32', 'yices_int64',
+    'yices_rational32', 'yices_rational64', 'yices_mpz', 'yices_mpq', 'yices_add', 'yices_sub',
+    'yices_neg', 'yices_mul', 'yices_square', 'yices_power', 'yices_sum', 'yices_product',
+    'yices_division', 'yices_idiv', 'yices_imod', 'yices_divides_atom', 'yices_is_int_atom',
+    'yices_abs', 'yices_floor', 'yices_ceil', 'yices_poly_int32', 'yices_poly_int64',
+    'yices_poly_rational32', 'yices_poly_rational64', 'yices_poly_mpz', 'yices_poly_mpq',
+    'yices_arith_eq_atom', 'yices_arith_neq_atom', 'yices_arith_geq_atom',
+    'yices_arith_leq_atom', 'yices_arith_gt_atom', 'yices_arith_lt_atom',
+    'yices_arith_eq0_atom', 'yices_arith_neq0_atom', 'yices_arith_geq0_atom',
+    'yices_arith_leq0_atom', 'yices_arith_gt0_atom', 'yices_arith_lt0_atom', 'yices_bvadd',
+    'yices_bvsub', 'yices_bvneg', 'yices_bvmul', 'yices_bvsquare', 'yices_bvpower',
+    'yices_bvdiv', 'yices_bvrem', 'yices_bvsdiv', 'yices_bvsrem', 'yices_bvsmod', 'yices_bvnot',
+    'yices_bvnand', 'yices_bvnor', 'yices_bvxnor', 'yices_bvshl', 'yices_bvlshr',
+    'yices_bvashr', 'yices_bvand2', 'yices_bvor2', 'yices_bvxor2', 'yices_bvand3',
+    'yices_bvor3', 'yices_bvxor3', 'yices_shift_left0', 'yices_shift_left1',
+    'yices_shift_right0', 'yices_shift_right1', 'yices_ashift_right', 'yices_rotate_left',
+    'yices_rotate_right', 'yices_bvextract', 'yices_bvconcat2', 'yices_sign_extend',
+    'yices_redand', 'yices_redor', 'yices_redcomp', 'yices_bveq_atom', 'yices_bvneq_atom',
+    'yices_bvge_atom', 'yices_bvgt_atom', 'yices_bvle_atom', 'yices_bvlt_atom',
+    'yices_bvsge_atom', 'yices_bvsgt_atom', 'yices_bvsle_atom', 'yices_bvslt_atom',
+    'yices_subst_term', 'yices_subst_term_array', 'yices_clear_type_name',
+    'yices_clear_term_name', 'yices_type_of_term', 'yices_term_is_bool', 'yices_term_is_int',
+    'yices_term_is_real', 'yices_term_is_arithmetic', 'yices_term_is_bitvector',
+    'yices_term_is_tuple', 'yices_term_is_function', 'yices_term_is_scalar',
+    'yices_term_bitsize', 'yices_term_is_ground', 'yices_term_is_atomic',
+    'yices_term_is_composite', 'yices_term_is_projection', 'yices_term_is_sum',
+    'yices_term_is_bvsum', 'yices_term_is_product', 'yices_term_constructor',
+    'yices_term_num_children', 'yices_term_child', 'yices_term_children', 'yices_proj_index',
+    'yices_proj_arg', 'yices_bool_const_value', 'yices_bv_const_value',
+    'yices_scalar_const_value', 'yices_rational_const_value', 'yices_num_terms',
+    'yices_num_types', 'yices_incref_term', 'yices_decref_term', 'yices_incref_type',
+    'yices_decref_type', 'yices_num_posref_terms', 'yices_num_posref_types', 'yices_new_config',
+    'yices_new_context', 'yices_new_param_record', 'yices_get_model_interpolant',
+    'yices_new_model', 'yices_model_from_map', 'yices_model_set_bool',
+    'yices_model_collect_defined_terms', 'yices_print_term_values_fd',
+    'yices_pp_term_values_fd', 'yices_pp_type_fd', 'yices_pp_term_fd', 'yices_pp_term_array_fd',
+    'yices_print_model_fd',
+)
+
+__checked_api__ = {name: globals()[name] for name in __fast_api__}
+
+def _raw_function(name):
+    """returns the ctypes function for the libyices symbol name, binding it now if need be."""
+    function = __instrumented_raw__.get(name)
+    if function is None:
+        function = getattr(libyices, name)
+    if isinstance(function, _LazyPrototype):
+        function = function.bind()
+    return function
+
+def _fast_binding(name):
+    """the fast mode binding of name: its ctypes function, or, if it is not bound yet, a stub that binds it on first use."""
+    function = __instrumented_raw__.get(name)
+    if function is None:
+        function = getattr(libyices, name)
+    if isinstance(function, _LazyPrototype):
+        function = function.resolved()
+    if not isinstance(function, _LazyPrototype):
+        return function
+    def stub(*args):
+        # while instrumented libyices holds the timing shim of name, which is what must be called
+        function = getattr(libyices, name)
+        if isinstance(function, _LazyPrototype):
+            function = function.bind()
+        module = globals()
+        if module.get(name) is stub:
+            module[name] = function
+        return function(*args)
+    stub.__name__ = name
+    return stub
+
+def raw_function(name):
+    """returns the ctypes function for the libyices symbol name, without the initialization and error checking wrapper.
+
+    It is meant for tight loops that check the library is inited, and look for errors in the
+    results, themselves; calling it after yices_exit() crashes. While there is an instrumentation
+    hook or a recorder, the function returned reports each call to them like the functions of
+    this module do, so fetch it again rather than keep it across yices_set_instrumentation and
+    yices_set_recorder.
+    """
+    if name in __instrumented_raw__:
+        function = __instrumented_direct__.get(name)
+        if function is None:
+            # libyices now holds the timing shim of name
+            function = __instrumented_direct__[name] = _instrumented(name, getattr(libyices, name))
+        return function
+    return _raw_function(name)
+
+def _bind_api(fast):
+    """binds the fast mode names to either the raw ctypes functions or the checked wrappers."""
+    module = globals()
+    for name in __fast_api__:
+        module[name] = _fast_binding(name) if fast else __checked_api__[name]
+    if __instrumentation_hook__ is not None or __recorder__ is not None:
+        for name in __fast_api__:
+            __instrumented_saved__.pop(name, None)
+        _instrument_api()
+
+def yices_set_fast_mode(flag):
+    """Turns fast mode on or off; if the library is inited this takes effect immediately, otherwise at the next yices_init()."""
+    global YICES_API_FAST
+    YICES_API_FAST = bool(flag)
+    if __yices_library_inited__:
+        _bind_api(YICES_API_FAST)
+
+def yices_is_fast():
+    """Returns True if the fast mode bindings are currently in place, False otherwise."""
+    return __instrumented_saved__.get('yices_and', yices_and) is not __checked_api__['yices_and']
+
+
+#############################
+#  INSTRUMENTATION          #
+#############################
+
+# yices_set_instrumentation(hook) wraps every public function of this module that is named
+# after a libyices entry point, so that each call reports to hook(name, total_ns, c_ns):
+# total_ns is the time spent in the Python function, c_ns the part of it spent in libyices
+# itself, so that total_ns - c_ns is the overhead of the bindings. The C time is measured by
+# also replacing the ctypes functions in libyices with timing shims.
+#
+# Like fast mode, this only affects code that looks the names up in this module. Fast mode
+# can be switched while instrumenting: _bind_api reinstalls the wrappers over the new bindings.
+#
+# yices_set_recorder(recorder) uses the same wrappers to hand recorder(name, args, kwargs,
+# result, total_ns) every call that returns, leaving out the calls made from within another
+# call, so that replaying the recorded calls in order does the same work once.
+
+__instrumentation_hook__ = None
+
+__recorder__ = None
+
+"""the ctypes functions that have been replaced by timing shims in libyices, by name."""
+__instrumented_raw__ = {}
+
+"""the module level functions that have been replaced by instrumenting wrappers, by name."""
+__instrumented_saved__ = {}
+
+"""the instrumenting wrappers of the shims that raw_function has handed out, by name."""
+__instrumented_direct__ = {}
+
+__instrumentable__ = None
+
+
+class _CClock(threading.local):
+    """the nanoseconds the current thread has spent in libyices, while instrumented, and how deeply nested its current call is."""
+
+    def __init__(self):
+        super().__init__()
+        self.ns = 0
+        self.depth = 0
+
+_c_clock = _CClock()
+
+def _c_shim(name, raw):
+    """wraps a ctypes function so that the time spent in it is added to _c_clock."""
+    def shim(*args):
+        clock = _c_clock
+        start = time.perf_counter_ns()
+        retval = raw(*args)
+        clock.ns += time.perf_counter_ns() - start
+        return retval
+    shim.__name__ = name
+    return shim
+
+def _instrumented(name, inner):
+    """wraps inner, the current binding of name, so that its calls are reported to the hook."""
+    @wraps(inner)
+    def wrapper(*args, **kwargs):
+        clock = _c_clock
+        c_start = clock.ns
+        clock.depth += 1
+        start = time.perf_counter_ns()
+        try:
+            retval = inner(*args, **kwargs)
+        finally:
+            stop = time.perf_counter_ns()
+            clock.depth -= 1
+            hook = __instrumentation_hook__
+            if hook is not None:
+                hook(name, stop - start, clock.ns - c_start)
+        recorder = __recorder__
+        if recorder is not None and clock.depth == 0:
+            recorder(name, args, kwargs, retval, stop - start)
+        return retval
+    wrapper.__instrumented__ = True
+    return wrapper
+
+def _instrumentable():
+    """the names of the functions of this module that are libyices entry points."""
+    global __instrumentable__
+    if __instrumentable__ is None:
+        names = []
+        # a lazy library has a record of every prototype declared at import, bound or not
+        declared = vars(libyices) if isinstance(libyices, LazyLibrary) else None
+        for (name, value) in list(globals().items()):
+            if not name.startswith('yices_') or not callable(value):
+                continue
+            if declared is not None:
+                if name not in declared:
+                    continue
+            else:
+                try:
+                    getattr(libyices, name)
+                except AttributeError:
+                    continue
+            names.append(name)
+        __instrumentable__ = tuple(names)
+    return __instrumentable__
+
+def _instrument_api():
+    module = globals()
+    for name in _instrumentable():
+        if name not in __instrumented_raw__:
+            # in lazy mode this may be a _LazyPrototype, which the shim binds on first use
+            raw = getattr(libyices, name)
+            __instrumented_raw__[name] = raw
+            setattr(libyices, name, _c_shim(name, raw))
+        current = module[name]
+        if getattr(current, '__instrumented__', False):
+            continue
+        __instrumented_saved__[name] = current
+        # in fast mode the binding is the ctypes function itself, which must go through the shim
+        inner = getattr(libyices, name) if current is __instrumented_raw__[name] else current
+        module[name] = _instrumented(name, inner)
+
+def _uninstrument_api():
+    module = globals()
+    for (name, saved) in __instrumented_saved__.items():
+        module[name] = saved
+    for (name, raw) in __instrumented_raw__.items():
+        setattr(libyices, name, raw.resolved() if isinstance(raw, _LazyPrototype) else raw)
+    __instrumented_saved__.clear()
+    __instrumented_raw__.clear()
+    __instrumented_direct__.clear()
+
+def yices_set_instrumentation(hook):
+    """Reports every call of a libyices entry point to hook(name, total_ns, c_ns), or stops doing so if hook is None.
+
+    total_ns is the time spent in the call, and c_ns the part of it spent in libyices. The hook
+    is called in the thread that made the call, and can be replaced at any time.
+    """
+    global __instrumentation_hook__
+    __instrumentation_hook__ = hook
+    _update_instrumentation()
+
+def yices_instrumentation():
+    """Returns the current instrumentation hook, or None."""
+    return __instrumentation_hook__
+
+def yices_call_depth():
+    """Returns the number of calls of libyices entry points the current thread is in, while instrumented.
+
+    An instrumentation hook that sees 0 is reporting an outermost call, one not made from within another.
+    """
+    return _c_clock.depth
+
+def yices_set_recorder(recorder):
+    """Hands every call of a libyices entry point to recorder(name, args, kwargs, result, total_ns), or stops doing so if recorder is None.
+
+    Only the calls that return are recorded, and only the outermost ones: a call made while
+    another is in progress in the same thread is part of that other call. The recorder is
+    called in the thread that made the call, after any instrumentation hook.
+    """
+    global __recorder__
+    __recorder__ = recorder
+    _update_instrumentation()
+
+def yices_recorder():
+    """Returns the current recorder, or None."""
+    return __recorder__
+
+def _update_instrumentation():
+    """installs the wrappers while there is a hook or a recorder, and removes them once there is neither."""
+    if __instrumentation_hook__ is None and __recorder__ is None:
+        _uninstrument_api()
+    else:
+        _instrument_api()